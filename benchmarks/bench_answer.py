@@ -0,0 +1,157 @@
+"""
+General-knowledge lookup benchmark: the old serial path (wikipedia package search, then
+summary with auto_suggest, then DuckDuckGo) versus FridayWeb.fetch_answer, which races one
+Wikipedia Action API request against DuckDuckGo and caches the result.
+
+Both run against local stand-ins for the Wikipedia API and DuckDuckGo with injected
+latency and failures. Queries are drawn from a small pool, so repeats show the caches (the
+wikipedia package memoizes search and summary in process too); "first" is the p50 over
+each query's first occurrence.
+
+The old path needs the wikipedia package, which FRIDAY itself no longer depends on
+(pip install wikipedia); without it only the new path runs.
+
+    python benchmarks/bench_answer.py [--queries 40] [--wiki-latency 0.3] [--ddg-latency 0.15]
+		[--wiki-fail 0.1] [--ddg-fail 0.1] [--miss 0.2]
+"""
+import os
+import json
+import random
+import argparse
+from urllib.parse import urlsplit, parse_qs
+
+from standins import StandIn, timed
+
+TOPICS = [f"topic {i}" for i in range(12)]
+UNKNOWN = [f"gibberish {i}" for i in range(3)]
+EXTRACT = "{title} is a subject of considerable interest. It has a long history. Many people study it."
+
+
+def _known(query: str) -> bool:
+	return query.lower().startswith("topic")
+
+
+def wiki_handler(fail_rate: float, rng: random.Random):
+	"""Enough of api.php for both generator=search and the wikipedia package's calls."""
+
+	def handler(method, path, headers, body):
+		if rng.random() < fail_rate:
+			return 503, {}, b"overloaded"
+		q = {k: v[0] for k, v in parse_qs(urlsplit(path).query).items()}
+		query: dict = {}
+		if q.get("generator") == "search":
+			if _known(q.get("gsrsearch", "")):
+				title = q["gsrsearch"].title()
+				query["pages"] = [{"pageid": 1, "title": title, "index": 1, "extract": EXTRACT.format(title=title)}]
+		elif q.get("list") == "search":
+			hits = [{"title": q["srsearch"].title()}] if _known(q.get("srsearch", "")) else []
+			query["search"] = hits
+		elif q.get("prop") == "info|pageprops":
+			title = q.get("titles", "")
+			query["pages"] = {"1": {"pageid": 1, "title": title, "fullurl": f"https://en.wikipedia.org/wiki/{title}"}}
+		elif q.get("prop") == "extracts":
+			title = q.get("titles", "")
+			query["pages"] = {"1": {"pageid": 1, "title": title, "extract": EXTRACT.format(title=title)}}
+		return 200, {"Content-Type": "application/json"}, json.dumps({"query": query})
+	return handler
+
+
+def ddg_handler(fail_rate: float, rng: random.Random):
+	def handler(method, path, headers, body):
+		if rng.random() < fail_rate:
+			return 503, {}, b"overloaded"
+		q = parse_qs(urlsplit(path).query).get("q", [""])[0]
+		abstract = f"{q.title()} (from DuckDuckGo) is well documented." if _known(q) else ""
+		return 200, {"Content-Type": "application/json"}, json.dumps({"AbstractText": abstract, "RelatedTopics": []})
+	return handler
+
+
+def legacy_fetch_answer(query: str, ddg_url: str) -> str:
+	"""FridayWeb.fetch_answer before it was raced and cached."""
+	import requests
+	import wikipedia
+	try:
+		hits = wikipedia.search(query, results=1)
+		if hits:
+			summary = wikipedia.summary(hits[0], sentences=3, auto_suggest=True, redirect=True)
+			if summary:
+				return summary.strip()
+	except Exception:
+		pass
+	try:
+		resp = requests.get(ddg_url, params={"q": query, "format": "json", "no_redirect": 1, "no_html": 1}, timeout=8)
+		resp.raise_for_status()
+		text = (resp.json().get("AbstractText") or "").strip()
+		if text:
+			return text
+	except Exception:
+		pass
+	return "Sorry, I couldn't find an answer."
+
+
+def pct(values, q):
+	values = sorted(values)
+	return values[int(q * (len(values) - 1))] if values else float("nan")
+
+
+def report(name: str, queries, samples) -> None:
+	latencies = [s for s, _ in samples]
+	first = [s for i, (s, _) in enumerate(samples) if queries[i] not in queries[:i]]
+	answered = sum(1 for _, ok in samples if ok)
+	print(f"  {name:<18}{pct(first, 0.5) * 1000:>9.0f} ms{pct(latencies, 0.5) * 1000:>9.0f} ms"
+		f"{pct(latencies, 0.95) * 1000:>9.0f} ms{max(latencies) * 1000:>9.0f} ms{answered:>6}/{len(samples)}")
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--queries", type=int, default=40)
+	ap.add_argument("--wiki-latency", type=float, default=0.3)
+	ap.add_argument("--ddg-latency", type=float, default=0.15)
+	ap.add_argument("--wiki-fail", type=float, default=0.1)
+	ap.add_argument("--ddg-fail", type=float, default=0.1)
+	ap.add_argument("--miss", type=float, default=0.2, help="share of queries with no answer anywhere")
+	ap.add_argument("--seed", type=int, default=5)
+	args = ap.parse_args()
+
+	rng = random.Random(args.seed)
+	wiki = StandIn(wiki_handler(args.wiki_fail, random.Random(args.seed + 1)), latency=args.wiki_latency)
+	ddg = StandIn(ddg_handler(args.ddg_fail, random.Random(args.seed + 2)), latency=args.ddg_latency)
+	os.environ["FRIDAY_WIKIPEDIA_API"] = wiki.url + "/w/api.php"
+	os.environ["FRIDAY_DUCKDUCKGO_API"] = ddg.url + "/"
+	queries = [rng.choice(UNKNOWN) if rng.random() < args.miss else rng.choice(TOPICS) for _ in range(args.queries)]
+
+	from friday_web import FridayWeb, NO_ANSWER
+	try:
+		print(f"{args.queries} queries ({len(set(queries))} distinct); wikipedia {args.wiki_latency * 1000:.0f} ms, "
+			f"{args.wiki_fail:.0%} failing; duckduckgo {args.ddg_latency * 1000:.0f} ms, {args.ddg_fail:.0%} failing")
+		print(f"  {'path':<18}{'first':>12}{'p50':>12}{'p95':>12}{'max':>12}{'answered':>10}")
+		try:
+			import wikipedia
+		except ImportError:
+			wikipedia = None
+			print("  serial (old)      skipped: the wikipedia package is not installed")
+		if wikipedia is not None:
+			wikipedia.wikipedia.API_URL = wiki.url + "/w/api.php"
+			requests_before = wiki.requests + ddg.requests
+			samples = []
+			for q in queries:
+				seconds, text = timed(lambda: legacy_fetch_answer(q, ddg.url + "/"))
+				samples.append((seconds, text != NO_ANSWER))
+			report("serial (old)", queries, samples)
+			print(f"  {'':<18}{(wiki.requests + ddg.requests - requests_before) / len(queries):>9.1f} requests/query")
+
+		web = FridayWeb()
+		requests_before = wiki.requests + ddg.requests
+		samples = []
+		for q in queries:
+			seconds, text = timed(lambda: web.fetch_answer(q))
+			samples.append((seconds, text != NO_ANSWER))
+		report("raced + cached", queries, samples)
+		print(f"  {'':<18}{(wiki.requests + ddg.requests - requests_before) / len(queries):>9.1f} requests/query")
+	finally:
+		wiki.close()
+		ddg.close()
+
+
+if __name__ == "__main__":
+	main()
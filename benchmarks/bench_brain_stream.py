@@ -0,0 +1,62 @@
+"""
+Streaming vs blocking GPT answers against a local OpenAI-compatible stand-in (SSE).
+
+Reports time to the first speakable sentence for FridayBrain.answer_stream() and the
+time to the full reply for FridayBrain.answer(), and checks memory holds the full reply.
+The OpenAI client is built before either mode is timed.
+
+    python benchmarks/bench_brain_stream.py [--token-delay 0.03]
+"""
+import os
+import argparse
+import time
+
+from standins import StandIn, chat_completions_handler
+
+REPLY = (
+	"Certainly, Boss. Quantum computers use qubits that can hold superpositions of states. "
+	"Entanglement links qubits so that operations on one affect the others. "
+	"Together these let certain algorithms explore many possibilities at once. "
+	"Practical machines are still noisy, but progress is rapid."
+)
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--token-delay", type=float, default=0.03)
+	args = ap.parse_args()
+
+	server = StandIn(chat_completions_handler(lambda messages: REPLY, token_delay=args.token_delay))
+	os.environ["OPENAI_BASE_URL"] = server.url + "/v1"
+	os.environ.setdefault("OPENAI_API_KEY", "stand-in")
+	from friday_brain import FridayBrain, get_openai_client
+
+	try:
+		# SDK import and client construction happen once, outside both timings
+		get_openai_client()
+		brain = FridayBrain()
+		start = time.perf_counter()
+		brain.answer("Explain quantum computing", use_cache=False)
+		blocking_s = time.perf_counter() - start
+
+		brain = FridayBrain()
+		start = time.perf_counter()
+		first_s = None
+		sentences = []
+		for sentence in brain.answer_stream("Explain quantum computing", use_cache=False):
+			if first_s is None:
+				first_s = time.perf_counter() - start
+			sentences.append(sentence)
+		stream_total_s = time.perf_counter() - start
+
+		print(f"token_delay={args.token_delay:.3f}s sentences={len(sentences)}")
+		print(f"  answer() full reply         : {blocking_s * 1000:8.1f} ms")
+		print(f"  answer_stream() first chunk : {(first_s or 0) * 1000:8.1f} ms")
+		print(f"  answer_stream() full reply  : {stream_total_s * 1000:8.1f} ms")
+		print(f"  memory has full reply       : {brain.memory[-1]['content'] == REPLY}")
+	finally:
+		server.close()
+
+
+if __name__ == "__main__":
+	main()
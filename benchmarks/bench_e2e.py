@@ -0,0 +1,405 @@
+"""
+End-to-end turn latency: scripted sessions replayed through main.main() with no microphone,
+speakers or live APIs.
+
+- A replay microphone feeds each utterance to FridayVoice at real-time pace, surrounded by
+  low room noise. It uses a WAV from the session file, or synthesized speech-like audio.
+- Playback goes to a sink that timestamps when audio would start.
+- OpenAI, OpenWeatherMap, wttr.in, the RSS feeds, Wikipedia, DuckDuckGo, ElevenLabs and
+  Google speech recognition are local stand-ins with scripted latency.
+- Routing is main.handle_query inside the real FridayPipeline.
+
+Per turn type it reports p50/p95/p99 of:
+    response    end of the user's speech -> first reply audio
+    turn        end of the user's speech -> reply finished
+
+A session file holds JSON lines {"type": ..., "text": ..., "wav": optional 16 kHz mono WAV}.
+"text" is what the ASR stand-in returns for that turn. Without one, a built-in session covers
+time, weather, news, general knowledge, chat and the status report.
+
+    python benchmarks/bench_e2e.py [--rounds 3] [--session FILE] [--latency openai=0.6,asr=0.2]
+		[--playback-scale 0] [--json out.json] [--baseline previous.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import speech_recognition as sr
+
+from standins import StandIn, chat_completions_handler
+from bench_elevenlabs import MP3_FRAME, FRAMES_PER_SECOND
+from bench_news import make_feed, feed_handler
+from bench_wakeword import RATE, VOWELS, synth_word
+from friday_wakeword import read_wav
+
+# First-byte latency of each stand-in (seconds); openai_token is the gap between streamed tokens
+LATENCY = {
+	"asr": 0.35, "openai": 0.4, "openai_token": 0.02, "openweathermap": 0.15, "wttr": 0.3,
+	"rss": 0.2, "wikipedia": 0.25, "duckduckgo": 0.15, "elevenlabs": 0.2,
+}
+
+KNOWLEDGE = {
+	"taj mahal": "The Taj Mahal is an ivory-white marble mausoleum on the right bank of the Yamuna in Agra.",
+	"ada lovelace": "Ada Lovelace was an English mathematician, chiefly known for her work on Charles Babbage's Analytical Engine.",
+	"photosynthesis": "Photosynthesis is the process by which plants convert light energy into chemical energy.",
+	"mount everest": "Mount Everest is Earth's highest mountain above sea level, in the Mahalangur Himal of the Himalayas.",
+}
+
+SESSION = {
+	"time": ["what time is it", "tell me the time"],
+	"weather": ["what is the weather in Mumbai", "weather in Chennai", "what is the temperature"],
+	"news": ["latest news headlines", "local news", "any headlines"],
+	"general": ["who was Ada Lovelace", "what is the Taj Mahal", "explain photosynthesis", "how tall is Mount Everest"],
+	"chat": ["tell me a joke", "help me plan my evening", "give me a motivational quote"],
+	"status": ["status report"],
+}
+
+REPLY = ("Certainly, Boss. Here is a thoughtful answer to keep you moving. "
+	"It has a few sentences, so speech can begin before it is complete. That is all for now.")
+
+
+def built_in_session(rounds: int) -> List[Dict[str, str]]:
+	turns = []
+	for r in range(rounds):
+		for kind, texts in SESSION.items():
+			turns.append({"type": kind, "text": texts[r % len(texts)]})
+	return turns
+
+
+def synth_utterance(text: str, rng: np.random.Generator) -> np.ndarray:
+	parts = [np.zeros(int(RATE * 0.2))]
+	for i, word in enumerate(text.split()):
+		if i:
+			parts.append(np.zeros(int(RATE * rng.uniform(0.08, 0.18))))
+		vowels = list(rng.integers(0, len(VOWELS), max(1, min(3, len(word) // 2))))
+		parts.append(synth_word(vowels, rng, f0=160.0, noise=0.0))
+	return np.concatenate(parts)
+
+
+class ReplayMicrophone(sr.AudioSource):
+	"""
+	Microphone stand-in delivering audio at real-time pace: room noise, with queued
+	utterances mixed in. speech_end_at is when the last utterance sample was delivered.
+	"""
+
+	def __init__(self, noise: float = 0.002, seed: int = 3) -> None:
+		self.SAMPLE_RATE = RATE
+		self.SAMPLE_WIDTH = 2
+		self.CHUNK = 1024
+		self.stream = None
+		self.noise = noise
+		self._rng = np.random.default_rng(seed)
+		self._speech = np.zeros(0)
+		self._lock = threading.Lock()
+		self._last_read = 0.0
+		self.seconds_read = 0.0
+		self.speech_end_at: Optional[float] = None
+		self.speech_done = threading.Event()
+		self.speech_done.set()
+
+	def __enter__(self):
+		self.stream = self
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.stream = None
+
+	def speak(self, samples: np.ndarray) -> None:
+		with self._lock:
+			self._speech = samples
+			self.speech_end_at = None
+			self.speech_done.clear()
+
+	def read(self, frames: int) -> bytes:
+		# One chunk per chunk-duration of wall time; time spent not reading is not replayed
+		period = frames / self.SAMPLE_RATE
+		delay = period - (time.perf_counter() - self._last_read)
+		if delay > 0:
+			time.sleep(delay)
+		out = self._rng.normal(0, self.noise, frames)
+		with self._lock:
+			speech, self._speech = self._speech[:frames], self._speech[frames:]
+			out[:len(speech)] += speech
+			finished = len(speech) > 0 and not len(self._speech)
+		self._last_read = time.perf_counter()
+		self.seconds_read += period
+		if finished:
+			self.speech_end_at = self._last_read
+			self.speech_done.set()
+		return (np.clip(out, -1, 1) * 32767).astype("<i2").tobytes()
+
+	def close(self) -> None:
+		pass
+
+
+class Sink:
+	"""Where speech goes instead of the speakers: a timestamp per utterance."""
+
+	def __init__(self, scale: float) -> None:
+		self.scale = scale
+		self.starts: List[float] = []
+		self._lock = threading.Lock()
+
+	def mark(self) -> None:
+		with self._lock:
+			self.starts.append(time.perf_counter())
+
+	def first_after(self, t: float) -> Optional[float]:
+		with self._lock:
+			return next((s for s in self.starts if s >= t), None)
+
+	def play(self, seconds: float, stop: Optional[threading.Event] = None) -> None:
+		if self.scale > 0 and seconds > 0:
+			if stop is not None:
+				stop.wait(seconds * self.scale)
+			else:
+				time.sleep(seconds * self.scale)
+
+	def play_pcm(self, pcm, stop: Optional[threading.Event] = None) -> bool:
+		data, rate, channels = pcm
+		self.mark()
+		self.play(len(data) / (2.0 * rate * channels), stop)
+		return True
+
+	def open_stream(self):
+		return SinkPlayer(self)
+
+
+class SinkPlayer:
+	"""Streaming-player stand-in: audio 'starts' with the first chunk."""
+
+	def __init__(self, sink: Sink) -> None:
+		self.sink = sink
+		self.frames = 0
+
+	def feed(self, chunk: bytes) -> None:
+		if not self.frames:
+			self.sink.mark()
+		self.frames += max(1, len(chunk) // len(MP3_FRAME))
+
+	def finish(self) -> None:
+		self.sink.play(self.frames / FRAMES_PER_SECOND)
+
+	def wait(self, timeout=None) -> bool:
+		return True
+
+	def stop(self) -> None:
+		pass
+
+
+def start_services(latency: Dict[str, float], transcripts: "deque[str]") -> Dict[str, StandIn]:
+	def json_reply(payload):
+		return 200, {"Content-Type": "application/json"}, json.dumps(payload)
+
+	def asr(method, path, headers, body):
+		if not transcripts:
+			return 200, {"Content-Type": "application/json"}, '{"result":[]}\n'
+		text = transcripts.popleft()
+		result = {"result": [{"alternative": [{"transcript": text, "confidence": 0.93}], "final": True}], "result_index": 0}
+		return 200, {"Content-Type": "application/json"}, '{"result":[]}\n' + json.dumps(result) + "\n"
+
+	def owm(method, path, headers, body):
+		city = path.split("q=", 1)[-1].split("&", 1)[0].replace("+", " ").replace("%20", " ") or "Visakhapatnam"
+		return json_reply({"name": city.title(), "main": {"temp": 31.4}, "weather": [{"description": "haze"}]})
+
+	def wttr(method, path, headers, body):
+		return 200, {"Content-Type": "text/plain"}, "Visakhapatnam: +31°C"
+
+	def wikipedia(method, path, headers, body):
+		query = path.lower().replace("+", " ").replace("%20", " ")
+		pages = [{"pageid": 1, "title": k.title(), "index": 1, "extract": v} for k, v in KNOWLEDGE.items() if k in query]
+		return json_reply({"query": {"pages": pages[:1]}} if pages else {})
+
+	def duckduckgo(method, path, headers, body):
+		return json_reply({"AbstractText": "", "RelatedTopics": []})
+
+	def elevenlabs(method, path, headers, body):
+		if method == "GET":
+			return json_reply({"voice_id": "stand-in"})
+		text = json.loads(body or b"{}").get("text", "")
+		frames = max(4, int(len(text) / 15.0 * FRAMES_PER_SECOND))
+		chunks = [MP3_FRAME * 4 for _ in range(0, frames, 4)]
+		if path.split("?")[0].endswith("/stream"):
+			return 200, {"Content-Type": "audio/mpeg"}, iter(chunks)
+		return 200, {"Content-Type": "audio/mpeg"}, b"".join(chunks)
+
+	return {
+		"asr": StandIn(asr, latency["asr"]),
+		"openai": StandIn(chat_completions_handler(lambda messages: REPLY, token_delay=latency["openai_token"]), latency["openai"]),
+		"openweathermap": StandIn(owm, latency["openweathermap"]),
+		"wttr": StandIn(wttr, latency["wttr"]),
+		"rss": StandIn(feed_handler(make_feed("standin", 20)), latency["rss"]),
+		"wikipedia": StandIn(wikipedia, latency["wikipedia"]),
+		"duckduckgo": StandIn(duckduckgo, latency["duckduckgo"]),
+		"elevenlabs": StandIn(elevenlabs, latency["elevenlabs"]),
+	}
+
+
+def service_env(services: Dict[str, StandIn]) -> Dict[str, str]:
+	from urllib.parse import urlsplit
+	from friday_web import FridayWeb
+	# Feed URLs are fixed in FridayWeb; every feed host is sent to the one RSS stand-in
+	feeds = FridayWeb._rss_feeds(None, "local") + FridayWeb._rss_feeds(None, None)  # type: ignore[arg-type]
+	rewrite = {urlsplit(u).hostname: services["rss"].url for u in feeds}
+	rewrite["api.openweathermap.org"] = services["openweathermap"].url
+	rewrite["wttr.in"] = services["wttr"].url
+	return {
+		"FRIDAY_HTTP_REWRITE": ",".join(f"{host}={url}" for host, url in rewrite.items()),
+		"FRIDAY_ASR_ENDPOINT": services["asr"].url + "/speech-api/v2/recognize",
+		"OPENAI_API_KEY": "stand-in",
+		"OPENAI_BASE_URL": services["openai"].url + "/v1",
+		"OPENWEATHER_API_KEY": "stand-in",
+		"FRIDAY_WIKIPEDIA_API": services["wikipedia"].url + "/w/api.php",
+		"FRIDAY_DUCKDUCKGO_API": services["duckduckgo"].url + "/",
+		"ELEVENLABS_API_KEY": "stand-in",
+		"ELEVENLABS_API_URL": services["elevenlabs"].url,
+		"FRIDAY_TTS_PROVIDER": "elevenlabs",
+		"FRIDAY_CONTINUOUS": "true",
+		# Keep runs comparable: no probing of public hosts
+		"FRIDAY_PROBE": "false",
+	}
+
+
+def pct(values: List[float], q: float) -> float:
+	return float(np.percentile(values, q)) if values else float("nan")
+
+
+def run_session(turns: List[Dict[str, str]], args) -> Dict[str, Dict[str, list]]:
+	transcripts: "deque[str]" = deque()
+	latency = dict(LATENCY)
+	for item in filter(None, (args.latency or "").split(",")):
+		name, _, value = item.partition("=")
+		latency[name.strip()] = float(value)
+	services = start_services(latency, transcripts)
+	os.environ.update(service_env(services))
+	os.environ.setdefault("FRIDAY_CACHE_DIR", tempfile.mkdtemp(prefix="friday-e2e-"))
+
+	import friday_voice
+	import friday_pipeline
+	import main as friday_main
+
+	mic = ReplayMicrophone()
+	sink = Sink(args.playback_scale)
+	sr.Microphone = lambda *a, **k: mic  # type: ignore[assignment]
+	friday_voice.play_pcm = sink.play_pcm
+	friday_voice.open_mp3_stream = sink.open_stream
+	friday_voice.FridayVoice._say_local = lambda self, text: sink.mark()
+
+	pipelines = []
+
+	class RecordedPipeline(friday_pipeline.FridayPipeline):
+		def run(self, handler) -> None:
+			pipelines.append(self)
+			super().run(handler)
+
+	friday_main.FridayPipeline = RecordedPipeline
+	threading.Thread(target=friday_main.main, name="friday-main", daemon=True).start()
+
+	deadline = time.time() + 60
+	while not pipelines and time.time() < deadline:
+		time.sleep(0.05)
+	if not pipelines:
+		raise RuntimeError("main() never started the pipeline")
+	pipeline = pipelines[0]
+	# The first capture calibrates on ambient noise; let it hear the room first
+	while mic.seconds_read < 1.5:
+		time.sleep(0.05)
+
+	rng = np.random.default_rng(17)
+	results: Dict[str, Dict[str, list]] = {}
+	for i, turn in enumerate(turns + [{"type": "exit", "text": "exit"}]):
+		while pipeline.busy:
+			time.sleep(0.01)
+		samples = read_wav(turn["wav"])[0] if turn.get("wav") else synth_utterance(turn["text"], rng)
+		transcripts.append(turn["text"])
+		mic.speak(samples)
+		mic.speech_done.wait()
+		end = mic.speech_end_at or time.perf_counter()
+		if turn["type"] == "exit":
+			break
+		row = results.setdefault(turn["type"], {"response": [], "turn": [], "missed": []})
+		started = time.time()
+		while not pipeline.busy and time.time() - started < 10:
+			time.sleep(0.005)
+		if not pipeline.busy:
+			row["missed"].append(turn["text"])
+			transcripts.clear()
+			continue
+		while pipeline.busy and time.time() - started < 120:
+			time.sleep(0.005)
+		done = time.perf_counter()
+		first = sink.first_after(end)
+		if first is not None:
+			row["response"].append(first - end)
+		row["turn"].append(done - end)
+		print(f"  turn {i + 1:>3} {turn['type']:<8} response {((first or done) - end) * 1000:7.0f} ms"
+			f"  turn {(done - end) * 1000:7.0f} ms  {turn['text']!r}")
+	for service in services.values():
+		service.close()
+	return results
+
+
+def report(results: Dict[str, Dict[str, list]], baseline: Optional[dict]) -> None:
+	print(f"\n  {'type':<9}{'n':>4}{'response p50':>15}{'p95':>9}{'p99':>9}{'turn p50':>12}{'p95':>9}{'p99':>9}{'missed':>8}")
+	for kind, row in results.items():
+		resp, turn = row["response"], row["turn"]
+		line = (f"  {kind:<9}{len(turn):>4}{pct(resp, 50) * 1000:>12.0f} ms{pct(resp, 95) * 1000:>6.0f} ms"
+			f"{pct(resp, 99) * 1000:>6.0f} ms{pct(turn, 50) * 1000:>9.0f} ms{pct(turn, 95) * 1000:>6.0f} ms"
+			f"{pct(turn, 99) * 1000:>6.0f} ms{len(row['missed']):>8}")
+		old = (baseline or {}).get(kind)
+		if old and old.get("response"):
+			delta = (pct(resp, 50) - pct(old["response"], 50)) * 1000
+			line += f"   p50 {delta:+.0f} ms vs baseline"
+		print(line)
+
+
+def report_stages() -> None:
+	"""Where the time went, from the spans friday_trace recorded during the session."""
+	from friday_trace import get_tracer
+	stats = get_tracer().stats()
+	if not stats:
+		return
+	print(f"\n  {'span':<24}{'n':>5}{'p50':>10}{'p95':>9}{'p99':>9}")
+	for name, row in stats.items():
+		print(f"  {name:<24}{row['count']:>5}{row['p50']:>7.0f} ms{row['p95']:>6.0f} ms{row['p99']:>6.0f} ms")
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--rounds", type=int, default=3, help="passes over the built-in session")
+	ap.add_argument("--session", type=Path, help="JSON lines of {type, text, wav?}")
+	ap.add_argument("--latency", help="override stand-in latencies, e.g. openai=0.8,asr=0.2")
+	ap.add_argument("--playback-scale", type=float, default=0.0,
+		help="0 plays replies instantly; 1 takes as long as the audio")
+	ap.add_argument("--json", type=Path, help="write raw samples here")
+	ap.add_argument("--baseline", type=Path, help="earlier --json output to compare against")
+	args = ap.parse_args()
+
+	if args.session:
+		with open(args.session, encoding="utf-8") as fh:
+			turns = [json.loads(line) for line in fh if line.strip()]
+	else:
+		turns = built_in_session(args.rounds)
+	baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+	print(f"{len(turns)} turns through main.main() against local stand-ins")
+	results = run_session(turns, args)
+	report(results, baseline)
+	report_stages()
+	if args.json:
+		args.json.write_text(json.dumps(results, indent=1))
+	sys.stdout.flush()
+	# main() and its daemon threads are left running; nothing to clean up beyond the process
+	os._exit(0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,119 @@
+"""
+ElevenLabs time-to-first-audio: buffered download vs streaming playback.
+
+A local stand-in emits chunked MP3 (silent frames) at a steady rate, like the real
+streaming endpoint. Playback is replaced by recorders that timestamp when audio would
+start: PCM/file playback for the buffered path, the first decodable prebuffer for streaming.
+
+    python benchmarks/bench_elevenlabs.py [--seconds 6] [--chunk-delay 0.05]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+from standins import StandIn
+
+# One MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, no padding -> 417 bytes, ~26 ms of silence
+MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+FRAMES_PER_SECOND = 38
+
+
+def elevenlabs_handler(seconds: float, chunk_frames: int, chunk_delay: float):
+	total = int(seconds * FRAMES_PER_SECOND)
+
+	def chunks():
+		for _ in range(0, total, chunk_frames):
+			time.sleep(chunk_delay)
+			yield MP3_FRAME * chunk_frames
+
+	def handler(method, path, headers, body):
+		if method == "GET":
+			# Voice lookup made when the provider warms up
+			return 200, {"Content-Type": "application/json"}, b'{"voice_id": "stand-in"}'
+		if path.split("?")[0].endswith("/stream"):
+			return 200, {"Content-Type": "audio/mpeg"}, chunks()
+		return 200, {"Content-Type": "audio/mpeg"}, b"".join(chunks())
+	return handler
+
+
+class RecordingPlayer:
+	"""Stand-in for friday_audio's streaming player: records when playback would begin."""
+
+	def __init__(self, start: float, prebuffer: int = 8192) -> None:
+		self.start = start
+		self.prebuffer = prebuffer
+		self.received = 0
+		self.first_audio = None
+
+	def feed(self, chunk: bytes) -> None:
+		self.received += len(chunk)
+		if self.first_audio is None and self.received >= self.prebuffer:
+			self.first_audio = time.perf_counter() - self.start
+
+	def finish(self) -> None:
+		pass
+
+	def wait(self, timeout=None) -> bool:
+		return True
+
+	def stop(self) -> None:
+		pass
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--seconds", type=float, default=6.0, help="length of the synthesized answer")
+	ap.add_argument("--chunk-delay", type=float, default=0.05)
+	ap.add_argument("--chunk-frames", type=int, default=4)
+	args = ap.parse_args()
+
+	server = StandIn(elevenlabs_handler(args.seconds, args.chunk_frames, args.chunk_delay))
+	os.environ.update({
+		"ELEVENLABS_API_KEY": "stand-in",
+		"ELEVENLABS_API_URL": server.url,
+		"FRIDAY_TTS_PROVIDER": "elevenlabs",
+		"FRIDAY_CACHE_DIR": tempfile.mkdtemp(prefix="friday-bench-"),
+	})
+	import friday_voice
+
+	def make_voice():
+		voice = friday_voice.FridayVoice.__new__(friday_voice.FridayVoice)
+		voice._init_tts()
+		return voice
+
+	try:
+		marks = {}
+		start = time.perf_counter()
+		def mark_buffered(*args, **kwargs) -> bool:
+			marks.setdefault("buffered", time.perf_counter() - start)
+			return True
+
+		friday_voice._playsound = lambda: mark_buffered
+		friday_voice.play_pcm = mark_buffered
+		os.environ["FRIDAY_ELEVENLABS_STREAM"] = "false"
+		make_voice().say("A long answer, buffered.").wait()
+
+		player = None
+
+		def open_stream():
+			nonlocal player
+			player = RecordingPlayer(start)
+			return player
+
+		friday_voice.open_mp3_stream = open_stream
+		os.environ["FRIDAY_ELEVENLABS_STREAM"] = "true"
+		start = time.perf_counter()
+		make_voice().say("A long answer, streamed.").wait()
+		total_stream = time.perf_counter() - start
+
+		print(f"answer={args.seconds:.1f}s of audio, chunk every {args.chunk_delay * 1000:.0f} ms")
+		print(f"  buffered download -> playback : {marks.get('buffered', float('nan')) * 1000:8.1f} ms to first audio")
+		print(f"  streaming playback             : {(player.first_audio or float('nan')) * 1000:8.1f} ms to first audio")
+		print(f"  streaming download complete    : {total_stream * 1000:8.1f} ms")
+	finally:
+		server.close()
+
+
+if __name__ == "__main__":
+	main()
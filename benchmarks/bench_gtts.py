@@ -0,0 +1,74 @@
+"""
+Per-utterance local cost of the gTTS path: legacy temp-file + MP3 re-encode vs in-memory PCM.
+
+gTTS itself is replaced by a fixed MP3 (so network time is excluded) and playback by a
+no-op, leaving only what FRIDAY does with the audio. The legacy path needs pydub with
+ffmpeg on PATH and is skipped otherwise.
+
+    python benchmarks/bench_gtts.py [--phrases 300] [--seconds 2.5]
+"""
+import os
+import shutil
+import argparse
+import tempfile
+import time
+
+import standins  # noqa: F401  (puts the repo root on sys.path)
+
+from friday_audio import decode_audio, speed_up_pcm
+
+# One MPEG-1 Layer III frame: 128 kbps, 44.1 kHz -> 417 bytes, ~26 ms of silence
+MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+SPEED = 1.2
+
+
+def legacy_path(mp3: bytes) -> None:
+	from pydub import AudioSegment  # type: ignore
+	from pydub.effects import speedup  # type: ignore
+	with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
+		mp3_path = tmp.name
+		tmp.write(mp3)
+	try:
+		seg = AudioSegment.from_file(mp3_path, format="mp3")
+		seg_fast = speedup(seg, playback_speed=SPEED)
+		with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as sped_tmp:
+			sped_path = sped_tmp.name
+		seg_fast.export(sped_path, format="mp3")
+		os.unlink(sped_path)
+	finally:
+		os.unlink(mp3_path)
+
+
+def in_memory_path(mp3: bytes) -> None:
+	pcm = decode_audio(mp3)
+	if pcm is None:
+		raise RuntimeError("no in-memory decoder (install miniaudio or pydub+ffmpeg)")
+	speed_up_pcm(pcm, SPEED)
+
+
+def run(fn, mp3: bytes, phrases: int) -> float:
+	start = time.perf_counter()
+	for _ in range(phrases):
+		fn(mp3)
+	return (time.perf_counter() - start) / phrases
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--phrases", type=int, default=300)
+	ap.add_argument("--seconds", type=float, default=2.5, help="length of each phrase")
+	args = ap.parse_args()
+	mp3 = MP3_FRAME * int(args.seconds * 38)
+
+	print(f"phrases={args.phrases} length={args.seconds:.1f}s speed-up={SPEED}x")
+	if shutil.which("ffmpeg"):
+		legacy = run(legacy_path, mp3, args.phrases)
+		print(f"  legacy temp files + re-encode : {legacy * 1000:8.2f} ms/utterance")
+	else:
+		print("  legacy temp files + re-encode : skipped (ffmpeg not on PATH)")
+	new = run(in_memory_path, mp3, args.phrases)
+	print(f"  in-memory decode once to PCM  : {new * 1000:8.2f} ms/utterance")
+
+
+if __name__ == "__main__":
+	main()
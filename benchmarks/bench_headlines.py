@@ -0,0 +1,143 @@
+"""
+Headline store benchmark. Four stand-in feeds syndicate a shared pool of synthetic stories,
+each reworded per outlet: words dropped or swapped, digits spelled out, a clause appended.
+Unrelated stories draw on a small topic vocabulary, so they share words too.
+
+Reported:
+- what a re-fetch, parse and exact-title dedupe per query (the old _get_news) reads aloud,
+  against the store's one headline per cluster;
+- pair-level clustering precision and recall against the true stories;
+- cold ingest, revalidation and query latency through FridayWeb;
+- MinHash signature throughput.
+
+    python benchmarks/bench_headlines.py [--stories 60] [--latency 0.2] [--threshold 0.7]
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import itertools
+from typing import Dict, List, Tuple
+
+os.environ.setdefault("FRIDAY_CACHE_DIR", tempfile.mkdtemp(prefix="friday-headlines-"))
+
+from standins import StandIn, timed
+from bench_news import feed_handler
+
+import feedparser
+
+from friday_news import HeadlineStore, signatures
+from friday_web import FridayWeb
+
+OUTLETS = ["bbc", "toi", "hindu", "express"]
+NUMBERS = {"2": "two", "3": "three", "4": "four", "5": "five", "6": "six", "7": "seven"}
+
+
+def make_stories(rng: random.Random, n: int) -> List[List[str]]:
+	topics = [f"{a}{b}" for a, b in itertools.product("bcdfghklmnprstvz", "aeiou")]
+	names = [f"{a}{b}{c}" for a, b, c in itertools.product("BDGKMPRSTV", "aeiou", "nrlsk")]
+	stories = []
+	for _ in range(n):
+		words = rng.sample(topics, 5) + rng.sample(names, 2) + [rng.choice(list(NUMBERS))]
+		rng.shuffle(words)
+		stories.append(words)
+	return stories
+
+
+def reword(rng: random.Random, words: List[str]) -> str:
+	words = list(words)
+	if rng.random() < 0.5:
+		words.pop(rng.randrange(len(words)))
+	if rng.random() < 0.5:
+		i = rng.randrange(len(words) - 1)
+		words[i], words[i + 1] = words[i + 1], words[i]
+	words = [NUMBERS.get(w, w) if rng.random() < 0.5 else w for w in words]
+	if rng.random() < 0.4:
+		words += ["says", "minister", "report"][:rng.randint(1, 3)]
+	return " ".join(words).capitalize()
+
+
+def make_feeds(rng: random.Random, stories: List[List[str]]) -> Tuple[Dict[str, bytes], Dict[str, int]]:
+	"""Per outlet an RSS document; each story appears in 1-4 outlets. Also uid -> story index."""
+	items: Dict[str, List[str]] = {o: [] for o in OUTLETS}
+	truth: Dict[str, int] = {}
+	now = time.time()
+	for s, words in enumerate(stories):
+		stamp = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(now - 3600 + s * 60))
+		for outlet in rng.sample(OUTLETS, rng.randint(1, 4)):
+			uid = f"urn:bench:{outlet}-{s}"
+			truth[uid] = s
+			items[outlet].append(f"<item><title>{reword(rng, words)}</title><guid>{uid}</guid>"
+				f"<link>http://example.invalid/{outlet}/{s}</link><pubDate>{stamp}</pubDate></item>")
+	docs = {o: f'<?xml version="1.0"?><rss version="2.0"><channel><title>{o}</title>{"".join(rows)}</channel></rss>'.encode()
+		for o, rows in items.items()}
+	return docs, truth
+
+
+def pair_scores(store: HeadlineStore, truth: Dict[str, int]) -> Tuple[float, float]:
+	rows = store._db.execute("SELECT uid, cluster FROM headlines").fetchall()
+	same_pred = same_true = both = 0
+	for (u1, c1), (u2, c2) in itertools.combinations(rows, 2):
+		pred, real = c1 == c2, truth[u1] == truth[u2]
+		same_pred += pred
+		same_true += real
+		both += pred and real
+	return (both / same_pred if same_pred else 1.0), (both / same_true if same_true else 1.0)
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--stories", type=int, default=60)
+	ap.add_argument("--latency", type=float, default=0.2)
+	ap.add_argument("--threshold", type=float, default=0.7)
+	ap.add_argument("--seed", type=int, default=7)
+	args = ap.parse_args()
+
+	rng = random.Random(args.seed)
+	docs, truth = make_feeds(rng, make_stories(rng, args.stories))
+	servers = [StandIn(feed_handler(doc), latency=args.latency) for doc in docs.values()]
+	urls = [s.url + "/rss.xml" for s in servers]
+	try:
+		def refetch() -> List[str]:
+			# The old query path: download and parse every feed, exact-title dedupe, sort
+			entries = [e for u in urls for e in feedparser.parse(u).entries]
+			seen, unique = set(), []
+			for e in sorted(entries, key=lambda e: e.published_parsed, reverse=True):
+				if e.title not in seen:
+					seen.add(e.title)
+					unique.append(e)
+			return [e.title for e in unique]
+
+		refetch_s, titles = timed(refetch)
+
+		web = FridayWeb()
+		web.headlines = HeadlineStore(path=os.path.join(os.environ["FRIDAY_CACHE_DIR"], "bench.sqlite3"), threshold=args.threshold)
+		web._rss_feeds = lambda locality: urls  # type: ignore[assignment]
+		ingest_s, _ = timed(lambda: web.refresh_news(None))
+		query_s, _ = timed(lambda: web._get_news(), repeat=20)
+		web.news_max_age = 0
+		revalidate_s, _ = timed(lambda: web._get_news(), repeat=3)
+		stats = web.headlines.stats()
+		precision, recall = pair_scores(web.headlines, truth)
+
+		sample = [reword(rng, w) for w in make_stories(rng, 2000)]
+		sig_s, _ = timed(lambda: signatures(sample), repeat=3)
+
+		print(f"stories={args.stories} headlines={len(truth)} feeds={len(urls)} latency={args.latency:.2f}s "
+			f"threshold={args.threshold}")
+		print(f"  re-fetch + exact dedupe     : {len(titles):4d} headlines for {args.stories} stories, "
+			f"{refetch_s * 1000:7.1f} ms per query")
+		print(f"  store, one per cluster      : {stats['clusters']:4d} clusters for {args.stories} stories")
+		print(f"  clustering precision/recall : {precision:.3f} / {recall:.3f} (pairs)")
+		print(f"  cold ingest (parallel)      : {ingest_s * 1000:7.1f} ms")
+		print(f"  query, store fresh          : {query_s * 1000:7.2f} ms")
+		print(f"  query after 304 revalidation: {revalidate_s * 1000:7.1f} ms")
+		print(f"  MinHash signatures          : {len(sample) / sig_s:,.0f} titles/s")
+	finally:
+		for s in servers:
+			s.close()
+
+
+if __name__ == "__main__":
+	main()
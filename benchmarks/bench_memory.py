@@ -0,0 +1,72 @@
+"""
+Conversation memory benchmark: legacy 15-exchange window vs token-budgeted memory.
+
+Drives a 200-turn session of wordy prompts through FridayBrain.answer() against a local
+OpenAI-compatible stand-in whose latency grows with prompt size, and reports prompt
+tokens and request latency per phase of the session.
+
+    python benchmarks/bench_memory.py [--turns 200] [--prefill 0.0002]
+"""
+import os
+import argparse
+import statistics
+import time
+
+from standins import StandIn, chat_completions_handler
+
+
+def wordy_prompt(i: int) -> str:
+	return (
+		f"Friday, about item number {i}: I was thinking, and correct me if I am wrong, that we should "
+		"really go over the whole plan again, including the travel, the meetings, the budget and "
+		"whatever else you remember from earlier, because honestly I keep losing track of it all."
+	)
+
+
+def run(brain_cls, turns: int):
+	from friday_brain import count_tokens
+	brain = brain_cls()
+	rows = []
+	for i in range(turns):
+		prompt = wordy_prompt(i)
+		sent = sum(count_tokens(m["content"]) for m in brain.memory) + count_tokens(prompt)
+		start = time.perf_counter()
+		brain.answer(prompt)
+		rows.append((sent, time.perf_counter() - start))
+	return rows
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--turns", type=int, default=200)
+	ap.add_argument("--prefill", type=float, default=0.0002, help="stand-in seconds per prompt token")
+	args = ap.parse_args()
+
+	reply = "Understood, Boss. " + "Here is the recap you asked for, point by point. " * 4
+	server = StandIn(chat_completions_handler(lambda m: reply, token_delay=0.0, prefill_per_token=args.prefill))
+	os.environ["OPENAI_BASE_URL"] = server.url + "/v1"
+	os.environ.setdefault("OPENAI_API_KEY", "stand-in")
+	from friday_brain import FridayBrain
+
+	class LegacyBrain(FridayBrain):
+		def _remember_exchange(self, user: str, assistant: str) -> None:
+			self.memory.append({"role": "user", "content": user})
+			self.memory.append({"role": "assistant", "content": assistant})
+			max_messages = 1 + 15 * 2
+			if len(self.memory) > max_messages:
+				self.memory = [self.memory[0]] + self.memory[-(max_messages - 1):]
+
+	try:
+		print(f"turns={args.turns} prefill={args.prefill * 1000:.2f} ms/token")
+		for label, cls in (("before (15 exchanges)", LegacyBrain), ("after (token budget)", FridayBrain)):
+			rows = run(cls, args.turns)
+			tail = rows[len(rows) // 2:]
+			print(f"  {label}")
+			print(f"    prompt tokens  mean={statistics.mean(r[0] for r in rows):7.0f}  max={max(r[0] for r in rows):6d}  steady={statistics.mean(r[0] for r in tail):7.0f}")
+			print(f"    latency ms     mean={statistics.mean(r[1] for r in rows) * 1000:7.1f}  steady={statistics.mean(r[1] for r in tail) * 1000:7.1f}")
+	finally:
+		server.close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,71 @@
+"""
+News fetching benchmark: sequential feedparser.parse vs FridayWeb._get_news.
+
+Runs against local stand-in RSS servers with injected latency and ETag support, and
+reports a cold fetch (full downloads) and a warm fetch (304 revalidation).
+
+    python benchmarks/bench_news.py [--feeds 4] [--latency 0.4] [--items 30]
+"""
+import argparse
+import hashlib
+import time
+
+from standins import StandIn, timed
+
+import feedparser
+
+from friday_web import FridayWeb
+
+
+def make_feed(name: str, items: int) -> bytes:
+	now = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+	rows = "".join(
+		f"<item><title>{name} story {i}</title><link>http://example.invalid/{name}/{i}</link>"
+		f"<pubDate>{now}</pubDate><description>{'lorem ipsum ' * 40}</description></item>"
+		for i in range(items)
+	)
+	return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>{rows}</channel></rss>'.encode()
+
+
+def feed_handler(doc: bytes):
+	etag = '"' + hashlib.sha1(doc).hexdigest() + '"'
+
+	def handler(method, path, headers, body):
+		if headers.get("If-None-Match") == etag:
+			return 304, {"ETag": etag}, b""
+		return 200, {"Content-Type": "application/rss+xml", "ETag": etag}, doc
+	return handler
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--feeds", type=int, default=4)
+	ap.add_argument("--latency", type=float, default=0.4)
+	ap.add_argument("--items", type=int, default=30)
+	args = ap.parse_args()
+
+	servers = [StandIn(feed_handler(make_feed(f"feed{i}", args.items)), latency=args.latency) for i in range(args.feeds)]
+	urls = [s.url + "/rss.xml" for s in servers]
+	try:
+		def sequential() -> int:
+			return sum(len(feedparser.parse(u).entries) for u in urls)
+
+		web = FridayWeb()
+		web._rss_feeds = lambda locality: urls  # type: ignore[assignment]
+
+		seq_s, _ = timed(sequential)
+		cold_s, cold = timed(lambda: web._get_news())
+		warm_s, warm = timed(lambda: web._get_news(), repeat=3)
+
+		print(f"feeds={args.feeds} latency={args.latency:.2f}s items/feed={args.items}")
+		print(f"  sequential feedparser.parse : {seq_s * 1000:8.1f} ms")
+		print(f"  _get_news cold (parallel)   : {cold_s * 1000:8.1f} ms")
+		print(f"  _get_news warm (304s)       : {warm_s * 1000:8.1f} ms")
+		print(f"  same headlines warm/cold    : {cold == warm}")
+	finally:
+		for s in servers:
+			s.close()
+
+
+if __name__ == "__main__":
+	main()
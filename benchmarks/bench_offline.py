@@ -0,0 +1,108 @@
+"""
+Offline turn latency: a general question (FridayWeb.fetch_answer, then FridayBrain.answer)
+when every dependency hangs, as on a dead uplink. OpenAI, Wikipedia and DuckDuckGo are
+pointed at a stand-in that accepts connections and never answers; loopback is not exempted
+from the offline check, so it counts as the internet.
+
+    none        no breakers, no probe: every turn pays every timeout
+    breakers    per-dependency circuit breakers only: the first few turns pay, then skip
+    probe       breakers plus the connectivity probe, which finds no network (its targets
+                are a closed local port): every turn skips at once
+
+Each mode runs in a fresh interpreter.
+
+    python benchmarks/bench_offline.py [--turns 6] [--timeout 2]
+"""
+import os
+import sys
+import json
+import socket
+import argparse
+import statistics
+import subprocess
+import time
+
+from standins import StandIn
+
+MODES = {
+	"none": {"FRIDAY_BREAKERS": "false", "FRIDAY_PROBE": "false"},
+	"breakers": {"FRIDAY_BREAKERS": "true", "FRIDAY_PROBE": "false"},
+	"probe": {"FRIDAY_BREAKERS": "true", "FRIDAY_PROBE": "true"},
+}
+
+
+def child(turns: int) -> None:
+	from friday_web import FridayWeb
+	from friday_brain import FridayBrain
+	from friday_breaker import get_connectivity, breaker_states
+
+	connectivity = get_connectivity()
+	connectivity.start()
+	# Let the first probe land, as it would during startup
+	deadline = time.time() + 2
+	while connectivity.enabled and not connectivity.checked_at and time.time() < deadline:
+		time.sleep(0.01)
+	web, brain = FridayWeb(), FridayBrain()
+	samples = []
+	for i in range(turns):
+		start = time.perf_counter()
+		web.fetch_answer(f"question number {i}")
+		brain.answer(f"question number {i}", use_cache=False)
+		samples.append(time.perf_counter() - start)
+	print("RESULT " + json.dumps({"samples": samples, "states": breaker_states()}))
+
+
+def closed_port() -> int:
+	sock = socket.socket()
+	sock.bind(("127.0.0.1", 0))
+	port = sock.getsockname()[1]
+	sock.close()
+	return port
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--turns", type=int, default=6)
+	ap.add_argument("--timeout", type=float, default=2.0, help="OpenAI and answer timeouts (s)")
+	ap.add_argument("--child", type=int)
+	args = ap.parse_args()
+	if args.child:
+		child(args.child)
+		return
+
+	hung = StandIn(lambda *a: (200, {}, b""), latency=3600)
+	env = dict(os.environ)
+	env.update({
+		"OPENAI_API_KEY": "stand-in",
+		"OPENAI_BASE_URL": hung.url + "/v1",
+		"FRIDAY_WIKIPEDIA_API": hung.url + "/w/api.php",
+		"FRIDAY_DUCKDUCKGO_API": hung.url + "/",
+		"FRIDAY_OFFLINE_EXEMPT": "",
+		"FRIDAY_PROBE_TARGETS": f"127.0.0.1:{closed_port()}",
+		"FRIDAY_OPENAI_TIMEOUT": str(args.timeout),
+		"FRIDAY_ANSWER_TIMEOUT": str(args.timeout),
+		"FRIDAY_RESPONSE_CACHE": "false",
+	})
+	try:
+		print(f"{args.turns} general-question turns, every dependency hung, timeouts {args.timeout:.1f} s")
+		print(f"  {'mode':<10}{'first turn':>12}{'p50':>10}{'last turn':>12}   breakers after the run")
+		for mode, overrides in MODES.items():
+			proc = subprocess.run(
+				[sys.executable, os.path.abspath(__file__), "--child", str(args.turns)],
+				env=dict(env, **overrides), capture_output=True, text=True, timeout=600,
+			)
+			line = next((l for l in proc.stdout.splitlines() if l.startswith("RESULT ")), None)
+			if line is None:
+				print(proc.stdout[-2000:], proc.stderr[-2000:])
+				raise RuntimeError(f"mode {mode} produced no result")
+			result = json.loads(line[len("RESULT "):])
+			samples = result["samples"]
+			states = ", ".join(f"{name} {s['state']} ({s['rejected']} skipped)" for name, s in result["states"]["breakers"].items())
+			print(f"  {mode:<10}{samples[0] * 1000:>9.0f} ms{statistics.median(samples) * 1000:>7.0f} ms"
+				f"{samples[-1] * 1000:>9.0f} ms   {states or '-'}")
+	finally:
+		hung.close()
+
+
+if __name__ == "__main__":
+	main()
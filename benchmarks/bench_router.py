@@ -0,0 +1,154 @@
+"""
+Intent routing: golden-routing check plus throughput of the compiled router.
+
+First verifies every utterance in GOLDEN routes to the expected intent and slots (exit
+status 1 on any mismatch), then times routing over a generated corpus and compares it
+with the legacy chain of substring checks from main/FridaySystem/FridayWeb.
+
+    python benchmarks/bench_router.py [--corpus 5000]
+"""
+import sys
+import random
+import argparse
+import time
+
+import standins  # noqa: F401  (puts the repo root on sys.path)
+
+from friday_intents import route
+
+# (utterance, expected intent or None, expected slots subset)
+GOLDEN = [
+	("open chrome", "open_app", {"app": "chrome"}),
+	("Launch Chrome please", "open_app", {"app": "Chrome"}),
+	("open vs code", "open_app", {"app": "vs code"}),
+	("launch code", "open_app", {"app": "code"}),
+	("open spotify", "open_app", {"app": "spotify"}),
+	("google quantum computing", "google_search", {"query": "quantum computing"}),
+	("search for cheap flights to Goa", "google_search", {"query": "cheap flights to Goa"}),
+	("google how to exit vim", "google_search", {"query": "how to exit vim"}),
+	("youtube lo-fi beats", "youtube_search", {"query": "lo-fi beats"}),
+	("search youtube for cricket highlights", "youtube_search", {"query": "cricket highlights"}),
+	("wikipedia Alan Turing", "wikipedia_search", {"query": "Alan Turing"}),
+	("search wikipedia black holes", "wikipedia_search", {"query": "black holes"}),
+	("exit", "exit", {}),
+	("quit", "exit", {}),
+	("friday shutdown", "exit", {}),
+	("shutdown now", "exit", {}),
+	("status report", "status_report", {}),
+	("status", "status_report", {}),
+	("give me a status report", "status_report", {}),
+	("mute the volume", "volume_mute", {}),
+	("volume mute", "volume_mute", {}),
+	("unmute volume", "volume_unmute", {}),
+	("restore the volume", "volume_unmute", {}),
+	("volume up", "volume_up", {}),
+	("turn the volume down", "volume_down", {}),
+	("shutdown system", "power_shutdown", {}),
+	("shut down the pc", "power_shutdown", {}),
+	("restart pc", "power_restart", {}),
+	("what time is it", "time", {}),
+	("tell me the time", "time", {}),
+	("what's the weather", "weather", {}),
+	("weather in New York?", "weather", {"city": "New York"}),
+	("what is the temperature in vizag", "weather", {"city": "vizag"}),
+	("weather for tomorrow", "weather", {"city": None}),
+	("how is the weather at the moment", "weather", {"city": None}),
+	("weather in Delhi today", "weather", {"city": "Delhi"}),
+	("what's the weather in new york right now", "weather", {"city": "new york"}),
+	("weather in the evening", "weather", {"city": None}),
+	("news", "news", {}),
+	("latest headlines", "news", {}),
+	("local news", "news", {"locality": "local"}),
+	("vizag headlines", "news", {"locality": "vizag"}),
+	# Substring traps the old chains fell into
+	("sometimes I feel tired", None, {}),
+	("is this an existing feature", None, {}),
+	("tell me about quitters", None, {}),
+	("how are you", None, {}),
+	("who wrote the odyssey", None, {}),
+]
+
+
+def legacy_route(query: str):
+	q = query.lower()
+	if any(k in q for k in ("exit", "quit", "friday shutdown ")):
+		return "exit"
+	if "status report" in q or q.strip() == "status":
+		return "status_report"
+	if any(k in q for k in ["open chrome", "launch chrome", "start chrome"]):
+		return "open_app"
+	if any(k in q for k in ["open vscode", "open vs code", "launch code"]):
+		return "open_app"
+	if "open spotify" in q:
+		return "open_app"
+	if q.startswith("google ") or q.startswith("search "):
+		return "google_search"
+	if q.startswith("youtube ") or "search youtube" in q:
+		return "youtube_search"
+	if q.startswith("wikipedia ") or "search wikipedia" in q:
+		return "wikipedia_search"
+	if "mute" in q and "volume" in q:
+		return "volume_mute"
+	if ("unmute" in q or "restore" in q) and "volume" in q:
+		return "volume_unmute"
+	if "volume up" in q:
+		return "volume_up"
+	if "volume down" in q:
+		return "volume_down"
+	if "shutdown system" in q or "shutdown pc" in q:
+		return "power_shutdown"
+	if "restart system" in q or "restart pc" in q:
+		return "power_restart"
+	if "time" in q:
+		return "time"
+	if "weather" in q:
+		return "weather"
+	if "news" in q or "headlines" in q:
+		return "news"
+	return None
+
+
+def check_golden() -> int:
+	failures = 0
+	for text, expected, slots in GOLDEN:
+		got = route(text)
+		name = got.name if got else None
+		ok = name == expected and all((got.slots.get(k) if got else None) == v for k, v in slots.items())
+		if not ok:
+			failures += 1
+			print(f"  MISROUTE {text!r}: expected {expected} {slots}, got {got}")
+	print(f"golden routing: {len(GOLDEN) - failures}/{len(GOLDEN)} correct")
+	return failures
+
+
+def make_corpus(size: int):
+	rng = random.Random(7)
+	fillers = ["", "friday ", "hey ", "please ", "could you "]
+	tails = ["", " please", " right now", " for me", " quickly"]
+	base = [g[0] for g in GOLDEN] + [
+		"what do you think about the monsoon this year and the crops",
+		"explain the difference between a virus and a bacterium in simple words",
+		"remind me what we discussed about the budget for the trip",
+	]
+	return [rng.choice(fillers) + rng.choice(base) + rng.choice(tails) for _ in range(size)]
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--corpus", type=int, default=5000)
+	args = ap.parse_args()
+
+	failures = check_golden()
+	corpus = make_corpus(args.corpus)
+	route(corpus[0])  # compile once outside the timed loop
+	for label, fn in (("compiled router", route), ("legacy substring chain", legacy_route)):
+		start = time.perf_counter()
+		for text in corpus:
+			fn(text)
+		elapsed = time.perf_counter() - start
+		print(f"  {label:24s}: {len(corpus) / elapsed:10.0f} utterances/s  ({elapsed / len(corpus) * 1e6:6.1f} us each)")
+	sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+	main()
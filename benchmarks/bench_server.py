@@ -0,0 +1,187 @@
+"""
+Load test for friday_server. At each concurrency level (default 1, 10 and 100), that many
+sessions send queries back to back for --seconds. Each client waits for its reply before
+sending the next query. Every upstream service is a local stand-in with scripted latency,
+the same ones bench_e2e uses.
+
+The query mix covers time, weather, news, general knowledge and chat. Chat prompts are
+unique, so they reach the OpenAI stand-in rather than the shared response cache. The
+report gives requests per second and p50/p95/p99 latency per level, plus 503s from
+admission control.
+
+    python benchmarks/bench_server.py [--levels 1,10,100] [--seconds 10] [--latency openai=0.6]
+		[--workers 128] [--upstream 32]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import secrets
+import tempfile
+import threading
+import subprocess
+import http.client
+from collections import deque
+from typing import Dict, List, Tuple
+
+from standins import ROOT
+from bench_e2e import KNOWLEDGE, LATENCY, pct, service_env, start_services
+
+TOKEN = secrets.token_urlsafe(16)
+CITIES = ["Mumbai", "Chennai", "Delhi", "Kolkata", "Pune", "Hyderabad"]
+
+
+def make_query(rng: random.Random, n: int) -> Tuple[str, str]:
+	kind = rng.choices(["time", "weather", "news", "general", "chat"], weights=[1, 2, 2, 2, 3])[0]
+	if kind == "time":
+		return kind, "what time is it"
+	if kind == "weather":
+		return kind, f"weather in {rng.choice(CITIES)}"
+	if kind == "news":
+		return kind, rng.choice(["latest news headlines", "local news"])
+	if kind == "general":
+		return kind, f"tell me about {rng.choice(list(KNOWLEDGE))}"
+	return kind, f"help me plan errand number {n} for the afternoon"
+
+
+def start_server(env: Dict[str, str]) -> Tuple[subprocess.Popen, str, int]:
+	proc = subprocess.Popen([sys.executable, str(ROOT / "friday_server.py"), "--port", "0"], cwd=str(ROOT),
+		env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+	deadline = time.time() + 60
+	while time.time() < deadline:
+		line = proc.stdout.readline()
+		if not line:
+			break
+		if "listening on" in line:
+			host, port = line.rsplit("//", 1)[1].strip().rsplit(":", 1)
+			# Keep draining the server's output so it never blocks on a full pipe
+			threading.Thread(target=lambda: deque(proc.stdout, maxlen=0), daemon=True).start()
+			return proc, host, int(port)
+	proc.kill()
+	raise RuntimeError("friday_server did not start")
+
+
+def request(conn: http.client.HTTPConnection, method: str, path: str, payload=None) -> Tuple[int, dict]:
+	body = json.dumps(payload) if payload is not None else None
+	conn.request(method, path, body=body, headers={
+		"Content-Type": "application/json", "Authorization": f"Bearer {TOKEN}"})
+	resp = conn.getresponse()
+	return resp.status, json.loads(resp.read() or b"{}")
+
+
+def run_level(host: str, port: int, sessions: int, seconds: float, seed: int) -> Dict[str, object]:
+	latencies: List[float] = []
+	by_kind: Dict[str, List[float]] = {}
+	counts = {"ok": 0, "busy": 0, "errors": 0}
+	lock = threading.Lock()
+	ready = threading.Barrier(sessions + 1)
+	go = threading.Event()
+	deadline = [0.0]
+
+	def client(idx: int) -> None:
+		rng = random.Random(seed * 1000 + idx)
+		conn = http.client.HTTPConnection(host, port, timeout=120)
+		status, data = request(conn, "POST", "/v1/sessions")
+		sid = data.get("session")
+		ready.wait()
+		go.wait()
+		n = 0
+		while time.perf_counter() < deadline[0]:
+			n += 1
+			kind, text = make_query(rng, seed * 100000 + idx * 1000 + n)
+			t0 = time.perf_counter()
+			try:
+				status, data = request(conn, "POST", "/v1/query", {"session": sid, "text": text})
+			except Exception:
+				status = 0
+				conn.close()
+				conn = http.client.HTTPConnection(host, port, timeout=120)
+			ms = (time.perf_counter() - t0) * 1000.0
+			with lock:
+				if status == 200 and data.get("replies"):
+					counts["ok"] += 1
+					latencies.append(ms)
+					by_kind.setdefault(kind, []).append(ms)
+				elif status == 503:
+					counts["busy"] += 1
+				else:
+					counts["errors"] += 1
+			if status == 503:
+				time.sleep(0.05)
+		try:
+			request(conn, "DELETE", f"/v1/sessions/{sid}")
+		except Exception:
+			pass
+		conn.close()
+
+	threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(sessions)]
+	for t in threads:
+		t.start()
+	# Every session exists before the clock starts
+	ready.wait()
+	begin = time.perf_counter()
+	deadline[0] = begin + seconds
+	go.set()
+	for t in threads:
+		t.join()
+	elapsed = time.perf_counter() - begin
+	return {"sessions": sessions, "elapsed": elapsed, "latencies": latencies, "by_kind": by_kind, **counts}
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--levels", default="1,10,100")
+	ap.add_argument("--seconds", type=float, default=10.0)
+	ap.add_argument("--latency", help="override stand-in latencies, e.g. openai=0.8,wikipedia=0.4")
+	ap.add_argument("--workers", type=int, help="FRIDAY_SERVER_WORKERS for the server")
+	ap.add_argument("--upstream", type=int, help="FRIDAY_UPSTREAM_LIMIT for the server")
+	args = ap.parse_args()
+
+	latency = dict(LATENCY)
+	for item in filter(None, (args.latency or "").split(",")):
+		name, _, value = item.partition("=")
+		latency[name.strip()] = float(value)
+	services = start_services(latency, deque())
+	env = dict(os.environ)
+	env.update(service_env(services))
+	env["FRIDAY_CACHE_DIR"] = tempfile.mkdtemp(prefix="friday-server-")
+	env["FRIDAY_SERVER_TOKEN"] = TOKEN
+	if args.workers:
+		env["FRIDAY_SERVER_WORKERS"] = str(args.workers)
+	if args.upstream:
+		env["FRIDAY_UPSTREAM_LIMIT"] = str(args.upstream)
+	proc, host, port = start_server(env)
+	try:
+		conn = http.client.HTTPConnection(host, port, timeout=30)
+		# One warm-up turn: imports and the first connections are not part of any level
+		request(conn, "POST", "/v1/query", {"text": "what time is it"})
+		print(f"friday_server on {host}:{port}, {args.seconds:.0f} s per level, closed-loop clients")
+		print(f"\n  {'sessions':>8}{'requests':>10}{'req/s':>9}{'p50':>10}{'p95':>9}{'p99':>9}{'503':>6}{'errors':>8}")
+		results = []
+		for i, level in enumerate(int(x) for x in args.levels.split(",") if x.strip()):
+			r = run_level(host, port, level, args.seconds, seed=i + 1)
+			lat = r["latencies"]
+			print(f"  {level:>8}{r['ok']:>10}{r['ok'] / r['elapsed']:>9.1f}{pct(lat, 50):>7.0f} ms"
+				f"{pct(lat, 95):>6.0f} ms{pct(lat, 99):>6.0f} ms{r['busy']:>6}{r['errors']:>8}")
+			results.append(r)
+		print("\n  p50 by query type (ms)")
+		kinds = sorted({k for r in results for k in r["by_kind"]})
+		print(f"  {'sessions':>8}" + "".join(f"{k:>10}" for k in kinds))
+		for r in results:
+			print(f"  {r['sessions']:>8}" + "".join(f"{pct(r['by_kind'].get(k, []), 50):>10.0f}" for k in kinds))
+		status, health = request(conn, "GET", "/v1/health")
+		wait = health.get("spans", {}).get("upstream.wait")
+		if wait:
+			print(f"\n  upstream slot waits: {wait['count']}, p50 {wait['p50']:.0f} ms, p95 {wait['p95']:.0f} ms"
+				f" (limit {health.get('upstream_limit')})")
+	finally:
+		proc.terminate()
+		proc.wait(timeout=10)
+		for service in services.values():
+			service.close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,108 @@
+"""
+Startup cost: a `python -X importtime` breakdown of `import main`, and time-to-greeting,
+the wall time from launching `main.main()` in a fresh interpreter until the boot greeting
+reaches the TTS layer. Runs are in subprocesses so every import is cold.
+
+No microphone is opened: if sr.Microphone() cannot be built (no PyAudio), a stand-in is
+used. Pass --budget-ms to fail (exit 1) when the median time-to-greeting regresses.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 12] [--budget-ms 1500]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import os, sys, time
+sys.path.insert(0, {repo!r})
+import speech_recognition as sr
+try:
+	sr.Microphone()
+except Exception:
+	class _Mic(sr.AudioSource):
+		SAMPLE_RATE, SAMPLE_WIDTH, CHUNK = 16000, 2, 1024
+		def __init__(self, *args, **kwargs):
+			pass
+		def __enter__(self):
+			raise OSError("no microphone in the startup benchmark")
+		def __exit__(self, *exc):
+			pass
+	sr.Microphone = _Mic
+import friday_voice
+
+def _speak(self, text, cancel):
+	print("GREETING", time.time(), flush=True)
+	os._exit(0)
+
+friday_voice.FridayVoice._speak = _speak
+import main
+main.main()
+"""
+
+
+def import_breakdown(top: int) -> None:
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import main"],
+		cwd=REPO, capture_output=True, text=True,
+	)
+	rows = []
+	for line in proc.stderr.splitlines():
+		if not line.startswith("import time:") or "cumulative" in line:
+			continue
+		self_us, cumulative_us, name = line[len("import time:"):].split("|")
+		# One leading space at top level, two more per nesting level
+		depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+		rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+	total = next((r[0] for r in rows if r[3] == "main"), 0)
+	print(f"import main: {total / 1000:.1f} ms cumulative")
+	print(f"  {'imported by main':<36}{'cumulative':>12}")
+	for cumulative, _, _, name in sorted((r for r in rows if r[2] == 1), reverse=True)[:top]:
+		print(f"  {name:<36}{cumulative / 1000:>9.1f} ms")
+	# Heaviest third-party packages wherever they were first imported
+	packages = [r for r in rows if "." not in r[3] and not r[3].startswith(("friday_", "_")) and r[3] != "main" and r[2] >= 1]
+	print(f"  {'heaviest packages':<36}{'cumulative':>12}")
+	for cumulative, _, _, name in sorted(packages, reverse=True)[:top]:
+		print(f"  {name:<36}{cumulative / 1000:>9.1f} ms")
+
+
+def time_to_greeting(runs: int) -> float:
+	env = dict(os.environ)
+	env.setdefault("FRIDAY_CACHE_DIR", tempfile.mkdtemp(prefix="friday-startup-"))
+	env.setdefault("FRIDAY_PREFETCH", "false")
+	code = CHILD.format(repo=REPO)
+	samples = []
+	for _ in range(runs):
+		start = time.time()
+		proc = subprocess.run([sys.executable, "-c", code], cwd=REPO, env=env, capture_output=True, text=True, timeout=120)
+		stamp = next((line.split()[1] for line in proc.stdout.splitlines() if line.startswith("GREETING")), None)
+		if stamp is None:
+			print(proc.stdout[-2000:], proc.stderr[-2000:])
+			raise RuntimeError("main() never reached the greeting")
+		samples.append((float(stamp) - start) * 1000.0)
+	print(f"time-to-greeting over {runs} runs: median {statistics.median(samples):.0f} ms, "
+		f"min {min(samples):.0f} ms, max {max(samples):.0f} ms")
+	return statistics.median(samples)
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--runs", type=int, default=5)
+	ap.add_argument("--top", type=int, default=12)
+	ap.add_argument("--budget-ms", type=float)
+	args = ap.parse_args()
+
+	import_breakdown(args.top)
+	median = time_to_greeting(args.runs)
+	if args.budget_ms is not None and median > args.budget_ms:
+		print(f"REGRESSION: time-to-greeting {median:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
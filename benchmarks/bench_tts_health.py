@@ -0,0 +1,61 @@
+"""
+Cost of a failing TTS provider per sentence: ElevenLabs stand-in answering 503 after a
+delay, spoken over for a run of sentences. Without the health gate (fail limit set out of
+reach) every sentence pays the failed request before pyttsx3 takes over; with it the
+provider is skipped after FRIDAY_TTS_FAIL_LIMIT failures until its cooldown ends. The
+per-host circuit breakers are turned off, so both runs measure the health gate alone
+rather than a breaker left open by the first run.
+
+    python benchmarks/bench_tts_health.py [--sentences 20] [--latency 0.4]
+"""
+import os
+import argparse
+import tempfile
+import time
+
+from standins import StandIn
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--sentences", type=int, default=20)
+	ap.add_argument("--latency", type=float, default=0.4, help="delay before the stand-in fails")
+	args = ap.parse_args()
+
+	server = StandIn(lambda method, path, headers, body: (503, {}, b"unavailable"), latency=args.latency)
+	os.environ.update({
+		"ELEVENLABS_API_KEY": "stand-in",
+		"ELEVENLABS_API_URL": server.url,
+		"FRIDAY_TTS_PROVIDER": "elevenlabs",
+		"FRIDAY_ELEVENLABS_STREAM": "false",
+		"FRIDAY_BREAKERS": "false",
+		"FRIDAY_PROBE": "false",
+		"FRIDAY_CACHE_DIR": tempfile.mkdtemp(prefix="friday-bench-"),
+	})
+	import friday_voice
+
+	local = []
+	friday_voice.FridayVoice._say_local = lambda self, text: local.append(text)
+	try:
+		print(f"{args.sentences} sentences, provider fails after {args.latency * 1000:.0f} ms")
+		for label, fail_limit in (("no health gate", "1000000"), ("health gate", "2")):
+			os.environ["FRIDAY_TTS_FAIL_LIMIT"] = fail_limit
+			voice = friday_voice.FridayVoice.__new__(friday_voice.FridayVoice)
+			voice._init_tts()
+			voice.warm_up([])
+			requests_before = server.requests
+			local.clear()
+			start = time.perf_counter()
+			for i in range(args.sentences):
+				voice.say(f"Sentence number {i}.")
+			voice.wait_until_idle()
+			total = time.perf_counter() - start
+			print(f"  {label:<16}{total * 1000 / args.sentences:>8.0f} ms/sentence"
+				f"{server.requests - requests_before:>6} requests  {len(local)} spoken locally")
+			print(f"  {'':<16}{voice.tts_health()['elevenlabs']}")
+	finally:
+		server.close()
+
+
+if __name__ == "__main__":
+	main()
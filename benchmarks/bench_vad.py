@@ -0,0 +1,123 @@
+"""
+Endpointing on recorded utterances: speech_recognition's energy/pause_threshold listen()
+versus friday_vad. Each WAV is played through a fake microphone; both modes get the same
+ambient calibration from the file's first 250 ms.
+
+    latency     how long after the true end of speech capture returned
+    truncated   capture returned before speech ended
+    at limit    capture missed the end of speech and ran to the phrase limit or end of file
+
+A corpus directory holds 16-bit mono WAVs plus labels.csv with "file,speech_end_seconds"
+rows. Without --corpus a synthetic one (vowel-like words, pauses, steady and stepped
+noise) is generated.
+
+    python benchmarks/bench_vad.py [--corpus DIR] [--phrase-limit 10]
+"""
+import argparse
+import csv
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+from standins import WavSource
+
+from bench_wakeword import RATE, VOWELS, synth_word
+from friday_vad import listen_vad, energy_floor_db
+from friday_voice import FridayVoice
+from friday_wakeword import read_wav, write_wav
+
+
+def synth_corpus(root: Path, count: int) -> None:
+	rng = np.random.default_rng(11)
+	root.mkdir(parents=True, exist_ok=True)
+	rows = []
+	for i in range(count):
+		level = rng.choice([0.002, 0.008, 0.02, 0.04])
+		parts = [np.zeros(int(RATE * rng.uniform(0.5, 1.0)))]
+		for w in range(int(rng.integers(2, 6))):
+			if w:
+				parts.append(np.zeros(int(RATE * rng.uniform(0.08, 0.25))))
+			parts.append(synth_word(list(rng.integers(0, len(VOWELS), int(rng.integers(2, 4)))), rng,
+				f0=rng.uniform(100, 220), tempo=rng.uniform(0.85, 1.15), noise=0.0))
+		speech = np.concatenate(parts)
+		speech_end = len(speech) / RATE
+		signal = np.concatenate([speech, np.zeros(int(RATE * 3.0))])
+		noise = rng.normal(0, level, len(signal))
+		if i % 4 == 3:
+			# A fan switches on mid-utterance
+			noise[len(noise) // 3:] *= 2.5
+		write_wav(root / f"u{i:03d}.wav", signal + noise, RATE)
+		rows.append((f"u{i:03d}.wav", f"{speech_end:.3f}"))
+	with open(root / "labels.csv", "w", newline="") as fh:
+		csv.writer(fh).writerows(rows)
+
+
+def calibrated_recognizer(samples: np.ndarray, rate: int) -> sr.Recognizer:
+	holder = FridayVoice.__new__(FridayVoice)
+	holder.recognizer = sr.Recognizer()
+	holder._configure_recognizer()
+	ambient = np.tile(samples[: rate // 4], 4)
+	holder.recognizer.adjust_for_ambient_noise(WavSource(ambient, rate), duration=1.0)
+	return holder.recognizer
+
+
+def run_mode(mode: str, samples: np.ndarray, rate: int, phrase_limit: float) -> float:
+	recognizer = calibrated_recognizer(samples, rate)
+	source = WavSource(samples, rate)
+	try:
+		if mode == "vad":
+			floor = energy_floor_db(recognizer.energy_threshold, recognizer.dynamic_energy_ratio)
+			listen_vad(source, timeout=5, phrase_time_limit=phrase_limit, floor_db=floor)
+		else:
+			recognizer.listen(source, timeout=5, phrase_time_limit=phrase_limit)
+	except sr.WaitTimeoutError:
+		return float("nan")
+	return source.seconds_read
+
+
+def pct(values, q):
+	values = sorted(values)
+	return values[int(q * (len(values) - 1))] if values else float("nan")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--corpus", type=Path)
+	parser.add_argument("--count", type=int, default=60, help="synthetic utterances")
+	parser.add_argument("--phrase-limit", type=float, default=10.0)
+	args = parser.parse_args()
+
+	root = args.corpus
+	if root is None:
+		root = Path(tempfile.mkdtemp(prefix="friday-vad-"))
+		synth_corpus(root, args.count)
+		print(f"Synthetic corpus in {root}")
+	with open(root / "labels.csv", newline="") as fh:
+		labels = [(name, float(end)) for name, end in csv.reader(fh)]
+
+	print(f"{len(labels)} utterances, phrase_time_limit {args.phrase_limit:.0f} s")
+	print(f"{'mode':<8}{'p50 latency':>13}{'p95 latency':>13}{'truncated':>11}{'at limit':>10}{'missed':>8}")
+	for mode in ("energy", "vad"):
+		latencies, truncated, at_limit, missed = [], 0, 0, 0
+		for name, speech_end in labels:
+			samples, rate = read_wav(root / name)
+			returned = run_mode(mode, samples, rate, args.phrase_limit)
+			if returned != returned:
+				missed += 1
+				continue
+			if returned < speech_end - 0.02:
+				truncated += 1
+			elif returned - speech_end > 2.5:
+				# Never heard the pause; ran on to the time limit or the end of the recording
+				at_limit += 1
+			else:
+				latencies.append(returned - speech_end)
+		n = len(labels)
+		print(f"{mode:<8}{pct(latencies, 0.5) * 1000:>10.0f} ms{pct(latencies, 0.95) * 1000:>10.0f} ms"
+			f"{100.0 * truncated / n:>10.0f}%{at_limit:>10}{missed:>8}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,135 @@
+"""
+Local wake-word gate on recorded utterances: how many cloud ASR calls it avoids, how long
+detection takes and how much CPU it costs per second of audio.
+
+Fixtures are 16-bit mono WAVs laid out as
+
+    DIR/templates/*.wav   the wake word alone (what `friday_wakeword.py enroll` records)
+    DIR/positive/*.wav    wake word followed by a command
+    DIR/negative/*.wav    speech without the wake word
+
+Without --fixtures a synthetic corpus of vowel-like "words" is generated instead; it
+exercises the pipeline but says nothing about accuracy on real voices.
+
+    python benchmarks/bench_wakeword.py [--fixtures DIR] [--threshold 0.1]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+import standins  # noqa: F401  (puts the repo root on sys.path)
+
+from friday_voice import FridayVoice
+from friday_wakeword import TemplateDetector, read_wav, write_wav
+
+RATE = 16000
+
+# Formant pairs (F1, F2) of a few vowel-like sounds
+VOWELS = [(730, 1090), (270, 2290), (530, 1840), (570, 840), (300, 870), (660, 1720), (440, 1020), (390, 1990)]
+WAKE_WORD = [0, 1, 5]
+
+
+def synth_word(vowels, rng, f0=120.0, tempo=1.0, noise=0.01):
+	parts = []
+	for v in vowels:
+		n = int(RATE * 0.16 / tempo)
+		t = np.arange(n) / RATE
+		f1, f2 = VOWELS[v]
+		seg = np.zeros(n)
+		for k in range(1, int(4000 / f0)):
+			f = k * f0
+			amp = np.exp(-((f - f1) / 120.0) ** 2) + 0.6 * np.exp(-((f - f2) / 160.0) ** 2)
+			seg += amp * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi))
+		parts.append(seg * np.hanning(n))
+	word = np.concatenate(parts)
+	word = 0.3 * word / (np.abs(word).max() + 1e-9)
+	return word + rng.normal(0, noise, len(word))
+
+
+def synth_corpus(root: Path, count: int) -> None:
+	rng = np.random.default_rng(7)
+	gap = lambda: np.zeros(int(RATE * rng.uniform(0.05, 0.2)))  # noqa: E731
+	other = [v for v in range(len(VOWELS))]
+
+	def speaker():
+		return dict(rng=rng, f0=rng.uniform(100, 220), tempo=rng.uniform(0.85, 1.15), noise=rng.uniform(0.005, 0.03))
+
+	def command():
+		return np.concatenate([np.concatenate([synth_word(list(rng.choice(other, 3)), **speaker()), gap()]) for _ in range(rng.integers(2, 5))])
+
+	for sub in ("templates", "positive", "negative"):
+		(root / sub).mkdir(parents=True, exist_ok=True)
+	for i in range(3):
+		write_wav(root / "templates" / f"t{i}.wav", synth_word(WAKE_WORD, **speaker()), RATE)
+	for i in range(count):
+		write_wav(root / "positive" / f"p{i}.wav", np.concatenate([gap(), synth_word(WAKE_WORD, **speaker()), gap(), command()]), RATE)
+		write_wav(root / "negative" / f"n{i}.wav", np.concatenate([gap(), command()]), RATE)
+
+
+def as_audio(path: Path) -> sr.AudioData:
+	samples, rate = read_wav(path)
+	return sr.AudioData((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes(), rate, 2)
+
+
+def gate_voice(detector) -> FridayVoice:
+	# Only the gate is exercised, so no microphone or TTS is set up
+	voice = FridayVoice.__new__(FridayVoice)
+	voice._init_wake()
+	voice._wake_followup = 0.0
+	voice.wake_detector = detector
+	return voice
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--fixtures", type=Path)
+	parser.add_argument("--count", type=int, default=40, help="synthetic utterances per class")
+	parser.add_argument("--threshold", type=float)
+	args = parser.parse_args()
+
+	root = args.fixtures
+	if root is None:
+		root = Path(tempfile.mkdtemp(prefix="friday-wake-"))
+		synth_corpus(root, args.count)
+		print(f"Synthetic corpus in {root}")
+
+	detector = TemplateDetector([read_wav(p) for p in sorted((root / "templates").glob("*.wav"))], threshold=args.threshold)
+	voice = gate_voice(detector)
+
+	results = {}
+	latencies = []
+	cpu = 0.0
+	audio_seconds = 0.0
+	for label in ("positive", "negative"):
+		passed = 0
+		files = sorted((root / label).glob("*.wav"))
+		for path in files:
+			audio = as_audio(path)
+			audio_seconds += len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+			wall, proc = time.perf_counter(), time.process_time()
+			out = voice._gate(audio)
+			latencies.append((time.perf_counter() - wall) * 1000.0)
+			cpu += time.process_time() - proc
+			passed += out is not None
+		results[label] = (passed, len(files))
+
+	pos_pass, pos_total = results["positive"]
+	neg_pass, neg_total = results["negative"]
+	total = pos_total + neg_total
+	cloud_calls = pos_pass + neg_pass
+	latencies.sort()
+	print(f"threshold {detector.threshold:.2f}, {len(detector.templates)} templates, {total} utterances ({audio_seconds:.1f} s audio)")
+	print(f"  cloud ASR calls      {total} ungated -> {cloud_calls} gated ({total - cloud_calls} avoided, {100.0 * (total - cloud_calls) / max(1, total):.0f}%)")
+	print(f"  wake word accepted   {pos_pass}/{pos_total} positives")
+	print(f"  false accepts        {neg_pass}/{neg_total} negatives")
+	print(f"  detection latency    p50 {statistics.median(latencies):.1f} ms, p95 {latencies[int(0.95 * (len(latencies) - 1))]:.1f} ms per utterance")
+	print(f"  CPU                  {1000.0 * cpu / max(audio_seconds, 1e-9):.1f} ms per second of audio")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,175 @@
+"""
+Local stand-ins for benchmarks: HTTP servers and a WAV-backed microphone.
+
+A stand-in wraps a handler(method, path, headers, body) -> (status, headers, body) and
+adds scripted latency before answering. Returning an iterable body streams it with
+chunked transfer encoding, one write per item.
+"""
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import speech_recognition as sr
+
+# Make the FRIDAY modules importable when run as `python benchmarks/<script>.py`
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+	sys.path.insert(0, str(ROOT))
+
+Body = Union[bytes, str, Iterable[bytes]]
+Handler = Callable[[str, str, Dict[str, str], bytes], Tuple[int, Dict[str, str], Body]]
+
+
+class _Server(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def handle_error(self, request: Any, client_address: Any) -> None:
+		# Clients hanging up mid-request (a cancelled stream, a pool closing at exit) are expected
+		if not isinstance(sys.exc_info()[1], ConnectionError):
+			super().handle_error(request, client_address)
+
+
+class StandIn:
+	def __init__(self, handler: Handler, latency: float = 0.0) -> None:
+		self.handler = handler
+		self.latency = latency
+		self.requests = 0
+		stand_in = self
+
+		class _Handler(BaseHTTPRequestHandler):
+			protocol_version = "HTTP/1.1"
+
+			def log_message(self, *args: Any) -> None:
+				pass
+
+			def _dispatch(self, method: str) -> None:
+				stand_in.requests += 1
+				length = int(self.headers.get("Content-Length") or 0)
+				body = self.rfile.read(length) if length else b""
+				if stand_in.latency:
+					time.sleep(stand_in.latency)
+				status, headers, payload = stand_in.handler(method, self.path, dict(self.headers), body)
+				self.send_response(status)
+				for k, v in headers.items():
+					self.send_header(k, v)
+				if isinstance(payload, str):
+					payload = payload.encode("utf-8")
+				if isinstance(payload, (bytes, bytearray)):
+					self.send_header("Content-Length", str(len(payload)))
+					self.end_headers()
+					self.wfile.write(payload)
+					return
+				self.send_header("Transfer-Encoding", "chunked")
+				self.end_headers()
+				for chunk in payload:
+					if chunk:
+						self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+						self.wfile.flush()
+				self.wfile.write(b"0\r\n\r\n")
+
+			def do_GET(self) -> None:
+				self._dispatch("GET")
+
+			def do_POST(self) -> None:
+				self._dispatch("POST")
+
+		self._server = _Server(("127.0.0.1", 0), _Handler)
+		self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+		self._thread.start()
+
+	@property
+	def url(self) -> str:
+		host, port = self._server.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def close(self) -> None:
+		self._server.shutdown()
+		self._server.server_close()
+
+
+class _WavStream:
+	def __init__(self, pcm: bytes) -> None:
+		self.pcm = pcm
+		self.pos = 0
+
+	def read(self, frames: int) -> bytes:
+		out = self.pcm[self.pos:self.pos + 2 * frames]
+		self.pos += len(out)
+		return out
+
+	def close(self) -> None:
+		pass
+
+
+class WavSource(sr.AudioSource):
+	"""Microphone stand-in that plays a WAV as fast as it is read."""
+
+	def __init__(self, samples: np.ndarray, rate: int) -> None:
+		self.SAMPLE_RATE = rate
+		self.SAMPLE_WIDTH = 2
+		self.CHUNK = 1024
+		self.stream = _WavStream((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc) -> None:
+		pass
+
+	@property
+	def seconds_read(self) -> float:
+		return self.stream.pos / (2.0 * self.SAMPLE_RATE)
+
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> Tuple[float, Optional[Any]]:
+	"""Return (mean seconds per call, last result)."""
+	result = None
+	start = time.perf_counter()
+	for _ in range(repeat):
+		result = fn()
+	return (time.perf_counter() - start) / max(1, repeat), result
+
+
+def chat_completions_handler(
+	reply: Callable[[list], str],
+	token_delay: float = 0.02,
+	prefill_per_token: float = 0.0,
+) -> Handler:
+	"""
+	OpenAI-compatible /v1/chat/completions. Streams SSE when the request asks for it.
+	prefill_per_token adds latency proportional to the prompt size (~4 chars per token).
+	Point the client at it with OPENAI_BASE_URL=<stand-in url>/v1.
+	"""
+	import json
+
+	def handler(method, path, headers, body):
+		req = json.loads(body or b"{}")
+		messages = req.get("messages") or []
+		prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4 + 1
+		if prefill_per_token:
+			time.sleep(prompt_tokens * prefill_per_token)
+		text = reply(messages)
+		tokens = [w + " " for w in text.split(" ")]
+		base = {"id": "chatcmpl-standin", "created": int(time.time()), "model": req.get("model", "stand-in")}
+		if not req.get("stream"):
+			time.sleep(token_delay * len(tokens))
+			payload = dict(base, object="chat.completion", choices=[{
+				"index": 0, "finish_reason": "stop",
+				"message": {"role": "assistant", "content": text},
+			}], usage={"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens), "total_tokens": prompt_tokens + len(tokens)})
+			return 200, {"Content-Type": "application/json"}, json.dumps(payload)
+
+		def events():
+			for tok in tokens:
+				time.sleep(token_delay)
+				chunk = dict(base, object="chat.completion.chunk", choices=[{
+					"index": 0, "finish_reason": None, "delta": {"content": tok},
+				}])
+				yield f"data: {json.dumps(chunk)}\n\n".encode()
+			yield b"data: [DONE]\n\n"
+		return 200, {"Content-Type": "text/event-stream"}, events()
+	return handler
@@ -0,0 +1,302 @@
+import io
+import sys
+import wave
+import shutil
+import threading
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple, Iterator
+
+PLAYBACK_RATE = 44100
+PLAYBACK_CHANNELS = 1
+
+_miniaudio_module = None
+_miniaudio_checked = False
+
+
+def _miniaudio():
+	"""Optional in-process decoder/player, imported on first use (it pulls in numpy/cffi)."""
+	global _miniaudio_module, _miniaudio_checked
+	if not _miniaudio_checked:
+		try:
+			import miniaudio  # type: ignore
+			_miniaudio_module = miniaudio
+		except Exception:
+			_miniaudio_module = None
+		_miniaudio_checked = True
+	return _miniaudio_module
+
+
+class _ByteFeed:
+	"""
+	In-memory byte pipe: the network side feeds chunks, the decoder reads them (blocking).
+	Implements miniaudio's StreamableSource protocol without importing it up front.
+	"""
+
+	ffi_handle = None
+	error_in_readcallback = None
+
+	def __init__(self) -> None:
+		self._buf = bytearray()
+		self._cond = threading.Condition()
+		self._eof = False
+		self.total = 0
+
+	def feed(self, data: bytes) -> None:
+		with self._cond:
+			self._buf += data
+			self.total += len(data)
+			self._cond.notify_all()
+
+	def finish(self) -> None:
+		with self._cond:
+			self._eof = True
+			self._cond.notify_all()
+
+	def read(self, num_bytes: int) -> bytes:
+		with self._cond:
+			while not self._buf and not self._eof:
+				self._cond.wait()
+			out = bytes(self._buf[:num_bytes])
+			del self._buf[:num_bytes]
+			return out
+
+	def seek(self, offset: int, origin: object) -> bool:
+		return False
+
+	def close(self) -> None:
+		self.finish()
+
+
+class Mp3StreamPlayer(ABC):
+	"""Plays MP3 audio while it is still arriving. feed() chunks, finish(), then wait()."""
+
+	@abstractmethod
+	def feed(self, chunk: bytes) -> None:
+		...
+
+	@abstractmethod
+	def finish(self) -> None:
+		...
+
+	@abstractmethod
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		...
+
+	@abstractmethod
+	def stop(self) -> None:
+		...
+
+
+class _MiniaudioStreamPlayer(Mp3StreamPlayer):
+	def __init__(self, prebuffer: int = 8192) -> None:
+		self.prebuffer = prebuffer
+		self._source = _ByteFeed()
+		self._done = threading.Event()
+		self._device = None
+		self._started = False
+
+	def feed(self, chunk: bytes) -> None:
+		self._source.feed(chunk)
+		# A little prebuffer lets the decoder find the first frames without an underrun
+		if not self._started and self._source.total >= self.prebuffer:
+			self._start()
+
+	def finish(self) -> None:
+		self._source.finish()
+		if not self._started:
+			if self._source.total:
+				self._start()
+			else:
+				self._done.set()
+
+	def _start(self) -> None:
+		self._started = True
+		threading.Thread(target=self._run, name="friday-mp3-stream", daemon=True).start()
+
+	def _run(self) -> None:
+		try:
+			miniaudio = _miniaudio()
+			stream = miniaudio.stream_any(
+				self._source,
+				source_format=miniaudio.FileFormat.MP3,
+				nchannels=PLAYBACK_CHANNELS,
+				sample_rate=PLAYBACK_RATE,
+			)
+			gen = miniaudio.stream_with_callbacks(stream, end_callback=self._done.set)
+			next(gen)
+			device = miniaudio.PlaybackDevice(nchannels=PLAYBACK_CHANNELS, sample_rate=PLAYBACK_RATE)
+			self._device = device
+			device.start(gen)
+		except Exception as ex:
+			print("Audio stream error:", ex)
+			self._done.set()
+
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		finished = self._done.wait(timeout)
+		if finished and self._device is not None:
+			# Let the device drain its last buffer before closing it
+			time.sleep(0.2)
+			self._close_device()
+		return finished
+
+	def stop(self) -> None:
+		self._source.finish()
+		self._close_device()
+		self._done.set()
+
+	def _close_device(self) -> None:
+		device, self._device = self._device, None
+		if device is not None:
+			try:
+				device.close()
+			except Exception:
+				pass
+
+
+class _FfplayStreamPlayer(Mp3StreamPlayer):
+	def __init__(self, ffplay: str) -> None:
+		self._proc = subprocess.Popen(
+			[ffplay, "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "pipe:0"],
+			stdin=subprocess.PIPE,
+			stdout=subprocess.DEVNULL,
+			stderr=subprocess.DEVNULL,
+		)
+
+	def feed(self, chunk: bytes) -> None:
+		if self._proc.stdin is not None:
+			self._proc.stdin.write(chunk)
+			self._proc.stdin.flush()
+
+	def finish(self) -> None:
+		try:
+			if self._proc.stdin is not None:
+				self._proc.stdin.close()
+		except Exception:
+			pass
+
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		try:
+			self._proc.wait(timeout=timeout)
+			return True
+		except subprocess.TimeoutExpired:
+			return False
+
+	def stop(self) -> None:
+		try:
+			self._proc.kill()
+		except Exception:
+			pass
+
+
+def open_mp3_stream() -> Optional[Mp3StreamPlayer]:
+	"""Streaming MP3 player via miniaudio, else an ffplay pipe; None if neither is available."""
+	if _miniaudio() is not None:
+		try:
+			return _MiniaudioStreamPlayer()
+		except Exception:
+			pass
+	ffplay = shutil.which("ffplay")
+	if ffplay:
+		try:
+			return _FfplayStreamPlayer(ffplay)
+		except Exception:
+			pass
+	return None
+
+
+# Decoded audio: (signed 16-bit little-endian PCM, sample rate, channels)
+Pcm = Tuple[bytes, int, int]
+
+
+def decode_audio(data: bytes) -> Optional[Pcm]:
+	"""Decode MP3/WAV bytes to PCM in memory (miniaudio, else pydub); None if neither works."""
+	miniaudio = _miniaudio()
+	if miniaudio is not None:
+		try:
+			decoded = miniaudio.decode(data, nchannels=PLAYBACK_CHANNELS, sample_rate=PLAYBACK_RATE)
+			return decoded.samples.tobytes(), decoded.sample_rate, decoded.nchannels
+		except Exception:
+			pass
+	try:
+		from pydub import AudioSegment  # type: ignore
+		seg = AudioSegment.from_file(io.BytesIO(data)).set_sample_width(2)
+		return seg.raw_data, seg.frame_rate, seg.channels
+	except Exception:
+		return None
+
+
+def speed_up_pcm(pcm: Pcm, factor: float) -> Pcm:
+	"""Tempo change without pitch shift via pydub, applied to PCM (no re-encode)."""
+	if factor <= 1.0:
+		return pcm
+	try:
+		from pydub import AudioSegment  # type: ignore
+		from pydub.effects import speedup  # type: ignore
+		data, rate, channels = pcm
+		seg = AudioSegment(data=data, sample_width=2, frame_rate=rate, channels=channels)
+		fast = speedup(seg, playback_speed=factor)
+		return fast.raw_data, fast.frame_rate, fast.channels
+	except Exception:
+		return pcm
+
+
+def _pcm_chunks(data: bytes, channels: int) -> Iterator[memoryview]:
+	view = memoryview(data)
+	frame_bytes = 2 * channels
+	pos = 0
+	required = yield b""
+	while pos < len(view):
+		n = max(1, required or 1024) * frame_bytes
+		chunk = view[pos:pos + n]
+		pos += n
+		required = yield chunk
+
+
+def pcm_output_available() -> bool:
+	return _miniaudio() is not None or sys.platform.startswith("win")
+
+
+def play_pcm(pcm: Pcm, stop: Optional[threading.Event] = None) -> bool:
+	"""
+	Play decoded audio straight from memory; setting stop cuts playback short.
+	Returns False when no PCM output is available.
+	"""
+	data, rate, channels = pcm
+	miniaudio = _miniaudio()
+	if miniaudio is not None:
+		try:
+			done = threading.Event()
+			chunks = _pcm_chunks(data, channels)
+			next(chunks)
+			gen = miniaudio.stream_with_callbacks(chunks, end_callback=done.set)
+			next(gen)
+			device = miniaudio.PlaybackDevice(nchannels=channels, sample_rate=rate)
+			try:
+				device.start(gen)
+				deadline = time.time() + len(data) / float(2 * channels * rate) + 2.0
+				while not done.wait(0.05):
+					if (stop is not None and stop.is_set()) or time.time() > deadline:
+						break
+				else:
+					time.sleep(0.2)
+			finally:
+				device.close()
+			return True
+		except Exception:
+			pass
+	if sys.platform.startswith("win"):
+		try:
+			import winsound
+			buf = io.BytesIO()
+			with wave.open(buf, "wb") as wav:
+				wav.setnchannels(channels)
+				wav.setsampwidth(2)
+				wav.setframerate(rate)
+				wav.writeframes(data)
+			winsound.PlaySound(buf.getvalue(), winsound.SND_MEMORY)
+			return True
+		except Exception:
+			pass
+	return False
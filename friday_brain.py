@@ -1,5 +1,13 @@
 import os
-from typing import List, Dict, Any
+import threading
+from collections import deque
+from typing import List, Dict, Any, Iterator, Deque, Tuple, Optional
+
+from friday_text import SentenceBuffer
+from friday_cache import ResponseCache, get_response_cache, is_context_dependent
+from friday_breaker import get_breaker, needs_internet
+from friday_trace import get_tracer, span
+from friday_http import get_http
 
 
 SYSTEM_PROMPT = (
@@ -8,39 +16,162 @@ SYSTEM_PROMPT = (
 	"Address the user as 'Boss'. Keep replies concise unless asked."
 )
 
+SUMMARY_HEADER = "Earlier in this conversation (summary):"
+
+_encoder: Any = None
+
+# One OpenAI client per process: every brain (one per server session) shares its connection pool
+_openai_client: Any = None
+_openai_ready = False
+_openai_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+	"""Token count via tiktoken when installed, otherwise the ~4 chars/token rule of thumb."""
+	global _encoder
+	if not text:
+		return 0
+	if _encoder is None:
+		try:
+			import tiktoken  # type: ignore
+			_encoder = tiktoken.get_encoding("cl100k_base")
+		except Exception:
+			_encoder = False
+	if _encoder:
+		return len(_encoder.encode(text))
+	return len(text) // 4 + 1
+
+
+def get_openai_client():
+	"""The shared OpenAI client, built on first use; None without the SDK or OPENAI_API_KEY."""
+	global _openai_client, _openai_ready
+	with _openai_lock:
+		if not _openai_ready:
+			try:
+				from openai import OpenAI  # type: ignore
+				api_key = os.getenv("OPENAI_API_KEY")
+				if api_key:
+					# The SDK defaults (10 min timeout, 2 retries) would stall a turn while offline
+					_openai_client = OpenAI(
+						api_key=api_key,
+						timeout=float(os.getenv("FRIDAY_OPENAI_TIMEOUT", "20")),
+						max_retries=int(os.getenv("FRIDAY_OPENAI_RETRIES", "1")),
+					)
+			except Exception:
+				_openai_client = None
+			_openai_ready = True
+		return _openai_client
+
+
+def _gist(text: str, limit: int = 90) -> str:
+	"""First sentence of text, clipped to limit characters."""
+	text = " ".join((text or "").split())
+	for end in (". ", "? ", "! "):
+		idx = text.find(end)
+		if 0 < idx < limit:
+			return text[:idx + 1]
+	return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "…"
+
 
 class FridayBrain:
 	def __init__(self) -> None:
 		self.memory: List[Dict[str, str]] = [
 			{"role": "system", "content": SYSTEM_PROMPT}
 		]
-		self._openai_client = None
-		self._init_openai()
+		# Verbatim exchanges are kept within a token budget; older ones are folded into a summary
+		self.memory_budget = int(os.getenv("FRIDAY_MEMORY_TOKENS", "1200"))
+		self.summary_budget = int(os.getenv("FRIDAY_SUMMARY_TOKENS", "250"))
+		self._history: Deque[Tuple[str, str, int]] = deque()
+		self._history_tokens = 0
+		self._summary_lines: Deque[Tuple[str, int]] = deque()
+		self._summary_tokens = 0
 
-	def _init_openai(self) -> None:
-		try:
-			from openai import OpenAI  # type: ignore
-			api_key = os.getenv("OPENAI_API_KEY")
-			if api_key:
-				self._openai_client = OpenAI(api_key=api_key)
-		except Exception:
-			self._openai_client = None
+	def _client(self):
+		# The OpenAI SDK is slow to import, so the client is created on first use (or warm_up)
+		return get_openai_client()
+
+	def warm_up(self) -> None:
+		"""Import the SDK and build the client on a background thread."""
+		threading.Thread(target=self._client, name="friday-brain-warmup", daemon=True).start()
+
+	@staticmethod
+	def _breaker():
+		base = os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+		return get_breaker("openai", internet=needs_internet(base))
+
+	@staticmethod
+	def _record_failure(breaker, ex: Exception) -> None:
+		# A 4xx means the service answered; only outages and 5xx count against it
+		status = getattr(ex, "status_code", None)
+		if status is None or status >= 500:
+			breaker.failure(connection=status is None)
+		else:
+			breaker.success()
 
 	def _call_openai(self, prompt: str) -> str:
-		if self._openai_client is None:
+		client = self._client()
+		if client is None:
 			raise RuntimeError("OpenAI not configured")
+		breaker = self._breaker()
+		breaker.check()
 		# Use GPT-4o-mini or gpt-4o if available
 		model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 		messages = list(self.memory) + [{"role": "user", "content": prompt}]
-		resp = self._openai_client.chat.completions.create(
-			model=model,
-			messages=messages,
-			max_tokens=300,
-			temperature=0.8,
-		)
+		try:
+			with get_http().upstream(), span("brain.openai", model=model, stream=False):
+				resp = client.chat.completions.create(
+					model=model,
+					messages=messages,
+					max_tokens=300,
+					temperature=0.8,
+				)
+		except Exception as ex:
+			self._record_failure(breaker, ex)
+			raise
+		breaker.success()
 		text = resp.choices[0].message.content or ""
 		return text.strip()
 
+	def _stream_openai(self, prompt: str, sink: List[str]) -> Iterator[str]:
+		"""Yield content deltas as they arrive; every delta is also appended to sink."""
+		client = self._client()
+		if client is None:
+			raise RuntimeError("OpenAI not configured")
+		breaker = self._breaker()
+		breaker.check()
+		model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+		messages = list(self.memory) + [{"role": "user", "content": prompt}]
+		# Not made current: the generator yields to the caller between chunks
+		call = get_tracer().start("brain.openai", model=model, stream=True)
+		error: Optional[BaseException] = None
+		try:
+			# The upstream slot is held until the stream is drained (or abandoned)
+			with get_http().upstream():
+				stream = client.chat.completions.create(
+					model=model,
+					messages=messages,
+					max_tokens=300,
+					temperature=0.8,
+					stream=True,
+				)
+				for chunk in stream:
+					if not chunk.choices:
+						continue
+					delta = chunk.choices[0].delta.content
+					if delta:
+						if not sink:
+							get_tracer().since("brain.first_token", call)
+						sink.append(delta)
+						yield delta
+		except Exception as ex:
+			error = ex
+			self._record_failure(breaker, ex)
+			raise
+		finally:
+			# Ended once, including when the consumer abandons the generator
+			call.end(error)
+		breaker.success()
+
 	def _fallback_local_response(self, prompt: str) -> str:
 		# Extremely simple offline heuristic response
 		prompt_l = prompt.lower()
@@ -55,23 +186,119 @@ class FridayBrain:
 			"but I can still assist with quick answers, reminders, and system commands."
 		)
 
-	def answer(self, prompt: str) -> str:
+	def _cache_key(self, prompt: str, use_cache: bool) -> Optional[str]:
+		# Follow-ups ("what about it?") depend on context, so they are neither served nor stored
+		if not use_cache or is_context_dependent(prompt) or get_response_cache() is None:
+			return None
+		model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+		return ResponseCache.make_key(prompt, model, SYSTEM_PROMPT)
+
+	def _cached_answer(self, prompt: str, key: Optional[str]) -> Optional[str]:
+		cache = get_response_cache()
+		if key is None or cache is None:
+			return None
+		try:
+			text = cache.get(key)
+		except Exception:
+			return None
+		if text is not None:
+			self._remember_exchange(prompt, text)
+		return text
+
+	def _store_answer(self, key: Optional[str], text: str) -> None:
+		cache = get_response_cache()
+		if key is None or cache is None or not text:
+			return
+		try:
+			cache.put(key, text)
+		except Exception:
+			pass
+
+	def answer(self, prompt: str, use_cache: bool = True) -> str:
+		key = self._cache_key(prompt, use_cache)
+		cached = self._cached_answer(prompt, key)
+		if cached is not None:
+			return cached
 		try:
 			text = self._call_openai(prompt)
 			self._remember_exchange(prompt, text)
+			self._store_answer(key, text)
 			return text
 		except Exception:
 			text = self._fallback_local_response(prompt)
 			self._remember_exchange(prompt, text)
 			return text
 
+	def answer_stream(self, prompt: str, use_cache: bool = True) -> Iterator[str]:
+		"""
+		Like answer(), but yields the reply sentence by sentence while tokens are still arriving.
+		Memory is updated with the full reply once the stream ends (or with whatever arrived,
+		if the consumer stops early or the stream breaks midway; a break still yields the
+		unfinished sentence, so memory holds nothing that was not spoken).
+		"""
+		key = self._cache_key(prompt, use_cache)
+		cached = self._cached_answer(prompt, key)
+		if cached is not None:
+			yield cached
+			return
+		parts: List[str] = []
+		sentences = SentenceBuffer()
+		remembered = False
+		try:
+			for delta in self._stream_openai(prompt, parts):
+				for sentence in sentences.feed(delta):
+					yield sentence
+			rest = sentences.flush()
+			if rest:
+				yield rest
+			# Only complete replies are cached
+			self._store_answer(key, "".join(parts).strip())
+		except Exception:
+			if not parts:
+				text = self._fallback_local_response(prompt)
+				self._remember_exchange(prompt, text)
+				remembered = True
+				yield text
+			else:
+				rest = sentences.flush()
+				if rest:
+					yield rest
+		finally:
+			if not remembered and parts:
+				self._remember_exchange(prompt, "".join(parts).strip())
+
 	def _remember_exchange(self, user: str, assistant: str) -> None:
-		# Keep short-term memory within last 15 exchanges
-		self.memory.append({"role": "user", "content": user})
-		self.memory.append({"role": "assistant", "content": assistant})
-		# Trim memory size to prevent growth beyond bounds
-		max_messages = 1 + 15 * 2  # system + pairs
-		if len(self.memory) > max_messages:
-			self.memory = [self.memory[0]] + self.memory[-(max_messages - 1):]
+		# Token counts are computed once per message and kept alongside it
+		tokens = count_tokens(user) + count_tokens(assistant)
+		self._history.append((user, assistant, tokens))
+		self._history_tokens += tokens
+		# Always keep the latest exchange verbatim, even if it alone exceeds the budget
+		while self._history_tokens > self.memory_budget and len(self._history) > 1:
+			old_user, old_assistant, old_tokens = self._history.popleft()
+			self._history_tokens -= old_tokens
+			self._fold_into_summary(old_user, old_assistant)
+		self._rebuild_memory()
+
+	def _fold_into_summary(self, user: str, assistant: str) -> None:
+		line = f"- Boss: {_gist(user)} | FRIDAY: {_gist(assistant)}"
+		tokens = count_tokens(line)
+		self._summary_lines.append((line, tokens))
+		self._summary_tokens += tokens
+		while self._summary_tokens > self.summary_budget and len(self._summary_lines) > 1:
+			_, dropped = self._summary_lines.popleft()
+			self._summary_tokens -= dropped
 
+	def _rebuild_memory(self) -> None:
+		memory: List[Dict[str, str]] = [self.memory[0]]
+		if self._summary_lines:
+			summary = "\n".join([SUMMARY_HEADER] + [line for line, _ in self._summary_lines])
+			memory.append({"role": "system", "content": summary})
+		for user, assistant, _ in self._history:
+			memory.append({"role": "user", "content": user})
+			memory.append({"role": "assistant", "content": assistant})
+		self.memory = memory
 
+	def prompt_tokens(self) -> int:
+		"""Tokens currently sent as context with every request (system prompt included)."""
+		header = count_tokens(SUMMARY_HEADER) if self._summary_lines else 0
+		return count_tokens(SYSTEM_PROMPT) + header + self._summary_tokens + self._history_tokens
@@ -0,0 +1,235 @@
+"""
+Circuit breakers for external dependencies plus a shared connectivity probe. A dependency
+that keeps failing is skipped instantly for a while instead of costing its full timeout on
+every turn, and while the probe finds no network every internet dependency is skipped, so
+the offline fallbacks answer right away. breaker_states() shows the current picture.
+"""
+import os
+import time
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+	"""Raised instead of calling a dependency whose breaker is open or that needs the network while offline."""
+
+
+class Connectivity:
+	"""
+	Background TCP probe of a few well-known endpoints (FRIDAY_PROBE_TARGETS). Connection
+	failures reported through suspect() trigger an early re-probe, so going offline is
+	noticed within one probe timeout rather than one probe interval.
+	"""
+
+	def __init__(self) -> None:
+		self.enabled = os.getenv("FRIDAY_PROBE", "true").lower() == "true"
+		self.targets = self._parse_targets(os.getenv("FRIDAY_PROBE_TARGETS", "1.1.1.1:53,8.8.8.8:53,208.67.222.222:443"))
+		self.timeout = float(os.getenv("FRIDAY_PROBE_TIMEOUT", "0.5"))
+		self.interval = float(os.getenv("FRIDAY_PROBE_INTERVAL", "30"))
+		# Re-checked more often while offline so recovery is quick
+		self.offline_interval = float(os.getenv("FRIDAY_PROBE_OFFLINE_INTERVAL", "5"))
+		# Optimistic until the first probe answers
+		self._online = True
+		self.checked_at = 0.0
+		self._wake = threading.Event()
+		self._lock = threading.Lock()
+		self._thread: Optional[threading.Thread] = None
+
+	@staticmethod
+	def _parse_targets(spec: str) -> List[Tuple[str, int]]:
+		targets = []
+		for item in spec.split(","):
+			host, _, port = item.strip().rpartition(":")
+			if host and port.isdigit():
+				targets.append((host.strip("[]"), int(port)))
+		return targets
+
+	def start(self) -> None:
+		with self._lock:
+			if self.enabled and self._thread is None and self.targets:
+				self._thread = threading.Thread(target=self._run, name="friday-probe", daemon=True)
+				self._thread.start()
+
+	@property
+	def online(self) -> bool:
+		if not self.enabled:
+			return True
+		self.start()
+		return self._online
+
+	def suspect(self) -> None:
+		"""A request to the internet just failed at the connection level: probe again now."""
+		if self.enabled:
+			self.start()
+			self._wake.set()
+
+	def probe(self) -> bool:
+		for host, port in self.targets:
+			try:
+				socket.create_connection((host, port), timeout=self.timeout).close()
+				return True
+			except OSError:
+				continue
+		return False
+
+	def _run(self) -> None:
+		while True:
+			online = self.probe()
+			if online != self._online:
+				print("Network link restored." if online else "Network link down; running on onboard systems.")
+			self._online = online
+			self.checked_at = time.time()
+			self._wake.wait(self.interval if online else self.offline_interval)
+			self._wake.clear()
+			# Several failures at once should cost one probe, not one each
+			time.sleep(0.2)
+
+
+_connectivity: Optional[Connectivity] = None
+_connectivity_lock = threading.Lock()
+
+
+def get_connectivity() -> Connectivity:
+	global _connectivity
+	with _connectivity_lock:
+		if _connectivity is None:
+			_connectivity = Connectivity()
+		return _connectivity
+
+
+def needs_internet(url: str) -> bool:
+	"""Hosts outside FRIDAY_OFFLINE_EXEMPT (loopback by default) are unreachable while offline."""
+	exempt = os.getenv("FRIDAY_OFFLINE_EXEMPT", "localhost,127.0.0.1,::1")
+	host = urlsplit(url).hostname or ""
+	return host not in {h.strip().lower() for h in exempt.split(",") if h.strip()}
+
+
+class CircuitBreaker:
+	"""
+	closed: calls go through and consecutive failures are counted. After failure_threshold
+	of them the breaker opens and calls are refused for reset_timeout. Then it is half-open:
+	one trial call goes through, and its outcome closes or re-opens the breaker.
+	"""
+
+	def __init__(self, name: str, internet: bool = True, failure_threshold: Optional[int] = None,
+			reset_timeout: Optional[float] = None) -> None:
+		if failure_threshold is None:
+			failure_threshold = int(os.getenv("FRIDAY_BREAKER_FAILURES", "3"))
+		if reset_timeout is None:
+			reset_timeout = float(os.getenv("FRIDAY_BREAKER_RESET", "30"))
+		self.name = name
+		self.internet = internet
+		self.enabled = breakers_enabled()
+		self.failure_threshold = max(1, failure_threshold)
+		self.reset_timeout = reset_timeout
+		self.state = CLOSED
+		self.failures = 0
+		self.opened_at = 0.0
+		self.trips = 0
+		self.rejected = 0
+		self._trial_started = 0.0
+		self._lock = threading.Lock()
+
+	def allow(self) -> bool:
+		"""Whether a call may go out now. In half-open state only one trial at a time passes."""
+		if not self.enabled:
+			return True
+		if self.internet and not get_connectivity().online:
+			with self._lock:
+				self.rejected += 1
+			return False
+		with self._lock:
+			now = time.time()
+			if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+				self.state = HALF_OPEN
+				self._trial_started = 0.0
+			if self.state == HALF_OPEN:
+				# A trial whose caller never reported back does not block the breaker forever
+				if not self._trial_started or now - self._trial_started >= self.reset_timeout:
+					self._trial_started = now
+					return True
+			if self.state == CLOSED:
+				return True
+			self.rejected += 1
+			return False
+
+	def check(self) -> None:
+		"""allow() or raise CircuitOpenError."""
+		if not self.allow():
+			reason = "offline" if self.internet and not get_connectivity().online else f"circuit {self.state}"
+			raise CircuitOpenError(f"{self.name} skipped: {reason}")
+
+	def success(self) -> None:
+		with self._lock:
+			if self.state != CLOSED:
+				print(f"Circuit {self.name} closed; service is back.")
+			self.state = CLOSED
+			self.failures = 0
+
+	def failure(self, connection: bool = False) -> None:
+		"""Record a failed call; connection=True also nudges the connectivity probe."""
+		if connection and self.internet:
+			get_connectivity().suspect()
+		with self._lock:
+			self.failures += 1
+			if not self.enabled:
+				return
+			if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+				self.state = OPEN
+				self.opened_at = time.time()
+				self.trips += 1
+				print(f"Circuit {self.name} open after {self.failures} failures; skipping it for {self.reset_timeout:.0f} s.")
+
+	def snapshot(self) -> Dict[str, object]:
+		with self._lock:
+			remaining = self.reset_timeout - (time.time() - self.opened_at) if self.state == OPEN else 0.0
+			return {
+				"state": self.state,
+				"failures": self.failures,
+				"trips": self.trips,
+				"rejected": self.rejected,
+				"retry_in_s": round(max(0.0, remaining), 1),
+			}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breakers_enabled() -> bool:
+	return os.getenv("FRIDAY_BREAKERS", "true").lower() == "true"
+
+
+def get_breaker(name: str, internet: bool = True) -> CircuitBreaker:
+	with _breakers_lock:
+		breaker = _breakers.get(name)
+		if breaker is None:
+			breaker = _breakers[name] = CircuitBreaker(name, internet=internet)
+		return breaker
+
+
+def breaker_for_url(url: str) -> CircuitBreaker:
+	"""One breaker per host."""
+	return get_breaker(urlsplit(url).netloc, internet=needs_internet(url))
+
+
+def breaker_states() -> Dict[str, object]:
+	"""Network state and every breaker's state, failures, trips and rejected calls."""
+	connectivity = get_connectivity()
+	with _breakers_lock:
+		breakers = list(_breakers.values())
+	return {
+		"network": {
+			"online": connectivity.online,
+			"probe": connectivity.enabled,
+			"checked_s_ago": round(time.time() - connectivity.checked_at, 1) if connectivity.checked_at else None,
+		},
+		"breakers": {b.name: b.snapshot() for b in breakers},
+	}
@@ -0,0 +1,232 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Tuple, Iterable
+
+
+def cache_dir() -> Path:
+	"""Directory for FRIDAY's on-disk caches (FRIDAY_CACHE_DIR, default ~/.friday)."""
+	base = os.getenv("FRIDAY_CACHE_DIR") or str(Path.home() / ".friday")
+	path = Path(base).expanduser()
+	try:
+		path.mkdir(parents=True, exist_ok=True)
+	except Exception:
+		pass
+	return path
+
+
+def cache_path(name: str) -> Path:
+	return cache_dir() / name
+
+
+_CONTRACTIONS = {
+	"what's": "what is", "who's": "who is", "where's": "where is", "how's": "how is",
+	"it's": "it is", "you're": "you are", "i'm": "i am", "can't": "cannot", "don't": "do not",
+}
+_FILLER = re.compile(r"^(?:(?:hey|ok|okay|so|friday|please|tell me)\b[\s,]*)+|\b(?:please|friday)$")
+# Follow-ups that only make sense with the conversation so far, or answers that go stale
+_CONTEXT_WORDS = re.compile(
+	r"\b(it|that|this|those|these|he|she|him|her|they|them|again|more|previous|earlier|"
+	r"above|continue|same|also|else|today|now|latest|current|tonight|tomorrow|yesterday)\b"
+	r"|^(?:and|but|what about|how about)\b"
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+	"""Canonical form used for cache keys: lower-case, no punctuation, fillers stripped."""
+	text = (prompt or "").lower().strip()
+	for short, full in _CONTRACTIONS.items():
+		text = text.replace(short, full)
+	text = re.sub(r"[^\w\s]", " ", text)
+	text = " ".join(text.split())
+	return _FILLER.sub("", text).strip()
+
+
+def is_context_dependent(prompt: str) -> bool:
+	return bool(_CONTEXT_WORDS.search(normalize_prompt(prompt)))
+
+
+class ResponseCache:
+	"""
+	SQLite-backed cache of assistant replies with per-entry TTL and LRU size bound.
+	Keys combine the normalized prompt, the model and a hash of the system prompt.
+	"""
+
+	def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+		self.path = path or str(cache_path("responses.sqlite3"))
+		self.ttl = float(ttl if ttl is not None else os.getenv("FRIDAY_RESPONSE_TTL", "86400"))
+		self.max_entries = int(max_entries if max_entries is not None else os.getenv("FRIDAY_RESPONSE_CACHE_SIZE", "500"))
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute("PRAGMA synchronous=NORMAL")
+		self._db.execute(
+			"CREATE TABLE IF NOT EXISTS responses ("
+			"key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+		)
+		self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+		self._db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+		for name, value in self._db.execute("SELECT name, value FROM stats"):
+			if name == "hits":
+				self.hits = value
+			elif name == "misses":
+				self.misses = value
+
+	@staticmethod
+	def make_key(prompt: str, model: str, system_prompt: str) -> str:
+		system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+		raw = "\0".join((normalize_prompt(prompt), model, system_hash))
+		return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[str]:
+		now = time.time()
+		with self._lock:
+			row = self._db.execute("SELECT response, expires FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None or row[1] < now:
+				self.misses += 1
+				if row is not None:
+					self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+				self._record_stat("misses", self.misses)
+				return None
+			self.hits += 1
+			self._db.execute("BEGIN")
+			self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+			self._record_stat("hits", self.hits)
+			self._db.execute("COMMIT")
+			return row[0]
+
+	def put(self, key: str, response: str, ttl: Optional[float] = None) -> None:
+		now = time.time()
+		expires = now + (self.ttl if ttl is None else ttl)
+		with self._lock:
+			self._db.execute("BEGIN")
+			self._db.execute(
+				"INSERT OR REPLACE INTO responses (key, response, expires, last_used) VALUES (?, ?, ?, ?)",
+				(key, response, expires, now),
+			)
+			count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+			if count > self.max_entries:
+				# Evict least recently used entries beyond the size bound
+				self._db.execute(
+					"DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+					(count - self.max_entries,),
+				)
+			self._db.execute("COMMIT")
+
+	def stats(self) -> Dict[str, float]:
+		with self._lock:
+			entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+		total = self.hits + self.misses
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": round(self.hits / total, 3) if total else 0.0,
+			"entries": entries,
+		}
+
+	def _record_stat(self, name: str, value: int) -> None:
+		self._db.execute("INSERT OR REPLACE INTO stats (name, value) VALUES (?, ?)", (name, value))
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+	"""Process-wide response cache; None when disabled (FRIDAY_RESPONSE_CACHE=false) or unusable."""
+	global _response_cache
+	if os.getenv("FRIDAY_RESPONSE_CACHE", "true").lower() != "true":
+		return None
+	with _response_cache_lock:
+		if _response_cache is None:
+			try:
+				_response_cache = ResponseCache()
+			except Exception:
+				return None
+		return _response_cache
+
+
+class AudioCache:
+	"""
+	Content-addressed store of synthesized speech on disk, bounded by total size.
+	File mtimes double as LRU timestamps: a hit touches the file, eviction removes the oldest.
+	"""
+
+	def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+		self.directory = Path(directory) if directory else cache_path("tts")
+		self.directory.mkdir(parents=True, exist_ok=True)
+		if max_bytes is None:
+			max_bytes = int(float(os.getenv("FRIDAY_TTS_CACHE_MB", "100")) * 1024 * 1024)
+		self.max_bytes = max_bytes
+		self._lock = threading.Lock()
+		# digest -> (path, size, last_used)
+		self._index: Dict[str, Tuple[Path, int, float]] = {}
+		self._total = 0
+		for path in self.directory.glob("*.*"):
+			if path.suffix == ".tmp":
+				continue
+			try:
+				st = path.stat()
+			except OSError:
+				continue
+			self._index[path.stem] = (path, st.st_size, st.st_mtime)
+			self._total += st.st_size
+
+	@staticmethod
+	def make_key(parts: Iterable[str]) -> str:
+		return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[Path]:
+		with self._lock:
+			entry = self._index.get(key)
+			if entry is None:
+				return None
+			path, size, _ = entry
+			now = time.time()
+			self._index[key] = (path, size, now)
+		try:
+			os.utime(path, (now, now))
+		except OSError:
+			with self._lock:
+				self._index.pop(key, None)
+				self._total -= size
+			return None
+		return path
+
+	def put(self, key: str, audio: bytes, ext: str) -> Path:
+		path = self.directory / f"{key}.{ext}"
+		# A temp file per call: concurrent puts of one key must not write into the same file
+		with tempfile.NamedTemporaryFile(dir=self.directory, prefix=f"{key}.", suffix=".tmp", delete=False) as fh:
+			fh.write(audio)
+		os.replace(fh.name, path)
+		with self._lock:
+			old = self._index.get(key)
+			if old is not None:
+				self._total -= old[1]
+			self._index[key] = (path, len(audio), time.time())
+			self._total += len(audio)
+			self._evict(keep=key)
+		return path
+
+	def _evict(self, keep: Optional[str] = None) -> None:
+		# keep: the clip just written, whose path the caller is about to play
+		if self._total <= self.max_bytes:
+			return
+		for key, (path, size, _) in sorted(self._index.items(), key=lambda kv: kv[1][2]):
+			if self._total <= self.max_bytes:
+				break
+			if key == keep:
+				continue
+			try:
+				path.unlink()
+			except OSError:
+				pass
+			del self._index[key]
+			self._total -= size
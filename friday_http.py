@@ -0,0 +1,235 @@
+import os
+import time
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from friday_breaker import breaker_for_url
+from friday_trace import span
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Worth another try for an idempotent GET; anything else is returned to the caller as is
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+	"""
+	One pooled requests.Session for every outbound call. urllib3 keeps a keep-alive pool per
+	host, so repeat calls to a host skip the TCP/TLS handshake. GETs are retried with jittered
+	exponential backoff on connection errors and 429/5xx, within an overall deadline
+	(FRIDAY_HTTP_DEADLINE); per-host counters record latency, errors and retries. Each host has
+	a circuit breaker (friday_breaker) that sees one outcome per call, however many attempts it
+	took: while it is open, or the network is down, calls fail at once with CircuitOpenError.
+	"""
+
+	def __init__(self, retries: Optional[int] = None, timeout: Optional[Timeout] = None) -> None:
+		if retries is None:
+			retries = int(os.getenv("FRIDAY_HTTP_RETRIES", "2"))
+		if timeout is None:
+			timeout = (
+				float(os.getenv("FRIDAY_HTTP_CONNECT_TIMEOUT", "3.05")),
+				float(os.getenv("FRIDAY_HTTP_READ_TIMEOUT", "8")),
+			)
+		self.retries = max(0, retries)
+		self.timeout = timeout
+		self.backoff = float(os.getenv("FRIDAY_HTTP_BACKOFF", "0.25"))
+		self.deadline = float(os.getenv("FRIDAY_HTTP_DEADLINE", "10"))
+		self.session = requests.Session()
+		adapter = HTTPAdapter(
+			pool_connections=int(os.getenv("FRIDAY_HTTP_HOSTS", "16")),
+			pool_maxsize=int(os.getenv("FRIDAY_HTTP_POOL_SIZE", "8")),
+		)
+		self.session.mount("http://", adapter)
+		self.session.mount("https://", adapter)
+		self.session.headers["User-Agent"] = "FRIDAY/1.0"
+		self._lock = threading.Lock()
+		self._stats: Dict[str, Dict[str, float]] = {}
+		self.rewrite = self._parse_rewrite(os.getenv("FRIDAY_HTTP_REWRITE", ""))
+		# Cap on outbound calls in flight across all hosts; 0 (the default) leaves them unbounded
+		self._upstream: Optional[threading.BoundedSemaphore] = None
+		self.upstream_limit = 0
+		self.set_upstream_limit(int(os.getenv("FRIDAY_UPSTREAM_LIMIT", "0")))
+
+	def set_upstream_limit(self, limit: int) -> None:
+		self.upstream_limit = max(0, limit)
+		self._upstream = threading.BoundedSemaphore(self.upstream_limit) if self.upstream_limit else None
+
+	@contextmanager
+	def upstream(self) -> Iterator[None]:
+		"""Hold one upstream slot for the duration of an outbound call (waiting for one if all are taken)."""
+		gate = self._upstream
+		if gate is None:
+			yield
+			return
+		if not gate.acquire(blocking=False):
+			with span("upstream.wait"):
+				gate.acquire()
+		try:
+			yield
+		finally:
+			gate.release()
+
+	@staticmethod
+	def _parse_rewrite(spec: str) -> Dict[str, str]:
+		"""FRIDAY_HTTP_REWRITE="wttr.in=http://127.0.0.1:8001,..." sends a host's requests elsewhere (benchmarks)."""
+		rewrite = {}
+		for item in spec.split(","):
+			host, _, target = item.strip().partition("=")
+			if host and target:
+				rewrite[host.strip().lower()] = target.strip().rstrip("/")
+		return rewrite
+
+	def _rewrite_url(self, url: str) -> str:
+		if not self.rewrite:
+			return url
+		parts = urlsplit(url)
+		target = self.rewrite.get((parts.hostname or "").lower())
+		if target is None:
+			return url
+		rest = parts.path + (f"?{parts.query}" if parts.query else "")
+		return target + (rest if rest.startswith("/") else "/" + rest)
+
+	def get(self, url: str, retries: Optional[int] = None, deadline: Optional[float] = None, **kwargs: Any) -> requests.Response:
+		"""
+		GET with retries on connection errors (connect timeouts included) and 429/5xx responses.
+		A read timeout is not retried: the host is up but slow, and asking again only doubles
+		the wait. After deadline seconds (FRIDAY_HTTP_DEADLINE by default) no new attempt starts,
+		and each attempt's timeouts are clipped to the time left.
+		"""
+		attempts = 1 + (self.retries if retries is None else max(0, retries))
+		end = time.monotonic() + (self.deadline if deadline is None else deadline)
+		timeout = kwargs.pop("timeout", self.timeout)
+		url = self._rewrite_url(url)
+		breaker = breaker_for_url(url)
+		breaker.check()
+		last_status: Optional[int] = None
+		failure: Optional[Exception] = None
+		for attempt in range(attempts):
+			remaining = end - time.monotonic()
+			last = attempt == attempts - 1
+			try:
+				resp = self._attempt("GET", url, timeout=_clip(timeout, remaining), **kwargs)
+			except requests.ConnectionError as ex:
+				if last or end - time.monotonic() <= 0:
+					self._settle(breaker, error=ex)
+					raise
+				last_status, failure = None, ex
+			except Exception as ex:
+				self._settle(breaker, error=ex)
+				raise
+			else:
+				if resp.status_code not in RETRY_STATUS or last:
+					self._settle(breaker, resp=resp)
+					return resp
+				resp.close()
+				last_status = resp.status_code
+			# Full jitter keeps parallel callers from retrying in lockstep
+			pause = random.uniform(0, self.backoff * (2 ** attempt))
+			if time.monotonic() + pause >= end:
+				break
+			self._count(url, "retries")
+			time.sleep(pause)
+		# Out of time before the next attempt
+		if failure is not None and last_status is None:
+			self._settle(breaker, error=failure)
+			raise failure
+		if (last_status or 0) >= 500:
+			breaker.failure()
+		else:
+			breaker.success()
+		raise requests.Timeout(f"GET {url}: deadline exceeded after {attempt + 1} attempts")
+
+	def post(self, url: str, **kwargs: Any) -> requests.Response:
+		"""POST once; not idempotent, so never retried here."""
+		url = self._rewrite_url(url)
+		breaker = breaker_for_url(url)
+		breaker.check()
+		kwargs.setdefault("timeout", self.timeout)
+		try:
+			resp = self._attempt("POST", url, **kwargs)
+		except Exception as ex:
+			self._settle(breaker, error=ex)
+			raise
+		self._settle(breaker, resp=resp)
+		return resp
+
+	def _attempt(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+		"""One request on the pooled session, counted in the host stats; the breaker is left to the caller."""
+		# Latency is counted once a slot is held, so queueing for one never looks like a slow host
+		with self.upstream(), span("http", method=method, host=urlsplit(url).netloc) as call:
+			start = time.perf_counter()
+			try:
+				resp = self.session.request(method, url, **kwargs)
+			except Exception:
+				self._record(url, time.perf_counter() - start, error=True)
+				raise
+			call.set(status=resp.status_code)
+		self._record(url, time.perf_counter() - start, error=resp.status_code >= 500)
+		return resp
+
+	@staticmethod
+	def _settle(breaker: Any, resp: Optional[requests.Response] = None, error: Optional[BaseException] = None) -> None:
+		"""Report the outcome of one logical call to its host's breaker."""
+		if error is not None:
+			if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+				breaker.failure(connection=True)
+		elif resp is not None and resp.status_code >= 500:
+			breaker.failure()
+		else:
+			breaker.success()
+
+	def _host_stats(self, url: str) -> Dict[str, float]:
+		host = urlsplit(url).netloc
+		stats = self._stats.get(host)
+		if stats is None:
+			stats = self._stats[host] = {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "last_ms": 0.0}
+		return stats
+
+	def _record(self, url: str, seconds: float, error: bool) -> None:
+		with self._lock:
+			stats = self._host_stats(url)
+			stats["requests"] += 1
+			stats["errors"] += int(error)
+			stats["total_ms"] += seconds * 1000.0
+			stats["last_ms"] = seconds * 1000.0
+
+	def _count(self, url: str, field: str) -> None:
+		with self._lock:
+			self._host_stats(url)[field] += 1
+
+	def stats(self) -> Dict[str, Dict[str, float]]:
+		"""Per-host counters: requests, errors, retries, average and last latency (ms)."""
+		with self._lock:
+			out = {}
+			for host, s in self._stats.items():
+				row = dict(s)
+				row["avg_ms"] = s["total_ms"] / s["requests"] if s["requests"] else 0.0
+				out[host] = row
+			return out
+
+
+def _clip(timeout: Timeout, remaining: float) -> Timeout:
+	"""A requests timeout no longer than remaining seconds (at least a few ms, so the call can fail cleanly)."""
+	remaining = max(0.01, remaining)
+	if isinstance(timeout, tuple):
+		return (min(timeout[0], remaining), min(timeout[1], remaining))
+	return min(timeout, remaining)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http() -> HttpClient:
+	global _client
+	with _client_lock:
+		if _client is None:
+			_client = HttpClient()
+		return _client
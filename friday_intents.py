@@ -0,0 +1,122 @@
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Any
+
+
+# Declarative intent registry, highest priority first. "keywords" are whole words that must
+# appear for an intent to be considered; "patterns" then confirm it (case-insensitive, word
+# bounded). Named groups in a pattern (or in "slots") become slots of the match.
+# Prefix commands ("google ...") outrank keywords inside their query, so
+# "google how to exit vim" is a search rather than a shutdown.
+INTENTS: List[Dict[str, Any]] = [
+	{"name": "open_app", "keywords": ["open", "launch", "start"], "patterns": [
+		r"\b(?:open|launch|start)\s+(?P<app>chrome|vs\s?code|code|spotify)\b",
+	]},
+	{"name": "youtube_search", "keywords": ["youtube"], "patterns": [
+		r"^youtube\s+(?P<query>.+)",
+		r"\bsearch\s+(?:on\s+)?youtube\s+(?:for\s+)?(?P<query>.+)",
+	]},
+	{"name": "wikipedia_search", "keywords": ["wikipedia"], "patterns": [
+		r"^wikipedia\s+(?P<query>.+)",
+		r"\bsearch\s+(?:on\s+)?wikipedia\s+(?:for\s+)?(?P<query>.+)",
+	]},
+	{"name": "google_search", "keywords": ["google", "search"], "patterns": [r"^(?:google|search)\s+(?:for\s+)?(?P<query>.+)"]},
+	{"name": "exit", "keywords": ["exit", "quit", "shutdown", "shut", "power"], "patterns": [
+		r"\b(?:exit|quit)\b",
+		r"^(?:friday\s+)?(?:shut\s?down|power\s+down)(?:\s+(?:now|friday|yourself))?$",
+	]},
+	{"name": "status_report", "keywords": ["status"], "patterns": [r"\bstatus\s+report\b", r"^status$"]},
+	{"name": "performance_report", "keywords": ["performance", "latency"], "patterns": [
+		r"\b(?:performance|latency)\s+report\b",
+	]},
+	{"name": "volume_unmute", "keywords": ["unmute", "restore"], "patterns": [
+		r"\b(?:unmute|restore)\b.*\bvolume\b",
+		r"\bvolume\b.*\b(?:unmute|restore)\b",
+	]},
+	{"name": "volume_mute", "keywords": ["mute"], "patterns": [r"\bmute\b.*\bvolume\b", r"\bvolume\b.*\bmute\b"]},
+	{"name": "volume_up", "keywords": ["volume"], "patterns": [r"\bvolume\s+up\b", r"\bturn\s+(?:the\s+)?volume\s+up\b"]},
+	{"name": "volume_down", "keywords": ["volume"], "patterns": [r"\bvolume\s+down\b", r"\bturn\s+(?:the\s+)?volume\s+down\b"]},
+	{"name": "power_shutdown", "keywords": ["shutdown", "shut"], "patterns": [r"\bshut\s?down\s+(?:the\s+)?(?:system|pc|computer)\b"]},
+	{"name": "power_restart", "keywords": ["restart"], "patterns": [r"\brestart\s+(?:the\s+)?(?:system|pc|computer)\b"]},
+	{"name": "time", "keywords": ["time"], "patterns": [r"\btime\b"]},
+	{"name": "weather", "keywords": ["weather", "forecast", "temperature"], "patterns": [r"\b(?:weather|forecast|temperature)\b"], "slots": {
+		# Only "in <place>", ending before a time word: "weather in Delhi today" -> "Delhi"
+		"city": r"\bin\s+(?!(?:the\s+)?(?:morning|afternoon|evening|night|moment|week|weekend)\b)"
+			r"(?P<city>[a-z][a-z .'-]*?)"
+			r"(?=\s+(?:today|tonight|tomorrow|now|right\s+now|currently|please|this\s+\w+)\b|\s*[?.!,]|\s*$)",
+	}},
+	{"name": "news", "keywords": ["news", "headline", "headlines"], "patterns": [r"\b(?:news|headlines?)\b"], "slots": {
+		"locality": r"\b(?P<locality>visakhapatnam|vizag|local)\b",
+	}},
+]
+
+_WORD = re.compile(r"[a-z]+")
+
+
+class IntentMatch(NamedTuple):
+	name: str
+	slots: Dict[str, str]
+
+
+class IntentRouter:
+	"""
+	Compiles an intent registry into a keyword -> intents index. One tokenizing pass looks up
+	every word of an utterance; only the intents those words point at are confirmed, in
+	priority order, and the first confirmed intent wins.
+	"""
+
+	def __init__(self, intents: List[Dict[str, Any]]) -> None:
+		self.intents = intents
+		self._by_keyword: Dict[str, List[int]] = {}
+		self._patterns: List[List["re.Pattern[str]"]] = []
+		self._slot_patterns: List[Dict[str, "re.Pattern[str]"]] = []
+		for idx, intent in enumerate(intents):
+			for word in intent["keywords"]:
+				self._by_keyword.setdefault(word.lower(), []).append(idx)
+			self._patterns.append([re.compile(p, re.IGNORECASE) for p in intent["patterns"]])
+			self._slot_patterns.append({
+				name: re.compile(p, re.IGNORECASE) for name, p in (intent.get("slots") or {}).items()
+			})
+
+	def match(self, text: str) -> Optional[IntentMatch]:
+		text = (text or "").strip(" ,.!?")
+		if not text:
+			return None
+		candidates = set()
+		for word in _WORD.findall(text.lower()):
+			hit = self._by_keyword.get(word)
+			if hit:
+				candidates.update(hit)
+		if not candidates:
+			return None
+		for idx in sorted(candidates):
+			for pattern in self._patterns[idx]:
+				m = pattern.search(text)
+				if m:
+					return IntentMatch(self.intents[idx]["name"], self._extract_slots(idx, text, m))
+		return None
+
+	def _extract_slots(self, idx: int, text: str, m: "re.Match[str]") -> Dict[str, str]:
+		slots = {k: v.strip() for k, v in m.groupdict().items() if v}
+		for name, pattern in self._slot_patterns[idx].items():
+			sm = pattern.search(text)
+			if sm and sm.group(name):
+				slots[name] = sm.group(name).strip().rstrip("?.! ")
+		return slots
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> IntentRouter:
+	global _router
+	with _router_lock:
+		if _router is None:
+			_router = IntentRouter(INTENTS)
+		return _router
+
+
+def route(text: str) -> Optional[IntentMatch]:
+	"""Classify an utterance in one pass; None when no intent matches."""
+	return get_router().match(text)
@@ -0,0 +1,238 @@
+"""
+Persistent headline store. Feed entries are ingested once, keyed by GUID (else link, else
+title), and indexed by feed group and published time in SQLite. Near-duplicates across feeds,
+the same story as told by BBC, TOI, The Hindu and Indian Express, share a cluster: each batch
+of new headlines gets MinHash signatures over word shingles in one NumPy pass and is compared
+with the recent ones. A news query reads the newest clusters off the index, one headline each.
+"""
+import os
+import re
+import time
+import zlib
+import sqlite3
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from friday_cache import cache_path
+
+if TYPE_CHECKING:
+	import numpy as np
+
+# MinHash permutations per signature; the similarity estimate's error shrinks as 1/sqrt(NUM_PERM)
+NUM_PERM = 128
+# Smallest prime above 2**32; with 32-bit a, b and shingle hashes a*x + b stays below 2**64
+_PRIME = 4294967311
+# Titles hashed per NumPy pass, bounding the NUM_PERM x shingles matrix
+_BATCH = 256
+
+_WORD = re.compile(r"[^\W_]+")
+_STOP = frozenset(
+	"a an and are as at be by for from has have in into is it its of on or over says the to was were will with".split()
+)
+
+_permutations: dict = {}
+
+
+def _hash_params() -> Tuple["np.ndarray", "np.ndarray"]:
+	"""
+	The MinHash (a, b) pairs, built on first use: NumPy is imported by the first ingest, not at
+	startup. Fixed seed, since signatures are stored and compared across runs.
+	"""
+	if "ab" not in _permutations:
+		import numpy as np
+		rng = np.random.default_rng(0x46524944)
+		a = rng.integers(1, 2 ** 32, size=(NUM_PERM, 1), dtype=np.uint64)
+		b = rng.integers(0, 2 ** 32, size=(NUM_PERM, 1), dtype=np.uint64)
+		_permutations["ab"] = (a, b)
+	return _permutations["ab"]
+
+
+def shingles(title: str) -> List[int]:
+	"""
+	Hashed character trigrams of each word, padded and with stop words dropped. Rewordings
+	that keep the key terms ("6 wickets" / "six wickets, clinch series") still overlap heavily.
+	"""
+	out = set()
+	for word in _WORD.findall(title.lower()):
+		if word in _STOP:
+			continue
+		word = f" {word} "
+		for i in range(len(word) - 2):
+			out.add(zlib.crc32(word[i:i + 3].encode("utf-8")))
+	return sorted(out) or [zlib.crc32(title.lower().encode("utf-8"))]
+
+
+def signatures(titles: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+	"""MinHash signatures (len(titles) x NUM_PERM, uint32) and shingle counts for a batch of titles."""
+	import numpy as np
+	a, b = _hash_params()
+	sets = [shingles(t) for t in titles]
+	counts = np.array([len(s) for s in sets], dtype=np.int64)
+	sig = np.empty((len(sets), NUM_PERM), dtype=np.uint32)
+	for lo in range(0, len(sets), _BATCH):
+		chunk = counts[lo:lo + _BATCH]
+		flat = np.fromiter(itertools.chain.from_iterable(sets[lo:lo + _BATCH]), dtype=np.uint64, count=int(chunk.sum()))
+		# Every permutation of every shingle in one pass, then the minimum per title
+		hashed = (a * flat + b) % _PRIME
+		starts = np.concatenate(([0], np.cumsum(chunk)[:-1]))
+		sig[lo:lo + len(chunk)] = np.minimum.reduceat(hashed, starts, axis=1).T
+	return sig, counts
+
+
+def containment(sig: "np.ndarray", counts: "np.ndarray", other_sig: "np.ndarray", other_counts: "np.ndarray") -> "np.ndarray":
+	"""
+	Estimated |A & B| / min(|A|, |B|) of the shingle sets for every pair of rows. Containment
+	rather than Jaccard, so a headline that adds a clause to another still matches it.
+	"""
+	import numpy as np
+	jaccard = (sig[:, None, :] == other_sig[None, :, :]).mean(axis=2)
+	inter = jaccard * (counts[:, None] + other_counts[None, :]) / (1.0 + jaccard)
+	return np.minimum(1.0, inter / np.minimum(counts[:, None], other_counts[None, :]))
+
+
+class HeadlineStore:
+	"""
+	SQLite store of feed headlines (headlines.sqlite3 in the cache directory). A new headline
+	joins the cluster of the closest one ingested within FRIDAY_NEWS_CLUSTER_HOURS when their
+	containment reaches FRIDAY_NEWS_DUP_THRESHOLD; headlines are dropped after
+	FRIDAY_NEWS_RETENTION_DAYS. Feed validators (ETag, Last-Modified) and the last refresh of
+	each group are kept too, so a restart revalidates instead of downloading everything again.
+	"""
+
+	def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None) -> None:
+		self.path = path or str(cache_path("headlines.sqlite3"))
+		self.threshold = float(threshold if threshold is not None else os.getenv("FRIDAY_NEWS_DUP_THRESHOLD", "0.7"))
+		self.cluster_window = float(os.getenv("FRIDAY_NEWS_CLUSTER_HOURS", "36")) * 3600.0
+		self.retention = float(os.getenv("FRIDAY_NEWS_RETENTION_DAYS", "7")) * 86400.0
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute("PRAGMA synchronous=NORMAL")
+		self._db.execute(
+			"CREATE TABLE IF NOT EXISTS headlines ("
+			"id INTEGER PRIMARY KEY, uid TEXT NOT NULL UNIQUE, feed TEXT NOT NULL, grp TEXT NOT NULL, "
+			"title TEXT NOT NULL, link TEXT, published REAL NOT NULL, ingested REAL NOT NULL, "
+			"cluster INTEGER NOT NULL, shingles INTEGER NOT NULL, signature BLOB NOT NULL)"
+		)
+		self._db.execute("CREATE INDEX IF NOT EXISTS headlines_grp_published ON headlines(grp, published)")
+		self._db.execute("CREATE INDEX IF NOT EXISTS headlines_ingested ON headlines(ingested)")
+		self._db.execute("CREATE TABLE IF NOT EXISTS feeds (url TEXT PRIMARY KEY, etag TEXT, modified TEXT)")
+		self._db.execute("CREATE TABLE IF NOT EXISTS refreshes (grp TEXT PRIMARY KEY, at REAL NOT NULL)")
+
+	def validators(self, url: str) -> Dict[str, Optional[str]]:
+		with self._lock:
+			row = self._db.execute("SELECT etag, modified FROM feeds WHERE url = ?", (url,)).fetchone()
+		return {"etag": row[0], "modified": row[1]} if row else {}
+
+	def ingest(self, group: str, feed: str, entries: Sequence[Dict[str, Any]],
+			etag: Optional[str] = None, modified: Optional[str] = None) -> int:
+		"""
+		Add the entries ({"uid", "title", "link", "published"}) not stored yet and save the feed's
+		validators in the same transaction. Returns how many entries were new.
+		"""
+		now = time.time()
+		with self._lock:
+			self._db.execute("BEGIN IMMEDIATE")
+			try:
+				fresh = self._unseen(entries)
+				if fresh:
+					self._insert(group, feed, fresh, now)
+				self._db.execute("INSERT OR REPLACE INTO feeds (url, etag, modified) VALUES (?, ?, ?)", (feed, etag, modified))
+				self._db.execute("DELETE FROM headlines WHERE ingested < ?", (now - self.retention,))
+				self._db.execute("COMMIT")
+			except BaseException:
+				self._db.execute("ROLLBACK")
+				raise
+		return len(fresh)
+
+	def _unseen(self, entries: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		by_uid: Dict[str, Dict[str, Any]] = {}
+		for e in entries:
+			by_uid.setdefault(e["uid"], e)
+		uids = list(by_uid)
+		for lo in range(0, len(uids), 500):
+			chunk = uids[lo:lo + 500]
+			marks = ",".join("?" * len(chunk))
+			for (uid,) in self._db.execute(f"SELECT uid FROM headlines WHERE uid IN ({marks})", chunk):
+				by_uid.pop(uid, None)
+		return list(by_uid.values())
+
+	def _insert(self, group: str, feed: str, fresh: List[Dict[str, Any]], now: float) -> None:
+		import numpy as np
+		sig, counts = signatures([e["title"] for e in fresh])
+		rows = self._db.execute(
+			"SELECT cluster, shingles, signature FROM headlines WHERE ingested >= ?", (now - self.cluster_window,)
+		).fetchall()
+		labels = [r[0] for r in rows]
+		if rows:
+			recent_counts = np.array([r[1] for r in rows], dtype=np.int64)
+			recent_sig = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.uint32).reshape(len(rows), NUM_PERM)
+			scores = np.hstack([containment(sig, counts, recent_sig, recent_counts), containment(sig, counts, sig, counts)])
+		else:
+			scores = containment(sig, counts, sig, counts)
+		first_id = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM headlines").fetchone()[0]
+		records = []
+		for i, e in enumerate(fresh):
+			# Candidates: recent headlines plus the earlier entries of this batch
+			candidates = scores[i, :len(rows) + i]
+			best = int(candidates.argmax()) if candidates.size else -1
+			cluster = first_id + i
+			if best >= 0 and candidates[best] >= self.threshold:
+				cluster = labels[best]
+			labels.append(cluster)
+			# Undated entries count as published on first sight; future dates would pin them on top
+			published = min(float(e.get("published") or now), now)
+			records.append((first_id + i, e["uid"], feed, group, e["title"], e.get("link"), published, now,
+				cluster, int(counts[i]), sig[i].tobytes()))
+		self._db.executemany(
+			"INSERT INTO headlines (id, uid, feed, grp, title, link, published, ingested, cluster, shingles, signature) "
+			"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+			records,
+		)
+
+	def top(self, group: str, limit: int = 10) -> List[str]:
+		"""The newest headline in group of each of the limit newest clusters, newest first."""
+		titles: List[str] = []
+		seen = set()
+		with self._lock:
+			cur = self._db.execute(
+				"SELECT cluster, title FROM headlines WHERE grp = ? ORDER BY published DESC, id DESC", (group,)
+			)
+			try:
+				for cluster, title in cur:
+					if cluster not in seen:
+						seen.add(cluster)
+						titles.append(title)
+						if len(titles) >= limit:
+							break
+			finally:
+				cur.close()
+		return titles
+
+	def mark_refreshed(self, group: str, at: Optional[float] = None) -> None:
+		with self._lock:
+			self._db.execute("INSERT OR REPLACE INTO refreshes (grp, at) VALUES (?, ?)", (group, at or time.time()))
+
+	def refreshed_at(self, group: str) -> Optional[float]:
+		with self._lock:
+			row = self._db.execute("SELECT at FROM refreshes WHERE grp = ?", (group,)).fetchone()
+		return row[0] if row else None
+
+	def stats(self) -> Dict[str, int]:
+		with self._lock:
+			headlines, clusters = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT cluster) FROM headlines").fetchone()
+		return {"headlines": headlines, "clusters": clusters}
+
+
+_shared_store: Optional[HeadlineStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_headline_store() -> HeadlineStore:
+	"""Process-wide store shared by FridayWeb, the prefetcher and the status report."""
+	global _shared_store
+	with _shared_lock:
+		if _shared_store is None:
+			_shared_store = HeadlineStore()
+		return _shared_store
@@ -0,0 +1,186 @@
+import os
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import speech_recognition as sr
+
+from friday_voice import PROMPT_REPEAT, PROMPT_NETWORK
+from friday_trace import Span, get_tracer, new_turn_id
+
+
+# Handler contract: handler(query, speaker) -> bool. Return False to shut the assistant down.
+TurnHandler = Callable[[str, Any], bool]
+
+_STOP = object()
+
+
+class TurnSpeaker:
+	"""Voice stand-in given to routing code; say() queues text behind the current turn."""
+
+	def __init__(self, pipeline: "FridayPipeline") -> None:
+		self._pipeline = pipeline
+
+	def say(self, text: str) -> None:
+		if text:
+			self._pipeline._speech_q.put((self._pipeline._routing_turn, text))
+
+	def say_stream(self, chunks: Iterable[str]) -> None:
+		# Each chunk is queued as soon as it is produced, so speech starts on the first one
+		for chunk in chunks:
+			self.say(chunk)
+
+
+class FridayPipeline:
+	"""
+	Staged conversation loop: capture -> recognition -> routing -> speech.
+	Each stage is a single worker thread joined by bounded queues, so turns stay in order
+	while recognition of the next command overlaps answering and speaking the current one.
+	"""
+
+	def __init__(self, voice, max_inflight: Optional[int] = None) -> None:
+		self.voice = voice
+		if max_inflight is None:
+			max_inflight = int(os.getenv("FRIDAY_MAX_INFLIGHT", "2"))
+		self.max_inflight = max(1, max_inflight)
+		self._inflight = threading.BoundedSemaphore(self.max_inflight)
+		self._audio_q: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_inflight)
+		self._text_q: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_inflight)
+		self._speech_q: "queue.Queue[Any]" = queue.Queue()
+		self._stopping = threading.Event()
+		self._done = threading.Event()
+		self._turn_seq = 0
+		# Turns captured but not yet fully spoken; background work yields while any exist
+		self._active_turns = 0
+		self._active_lock = threading.Lock()
+		self._routing_turn = 0
+		self._speaking_turn = 0
+		# Barge-in drops the rest of the turn being spoken (and anything older still queued)
+		self._skip_through_turn = 0
+		if hasattr(voice, "on_barge_in"):
+			voice.on_barge_in(self._on_barge_in)
+		self._handler: Optional[TurnHandler] = None
+		self.speaker = TurnSpeaker(self)
+		# Each turn is a trace span from the end of capture until its last word is spoken
+		self._tracer = get_tracer()
+		self._turn_spans: Dict[int, Span] = {}
+
+	def run(self, handler: TurnHandler) -> None:
+		"""Start all stages and block until a handler asks to stop (or Ctrl+C)."""
+		self._handler = handler
+		workers = [
+			("capture", self._capture_worker),
+			("recognition", self._recognition_worker),
+			("routing", self._routing_worker),
+			("speech", self._speech_worker),
+		]
+		for name, target in workers:
+			threading.Thread(target=target, name=f"friday-{name}", daemon=True).start()
+		try:
+			while not self._done.wait(0.5):
+				pass
+		except KeyboardInterrupt:
+			self.stop()
+			raise
+
+	@property
+	def busy(self) -> bool:
+		"""True while an interactive turn is being recognized, answered or spoken."""
+		return self._active_turns > 0
+
+	def stop(self) -> None:
+		self._stopping.set()
+		self._done.set()
+
+	def _on_barge_in(self) -> None:
+		self._skip_through_turn = max(self._skip_through_turn, self._speaking_turn)
+
+	def _capture_worker(self) -> None:
+		while not self._stopping.is_set():
+			# Wait for a free in-flight slot before opening the microphone again
+			if not self._inflight.acquire(timeout=0.5):
+				continue
+			audio = self.voice.capture()
+			if audio is None or self._stopping.is_set():
+				self._inflight.release()
+				continue
+			self._turn_seq = new_turn_id()
+			self._turn_spans[self._turn_seq] = self._tracer.start(
+				"turn", turn=self._turn_seq, parent=None,
+				audio_s=round(len(audio.frame_data) / float(audio.sample_rate * audio.sample_width), 2),
+			)
+			with self._active_lock:
+				self._active_turns += 1
+			self._audio_q.put((self._turn_seq, audio))
+
+	def _recognition_worker(self) -> None:
+		while True:
+			turn_id, audio = self._audio_q.get()
+			query: Optional[str] = None
+			prompt: Optional[str] = None
+			with self._tracer.span("recognition", parent=self._turn_spans.get(turn_id)) as stage:
+				try:
+					query = self.voice.recognize(audio)
+				except sr.UnknownValueError:
+					prompt = PROMPT_REPEAT
+				except sr.RequestError:
+					prompt = PROMPT_NETWORK
+				except Exception as ex:
+					print("Recognition error:", ex)
+				stage.set(outcome="text" if query else ("retry" if prompt == PROMPT_REPEAT else "failed"))
+			# Failures still travel through routing so their prompts keep turn order
+			self._text_q.put((turn_id, query, prompt))
+
+	def _routing_worker(self) -> None:
+		while True:
+			turn_id, query, prompt = self._text_q.get()
+			self._routing_turn = turn_id
+			keep_running = True
+			if prompt:
+				self.speaker.say(prompt)
+			elif query and self._handler is not None:
+				with self._tracer.span("routing", parent=self._turn_spans.get(turn_id)):
+					try:
+						keep_running = self._handler(query, self.speaker)
+					except Exception as ex:
+						print("Main loop error:", ex)
+						traceback.print_exc()
+						self.speaker.say("Minor anomaly detected. Stabilizing and resuming operations.")
+			self._speech_q.put((turn_id, None))
+			if not keep_running:
+				self._stopping.set()
+				self._speech_q.put((turn_id, _STOP))
+				return
+
+	def _speech_worker(self) -> None:
+		while True:
+			turn_id, text = self._speech_q.get()
+			if text is _STOP:
+				self._done.set()
+				return
+			if text is None:
+				# End-of-turn marker frees an in-flight slot for the capture stage
+				turn = self._turn_spans.pop(turn_id, None)
+				if turn is not None:
+					turn.end()
+				with self._active_lock:
+					self._active_turns = max(0, self._active_turns - 1)
+				try:
+					self._inflight.release()
+				except ValueError:
+					pass
+				continue
+			if turn_id <= self._skip_through_turn:
+				continue
+			turn = self._turn_spans.get(turn_id)
+			if turn is not None and self._speaking_turn != turn_id:
+				self._tracer.since("first_reply", turn)
+			self._speaking_turn = turn_id
+			with self._tracer.span("speech", parent=turn, chars=len(text)):
+				try:
+					handle = self.voice.say(text)
+					if handle is not None:
+						handle.wait()
+				except Exception as ex:
+					print("Speech error:", ex)
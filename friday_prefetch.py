@@ -0,0 +1,88 @@
+import os
+import time
+import random
+import threading
+from typing import Callable, List, Optional
+
+from friday_weather import get_weather_cache
+
+
+class _Job:
+	def __init__(self, name: str, fn: Callable[[], object], interval: float) -> None:
+		self.name = name
+		self.fn = fn
+		self.interval = interval
+		self.next_run = 0.0
+		self.failures = 0
+		self.last_ok: Optional[float] = None
+
+
+class Prefetcher:
+	"""
+	Background refresh scheduler for data that commands read often but that changes slowly.
+	Each job runs on its own interval on one daemon thread. Failures back off exponentially
+	(with jitter) up to max_backoff, and nothing runs while busy() reports a turn in flight.
+	"""
+
+	def __init__(self, busy: Optional[Callable[[], bool]] = None, retry: Optional[float] = None,
+			max_backoff: Optional[float] = None) -> None:
+		self.busy = busy or (lambda: False)
+		self.retry = float(retry if retry is not None else os.getenv("FRIDAY_PREFETCH_RETRY", "30"))
+		self.max_backoff = float(max_backoff if max_backoff is not None else os.getenv("FRIDAY_PREFETCH_MAX_BACKOFF", "900"))
+		self.jobs: List[_Job] = []
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def add(self, name: str, fn: Callable[[], object], interval: float) -> None:
+		self.jobs.append(_Job(name, fn, max(1.0, interval)))
+
+	def start(self) -> None:
+		if self._thread is None and self.jobs:
+			self._thread = threading.Thread(target=self._run, name="friday-prefetch", daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+
+	def _run(self) -> None:
+		while not self._stop.is_set():
+			now = time.time()
+			due = [job for job in self.jobs if job.next_run <= now]
+			for job in due:
+				# Yield the network and CPU to an interactive turn; retry shortly after
+				if self.busy() or self._stop.is_set():
+					break
+				self._run_job(job)
+			wait = min(job.next_run for job in self.jobs) - time.time()
+			self._stop.wait(min(max(wait, 0.5), 5.0) if not self.busy() else 0.5)
+
+	def _run_job(self, job: _Job) -> None:
+		try:
+			job.fn()
+		except Exception as ex:
+			job.failures += 1
+			delay = min(self.max_backoff, self.retry * (2 ** (job.failures - 1)))
+			job.next_run = time.time() + random.uniform(0.5, 1.0) * delay
+			if job.failures == 1:
+				print(f"Prefetch {job.name} failed ({ex}); backing off.")
+			return
+		job.failures = 0
+		job.last_ok = time.time()
+		job.next_run = job.last_ok + job.interval
+
+
+def start_default_prefetch(web, busy: Optional[Callable[[], bool]] = None) -> Optional[Prefetcher]:
+	"""
+	Keep the default city's weather and the local/national headlines warm for FridayWeb and
+	the status report. FRIDAY_PREFETCH=false turns it off.
+	"""
+	if os.getenv("FRIDAY_PREFETCH", "true").lower() != "true":
+		return None
+	prefetcher = Prefetcher(busy=busy)
+	weather_every = float(os.getenv("FRIDAY_PREFETCH_WEATHER_INTERVAL", "300"))
+	news_every = float(os.getenv("FRIDAY_PREFETCH_NEWS_INTERVAL", "600"))
+	prefetcher.add("weather", lambda: get_weather_cache().refresh(web.default_city), weather_every)
+	prefetcher.add("local_news", lambda: web.refresh_news("local"), news_every)
+	prefetcher.add("national_news", lambda: web.refresh_news(None), news_every)
+	prefetcher.start()
+	return prefetcher
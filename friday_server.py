@@ -0,0 +1,488 @@
+"""
+Headless multi-session server. One process serves FRIDAY's routing (main.handle_query over
+FridaySystem, FridayWeb and FridayBrain) to many clients, through a local HTTP and WebSocket
+API built on asyncio. Each session keeps its own FridayBrain memory. The web and weather
+caches, the response cache, the HTTP connection pool and the OpenAI client are shared.
+
+	POST   /v1/sessions             -> {"session": id}
+	POST   /v1/query                {"text": ..., "session": optional id}
+	                                -> {"session", "replies": [...], "ended", "ms"}
+	DELETE /v1/sessions/<id>
+	GET    /v1/health               -> sessions, turns in flight, breakers and span stats
+	GET    /v1/ws[?session=<id>]    WebSocket. Send {"text": ...}. Each reply sentence arrives as
+	                                {"type": "reply", "text": ...} as soon as it is produced,
+	                                then {"type": "done", "ms": ..., "ended": ...}
+
+Every request needs "Authorization: Bearer <token>" (WebSocket clients may pass ?token=
+instead). The token is FRIDAY_SERVER_TOKEN, else one generated on first start and kept in
+server.token in the cache directory. Requests from a non-local Origin are refused and query
+bodies must be application/json, so a web page cannot drive the API: system intents act on
+this machine, as they do for the desktop assistant. Keep the server on loopback.
+
+Turns run on a worker pool (FRIDAY_SERVER_WORKERS), and outbound calls share
+FRIDAY_UPSTREAM_LIMIT slots. Once FRIDAY_SERVER_MAX_INFLIGHT turns are admitted, new ones
+get 503 instead of queueing without bound.
+
+    python friday_server.py [--host 127.0.0.1] [--port 8765]
+"""
+import os
+import json
+import time
+import uuid
+import hmac
+import base64
+import secrets
+import struct
+import asyncio
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from friday_brain import FridayBrain, get_openai_client
+from friday_cache import cache_path
+from friday_system import FridaySystem
+from friday_web import get_web
+from friday_http import get_http
+from friday_breaker import breaker_states, get_connectivity
+from friday_prefetch import start_default_prefetch
+from friday_trace import get_tracer, new_turn_id
+from main import handle_query, safe_load_env
+
+MAX_BODY = 64 * 1024
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+	404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 415: "Unsupported Media Type",
+	500: "Internal Server Error", 503: "Service Unavailable"}
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+def server_token() -> str:
+	"""FRIDAY_SERVER_TOKEN, else the per-install token in the cache directory (created on first use)."""
+	token = os.getenv("FRIDAY_SERVER_TOKEN", "").strip()
+	if token:
+		return token
+	path = cache_path("server.token")
+	try:
+		token = path.read_text(encoding="utf-8").strip()
+	except OSError:
+		token = ""
+	if not token:
+		token = secrets.token_urlsafe(32)
+		fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with os.fdopen(fd, "w", encoding="utf-8") as f:
+			f.write(token)
+	return token
+
+
+def _local_origin(headers: Dict[str, str]) -> bool:
+	"""True without an Origin header (non-browser clients) or when it names this machine."""
+	origin = headers.get("origin")
+	if origin is None:
+		return True
+	try:
+		return urlsplit(origin).hostname in _LOCAL_HOSTS
+	except ValueError:
+		return False
+
+
+class ServerBusy(Exception):
+	"""Raised when a turn or session cannot be admitted; clients get 503 and may retry."""
+
+
+class SessionSpeaker:
+	"""Speaker handed to routing code: say() forwards each reply to the client."""
+
+	def __init__(self, emit: Callable[[str], None]) -> None:
+		self._emit = emit
+
+	def say(self, text: str) -> None:
+		if text:
+			self._emit(text)
+
+	def say_stream(self, chunks: Iterable[str]) -> None:
+		for chunk in chunks:
+			self.say(chunk)
+
+
+class Session:
+	def __init__(self, session_id: str) -> None:
+		self.id = session_id
+		self.brain = FridayBrain()
+		self.created = time.time()
+		self.last_seen = self.created
+		self.turns = 0
+		# One turn at a time per session keeps its conversation memory in order
+		self.lock = asyncio.Lock()
+
+
+class FridayServer:
+	def __init__(self, workers: Optional[int] = None, token: Optional[str] = None) -> None:
+		self.token = token or server_token()
+		if workers is None:
+			workers = int(os.getenv("FRIDAY_SERVER_WORKERS", "128"))
+		self.workers = max(1, workers)
+		self.max_inflight = int(os.getenv("FRIDAY_SERVER_MAX_INFLIGHT", str(self.workers * 4)))
+		self.max_sessions = int(os.getenv("FRIDAY_SERVER_MAX_SESSIONS", "1000"))
+		self.session_ttl = float(os.getenv("FRIDAY_SERVER_SESSION_TTL", "1800"))
+		self.wake_word = os.getenv("FRIDAY_WAKE_WORD", "friday")
+		self.web = get_web()
+		self.sessions: Dict[str, Session] = {}
+		self.inflight = 0
+		self.served = 0
+		self.rejected = 0
+		self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="friday-session")
+
+	# Sessions
+
+	def create_session(self) -> Session:
+		self._expire_sessions()
+		if len(self.sessions) >= self.max_sessions:
+			self.rejected += 1
+			raise ServerBusy("session limit reached")
+		session = Session(uuid.uuid4().hex)
+		self.sessions[session.id] = session
+		return session
+
+	def end_session(self, session_id: str) -> bool:
+		return self.sessions.pop(session_id, None) is not None
+
+	def _expire_sessions(self) -> None:
+		cutoff = time.time() - self.session_ttl
+		for sid in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff and not s.lock.locked()]:
+			del self.sessions[sid]
+
+	# Turns
+
+	async def run_turn(self, session: Session, text: str, emit: Callable[[str], None]) -> Tuple[bool, float]:
+		"""Route one utterance for session; emit() gets each reply. Returns (keep session, ms)."""
+		if self.inflight >= self.max_inflight:
+			self.rejected += 1
+			raise ServerBusy("too many turns in flight")
+		self.inflight += 1
+		session.last_seen = time.time()
+		try:
+			async with session.lock:
+				start = time.perf_counter()
+				keep = await asyncio.get_running_loop().run_in_executor(self._pool, self._turn, session, text, emit)
+				session.turns += 1
+				self.served += 1
+				return keep, (time.perf_counter() - start) * 1000.0
+		finally:
+			self.inflight -= 1
+			session.last_seen = time.time()
+
+	def _turn(self, session: Session, text: str, emit: Callable[[str], None]) -> bool:
+		tracer = get_tracer()
+		with tracer.span("turn", turn=new_turn_id(), session=session.id[:8]) as turn:
+			replied = []
+
+			def reply(chunk: str) -> None:
+				if not replied:
+					replied.append(True)
+					tracer.since("first_reply", turn)
+				emit(chunk)
+
+			speaker = SessionSpeaker(reply)
+			try:
+				return handle_query(text, speaker, system=FridaySystem(speaker), web=self.web, brain=session.brain,
+					wake_word=self.wake_word, continuous_mode=True)
+			except Exception as ex:
+				print("Session turn error:", ex)
+				speaker.say("Minor anomaly detected. Stabilizing and resuming operations.")
+				return True
+
+	def health(self) -> Dict[str, Any]:
+		self._expire_sessions()
+		return {
+			"sessions": len(self.sessions),
+			"inflight": self.inflight,
+			"workers": self.workers,
+			"upstream_limit": get_http().upstream_limit,
+			"served": self.served,
+			"rejected": self.rejected,
+			**breaker_states(),
+			"spans": get_tracer().stats(),
+		}
+
+	# HTTP
+
+	async def serve(self, host: str, port: int) -> None:
+		server = await asyncio.start_server(self._connection, host, port)
+		bound = server.sockets[0].getsockname()
+		print(f"FRIDAY server listening on http://{bound[0]}:{bound[1]}", flush=True)
+		async with server:
+			await server.serve_forever()
+
+	async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		try:
+			while True:
+				request = await self._read_request(reader)
+				if request is None:
+					break
+				if isinstance(request, int):
+					self._respond(writer, request, {"error": _REASONS.get(request, "error")}, keep_alive=False)
+					await writer.drain()
+					break
+				method, target, headers, body = request
+				url = urlsplit(target)
+				query = parse_qs(url.query)
+				keep_alive = headers.get("connection", "").lower() != "close"
+				refused = self._refuse(headers, query)
+				if refused is not None:
+					self._respond(writer, refused[0], refused[1], keep_alive=False)
+					await writer.drain()
+					break
+				if url.path == "/v1/ws" and headers.get("upgrade", "").lower() == "websocket":
+					await self._websocket(reader, writer, headers, query)
+					break
+				try:
+					status, payload = await self._dispatch(method, url.path, headers, body)
+				except ServerBusy as ex:
+					status, payload = 503, {"error": "busy", "detail": str(ex)}
+				except Exception as ex:
+					print("Server request error:", repr(ex))
+					status, payload = 500, {"error": "internal error"}
+				self._respond(writer, status, payload, keep_alive)
+				await writer.drain()
+				if not keep_alive:
+					break
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+	def _refuse(self, headers: Dict[str, str], query: Dict[str, list]) -> Optional[Tuple[int, Dict[str, Any]]]:
+		"""(status, payload) when the request is cross-origin or lacks the token, else None."""
+		if not _local_origin(headers):
+			return 403, {"error": "origin not allowed"}
+		scheme, _, supplied = headers.get("authorization", "").partition(" ")
+		if scheme.lower() != "bearer":
+			# Browsers cannot set headers on a WebSocket handshake
+			supplied = (query.get("token") or [""])[0]
+		if not hmac.compare_digest(supplied.strip().encode("utf-8"), self.token.encode("utf-8")):
+			return 401, {"error": "missing or wrong bearer token"}
+		return None
+
+	async def _read_request(self, reader: asyncio.StreamReader):
+		"""(method, target, headers, body), None at end of stream, or an HTTP status for a bad request."""
+		line = await reader.readline()
+		if not line:
+			return None
+		try:
+			method, target, _ = line.decode("latin-1").split(" ", 2)
+		except ValueError:
+			return 400
+		headers: Dict[str, str] = {}
+		while True:
+			line = await reader.readline()
+			if line in (b"\r\n", b"\n", b""):
+				break
+			name, _, value = line.decode("latin-1").partition(":")
+			headers[name.strip().lower()] = value.strip()
+		try:
+			length = int(headers.get("content-length") or 0)
+		except ValueError:
+			return 400
+		if length < 0:
+			return 400
+		if length > MAX_BODY:
+			return 413
+		body = await reader.readexactly(length) if length else b""
+		return method.upper(), target, headers, body
+
+	def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool) -> None:
+		body = json.dumps(payload).encode("utf-8")
+		head = [
+			f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+			"Content-Type: application/json",
+			f"Content-Length: {len(body)}",
+			f"Connection: {'keep-alive' if keep_alive else 'close'}",
+		]
+		if status == 503:
+			head.append("Retry-After: 1")
+		writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+	async def _dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, Any]]:
+		parts = [p for p in path.split("/") if p]
+		if path == "/v1/health":
+			return (200, self.health()) if method == "GET" else (405, {"error": "use GET"})
+		if path == "/v1/sessions":
+			if method != "POST":
+				return 405, {"error": "use POST"}
+			return 201, {"session": self.create_session().id}
+		if len(parts) == 3 and parts[:2] == ["v1", "sessions"]:
+			if method != "DELETE":
+				return 405, {"error": "use DELETE"}
+			return (200, {"ended": True}) if self.end_session(parts[2]) else (404, {"error": "unknown session"})
+		if path == "/v1/query":
+			if method != "POST":
+				return 405, {"error": "use POST"}
+			if headers.get("content-type", "").split(";", 1)[0].strip().lower() != "application/json":
+				return 415, {"error": "Content-Type must be application/json"}
+			try:
+				data = json.loads(body or b"{}")
+			except ValueError:
+				return 400, {"error": "body must be JSON"}
+			if not isinstance(data, dict):
+				return 400, {"error": "body must be a JSON object"}
+			text = str(data.get("text") or "").strip()
+			if not text:
+				return 400, {"error": "text is required"}
+			session = self.sessions.get(str(data["session"])) if data.get("session") else self.create_session()
+			if session is None:
+				return 404, {"error": "unknown session"}
+			replies: list = []
+			keep, ms = await self.run_turn(session, text, replies.append)
+			if not keep:
+				self.end_session(session.id)
+			return 200, {"session": session.id, "replies": replies, "ended": not keep, "ms": round(ms, 1)}
+		return 404, {"error": "not found"}
+
+	# WebSocket (RFC 6455, text messages only)
+
+	async def _websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+			headers: Dict[str, str], query: Dict[str, list]) -> None:
+		key = headers.get("sec-websocket-key")
+		if not key:
+			self._respond(writer, 400, {"error": "missing Sec-WebSocket-Key"}, keep_alive=False)
+			return
+		accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("latin-1")).digest()).decode("latin-1")
+		writer.write((
+			"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+			f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+		).encode("latin-1"))
+		sid = (query.get("session") or [None])[0]
+		try:
+			session = self.sessions.get(sid) if sid else self.create_session()
+		except ServerBusy:
+			# 1013: try again later
+			self._ws_send(writer, struct.pack("!H", 1013), opcode=0x8)
+			await writer.drain()
+			return
+		if session is None:
+			self._ws_send(writer, struct.pack("!H", 1008) + b"unknown session", opcode=0x8)
+			await writer.drain()
+			return
+		self._ws_json(writer, {"type": "session", "session": session.id})
+		await writer.drain()
+		loop = asyncio.get_running_loop()
+		while True:
+			message = await self._ws_read(reader, writer)
+			if message is None:
+				break
+			try:
+				data = json.loads(message)
+			except ValueError:
+				data = message
+			if isinstance(data, dict):
+				data = data.get("text")
+			text = (data if isinstance(data, str) else "").strip()
+			if not text:
+				self._ws_json(writer, {"type": "error", "error": "text is required"})
+				continue
+			replies: "asyncio.Queue[str]" = asyncio.Queue()
+			turn = asyncio.ensure_future(self.run_turn(
+				session, text, lambda chunk: loop.call_soon_threadsafe(replies.put_nowait, chunk)))
+			# Each reply goes out the moment routing produces it
+			while not turn.done():
+				getter = asyncio.ensure_future(replies.get())
+				await asyncio.wait({getter, turn}, return_when=asyncio.FIRST_COMPLETED)
+				if getter.done():
+					self._ws_json(writer, {"type": "reply", "text": getter.result()})
+					await writer.drain()
+				else:
+					getter.cancel()
+			while not replies.empty():
+				self._ws_json(writer, {"type": "reply", "text": replies.get_nowait()})
+			try:
+				keep, ms = turn.result()
+			except ServerBusy as ex:
+				self._ws_json(writer, {"type": "error", "error": "busy", "detail": str(ex)})
+				await writer.drain()
+				continue
+			self._ws_json(writer, {"type": "done", "ms": round(ms, 1), "ended": not keep})
+			await writer.drain()
+			if not keep:
+				self.end_session(session.id)
+				self._ws_send(writer, struct.pack("!H", 1000), opcode=0x8)
+				await writer.drain()
+				break
+
+	async def _ws_read(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[str]:
+		"""Next text message, answering pings on the way; None once the client closes."""
+		message = bytearray()
+		while True:
+			head = await reader.readexactly(2)
+			fin, opcode = head[0] & 0x80, head[0] & 0x0F
+			length = head[1] & 0x7F
+			if length == 126:
+				length = struct.unpack("!H", await reader.readexactly(2))[0]
+			elif length == 127:
+				length = struct.unpack("!Q", await reader.readexactly(8))[0]
+			if length + len(message) > MAX_BODY:
+				# 1009: message too big
+				self._ws_send(writer, struct.pack("!H", 1009), opcode=0x8)
+				return None
+			mask = await reader.readexactly(4) if head[1] & 0x80 else b""
+			payload = await reader.readexactly(length)
+			if mask and length:
+				# XOR the whole payload at once with the repeated 4-byte mask
+				keystream = (mask * (length // 4 + 1))[:length]
+				payload = (int.from_bytes(payload, "big") ^ int.from_bytes(keystream, "big")).to_bytes(length, "big")
+			if opcode == 0x8:
+				self._ws_send(writer, payload[:2], opcode=0x8)
+				return None
+			if opcode == 0x9:
+				self._ws_send(writer, payload, opcode=0xA)
+				continue
+			if opcode == 0xA:
+				continue
+			message += payload
+			if fin:
+				return message.decode("utf-8", "replace")
+
+	@staticmethod
+	def _ws_send(writer: asyncio.StreamWriter, payload: bytes, opcode: int = 0x1) -> None:
+		length = len(payload)
+		if length < 126:
+			head = struct.pack("!BB", 0x80 | opcode, length)
+		elif length < 65536:
+			head = struct.pack("!BBH", 0x80 | opcode, 126, length)
+		else:
+			head = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+		writer.write(head + payload)
+
+	def _ws_json(self, writer: asyncio.StreamWriter, payload: Dict[str, Any]) -> None:
+		self._ws_send(writer, json.dumps(payload).encode("utf-8"))
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser(description="FRIDAY headless multi-session server")
+	ap.add_argument("--host", default=os.getenv("FRIDAY_SERVER_HOST", "127.0.0.1"))
+	ap.add_argument("--port", type=int, default=int(os.getenv("FRIDAY_SERVER_PORT", "8765")))
+	args = ap.parse_args()
+
+	safe_load_env()
+	# Shared upstream slots, with a connection pool big enough that none is opened and thrown away
+	upstream = os.environ.setdefault("FRIDAY_UPSTREAM_LIMIT", "32")
+	os.environ.setdefault("FRIDAY_HTTP_POOL_SIZE", upstream)
+	get_connectivity().start()
+	server = FridayServer()
+	if not os.getenv("FRIDAY_SERVER_TOKEN"):
+		print(f"Bearer token in {cache_path('server.token')}", flush=True)
+	threading.Thread(target=get_openai_client, name="friday-brain-warmup", daemon=True).start()
+	# Not paused while turns run: under steady load there would never be a quiet moment
+	start_default_prefetch(server.web)
+	try:
+		asyncio.run(server.serve(args.host, args.port))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		get_tracer().flush()
+
+
+if __name__ == "__main__":
+	main()
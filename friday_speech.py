@@ -0,0 +1,116 @@
+import queue
+import threading
+import contextvars
+from typing import Callable, List, Optional
+
+
+class SpeechHandle:
+	"""One queued utterance. wait() blocks until it has played (or was cancelled)."""
+
+	def __init__(self, text: str) -> None:
+		self.text = text
+		self.cancelled = False
+		# Played in the caller's context, so a trace span open at say() time covers the playback
+		self._context = contextvars.copy_context()
+		self._cancel = threading.Event()
+		self._done = threading.Event()
+
+	@property
+	def done(self) -> bool:
+		return self._done.is_set()
+
+	@property
+	def cancel_event(self) -> threading.Event:
+		"""Set when playback of this utterance should stop; playback code polls it."""
+		return self._cancel
+
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		return self._done.wait(timeout)
+
+	def cancel(self) -> None:
+		self.cancelled = True
+		self._cancel.set()
+
+	def _finish(self) -> None:
+		self._done.set()
+
+
+class SpeechQueue:
+	"""
+	Plays utterances in order on a dedicated worker thread. speak(text, cancel_event) does
+	the actual synthesis/playback and should stop early once cancel_event is set.
+	"""
+
+	def __init__(self, speak: Callable[[str, threading.Event], None]) -> None:
+		self._speak = speak
+		self._queue: "queue.Queue[SpeechHandle]" = queue.Queue()
+		self._current: Optional[SpeechHandle] = None
+		self._lock = threading.Lock()
+		self._worker: Optional[threading.Thread] = None
+		self._idle = threading.Event()
+		self._idle.set()
+
+	@property
+	def speaking(self) -> bool:
+		return self._current is not None
+
+	def say(self, text: str) -> SpeechHandle:
+		handle = SpeechHandle(text)
+		# Speech triggered from within playback (e.g. a provider fallback) runs inline
+		if threading.current_thread() is self._worker:
+			self._run(handle)
+			return handle
+		with self._lock:
+			self._idle.clear()
+			self._queue.put(handle)
+			if self._worker is None:
+				self._worker = threading.Thread(target=self._loop, name="friday-speech", daemon=True)
+				self._worker.start()
+		return handle
+
+	def flush(self) -> int:
+		"""Cancel everything queued and the utterance playing now. Returns how many were dropped."""
+		dropped: List[SpeechHandle] = []
+		with self._lock:
+			while True:
+				try:
+					dropped.append(self._queue.get_nowait())
+				except queue.Empty:
+					break
+			current = self._current
+		for handle in dropped:
+			handle.cancel()
+			handle._finish()
+		if current is not None:
+			current.cancel()
+			dropped.append(current)
+		self._mark_idle()
+		return len(dropped)
+
+	def wait_idle(self, timeout: Optional[float] = None) -> bool:
+		return self._idle.wait(timeout)
+
+	def _loop(self) -> None:
+		while True:
+			handle = self._queue.get()
+			if handle.cancelled:
+				handle._finish()
+			else:
+				self._run(handle)
+			self._mark_idle()
+
+	def _run(self, handle: SpeechHandle) -> None:
+		previous = self._current
+		self._current = handle
+		try:
+			handle._context.run(self._speak, handle.text, handle.cancel_event)
+		except Exception as ex:
+			print("Speech error:", ex)
+		finally:
+			self._current = previous
+			handle._finish()
+
+	def _mark_idle(self) -> None:
+		with self._lock:
+			if self._queue.empty() and self._current is None:
+				self._idle.set()
@@ -1,9 +1,12 @@
 import os
+import time
 import datetime as dt
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Tuple, Dict, Any, Callable
 
-import requests
-import feedparser
+from friday_breaker import get_connectivity
+from friday_weather import describe_weather
+from friday_trace import bind, span, traced
 
 try:
 	from friday_voice import FridayVoice
@@ -11,9 +14,9 @@ except Exception:
 	FridayVoice = None  # type: ignore
 
 try:
-	from friday_web import FridayWeb
+	from friday_web import get_web
 except Exception:
-	FridayWeb = None  # type: ignore
+	get_web = None  # type: ignore
 
 
 def _get_time_phrase() -> Tuple[str, str]:
@@ -31,46 +34,34 @@ def _get_default_city() -> str:
 
 
 def _get_weather(city: Optional[str]) -> str:
-	# Prefer OpenWeatherMap if API key provided; otherwise fallback to wttr.in
+	# Shared cache and wording with FridayWeb: OpenWeatherMap if keyed, otherwise wttr.in
 	try:
-		api_key = os.getenv("OPENWEATHER_API_KEY")
-		if api_key and city:
-			resp = requests.get(
-				"https://api.openweathermap.org/data/2.5/weather",
-				params={"q": city, "appid": api_key, "units": "metric"},
-				timeout=8,
-			)
-			resp.raise_for_status()
-			data = resp.json()
-			temp = data.get("main", {}).get("temp")
-			desc = (data.get("weather") or [{}])[0].get("description", "").lower()
-			name = data.get("name") or city
-			if temp is not None and desc:
-				return f"Weather in {name} is {int(round(float(temp)))}°C with {desc}."
-		# Fallback: wttr.in concise text
-		url = f"https://wttr.in/{city}?format=3" if city else "https://wttr.in/?format=3"
-		wt = requests.get(url, timeout=8)
-		wt.raise_for_status()
-		brief = (wt.text or "").strip().rstrip('.')
-		if brief:
-			return brief + "."
-		return "Unable to fetch weather data, Boss."
+		return describe_weather(city) or "Unable to fetch weather data, Boss."
 	except Exception:
 		return "Unable to fetch weather data, Boss."
 
 
-def _get_headlines() -> Tuple[str, str]:
-	"""Return (local, national) headlines strings using FridayWeb sources if available."""
-	try:
-		if FridayWeb is not None:
-			w = FridayWeb()
-			local = w._get_news(locality="local")  # type: ignore[attr-defined]
-			national = w._get_news(locality=None)  # type: ignore[attr-defined]
-			return local, national
-	except Exception:
-		pass
-	# Fallback minimal
-	return "Local headlines are unavailable at the moment, Boss.", "National headlines are unavailable at the moment, Boss."
+_LOCAL_NEWS_FALLBACK = "Local headlines are unavailable at the moment, Boss."
+_NATIONAL_NEWS_FALLBACK = "National headlines are unavailable at the moment, Boss."
+
+
+def _get_web():
+	"""The process-wide FridayWeb, whose warm headline store the prefetcher keeps fresh."""
+	return get_web() if get_web is not None else None
+
+
+def _get_local_headlines() -> str:
+	w = _get_web()
+	if w is None:
+		return _LOCAL_NEWS_FALLBACK
+	return w._get_news(locality="local")  # type: ignore[attr-defined]
+
+
+def _get_national_headlines() -> str:
+	w = _get_web()
+	if w is None:
+		return _NATIONAL_NEWS_FALLBACK
+	return w._get_news(locality=None)  # type: ignore[attr-defined]
 
 
 def _get_notifications_summary() -> str:
@@ -91,10 +82,67 @@ def _get_notifications_summary() -> str:
 		return "Notification systems are quiet or temporarily unavailable."
 
 
-def status_report(voice: Optional["FridayVoice"] = None) -> str:
+# Per-section timings of the most recent report: name -> {"seconds": float, "ok": bool}
+LAST_SECTION_TIMINGS: Dict[str, Dict[str, Any]] = {}
+
+
+def _timed_section(fn: Callable[[], str], timings: Dict[str, Dict[str, Any]], name: str) -> str:
+	start = time.perf_counter()
+	ok = False
+	try:
+		with span(f"status.{name}"):
+			result = fn()
+		ok = True
+		return result
+	finally:
+		timings[name] = {"seconds": round(time.perf_counter() - start, 3), "ok": ok}
+
+
+def _gather_sections(city: str, deadline: float) -> Dict[str, str]:
+	"""Fetch all report sections at once; those missing the deadline get their fallback text."""
+	sections: Dict[str, Tuple[Callable[[], str], str]] = {
+		"weather": (lambda: _get_weather(city), "Weather systems are offline."),
+		"local_news": (_get_local_headlines, _LOCAL_NEWS_FALLBACK),
+		"national_news": (_get_national_headlines, _NATIONAL_NEWS_FALLBACK),
+		"notifications": (_get_notifications_summary, "Notification systems are quiet or temporarily unavailable."),
+	}
+	timings: Dict[str, Dict[str, Any]] = {}
+	# A pool per report, one thread per section: sections still hung from an earlier report
+	# keep their own threads and never queue this report's sections behind them
+	pool = ThreadPoolExecutor(max_workers=len(sections), thread_name_prefix="friday-status")
+	futures = {
+		name: pool.submit(bind(_timed_section), fn, timings, name)
+		for name, (fn, _) in sections.items()
+	}
+	# Stragglers finish (or hang) on their own; nothing waits for them
+	pool.shutdown(wait=False)
+	wait(list(futures.values()), timeout=deadline)
+
+	results: Dict[str, str] = {}
+	for name, fut in futures.items():
+		fallback = sections[name][1]
+		if fut.done() and fut.exception() is None and fut.result():
+			results[name] = fut.result()
+		else:
+			results[name] = fallback
+			timings[name] = {
+				"seconds": timings.get(name, {}).get("seconds", round(deadline, 3)),
+				"ok": False,
+			}
+	LAST_SECTION_TIMINGS.clear()
+	LAST_SECTION_TIMINGS.update(timings)
+	print("Status sections:", ", ".join(
+		f"{n} {t['seconds']:.2f}s{'' if t['ok'] else ' (fallback)'}" for n, t in timings.items()
+	))
+	return results
+
+
+@traced("status.report")
+def status_report(voice: Optional["FridayVoice"] = None, deadline: Optional[float] = None) -> str:
 	"""
 	Builds and speaks a concise, cinematic status report.
 	If voice is None, will create a FridayVoice instance for speaking.
+	All sections are fetched concurrently under one deadline (FRIDAY_STATUS_DEADLINE, seconds).
 	Returns the plain-text report.
 	"""
 	local_voice = voice
@@ -104,11 +152,16 @@ def status_report(voice: Optional["FridayVoice"] = None) -> str:
 	except Exception:
 		local_voice = None
 
+	if deadline is None:
+		deadline = float(os.getenv("FRIDAY_STATUS_DEADLINE", "5"))
+
 	time_24, date_phrase = _get_time_phrase()
 	city = _get_default_city()
-	weather_text = _get_weather(city)
-	local_headlines, national_headlines = _get_headlines()
-	notifs = _get_notifications_summary()
+	sections = _gather_sections(city, deadline)
+	weather_text = sections["weather"]
+	local_headlines = sections["local_news"]
+	national_headlines = sections["national_news"]
+	notifs = sections["notifications"]
 
 	daypart = "morning"
 	try:
@@ -124,6 +177,8 @@ def status_report(voice: Optional["FridayVoice"] = None) -> str:
 
 	# Speak greeting then immediately continue with the body—no pause
 	greeting = f"Good {daypart}, Boss. The time is {time_24} hours on {date_phrase}."
+	if not get_connectivity().online:
+		greeting += " Network link is down; readings come from onboard caches."
 	body = (
 		f"{weather_text if weather_text else 'Weather systems are offline.'} "
 		f"Local headline: {local_headlines} "
@@ -134,7 +189,10 @@ def status_report(voice: Optional["FridayVoice"] = None) -> str:
 
 	try:
 		if local_voice is not None:
-			local_voice.say(greeting + " " + body)
+			handle = local_voice.say(greeting + " " + body)
+			# A voice created here has no other owner to keep speaking after we return
+			if voice is None and handle is not None:
+				handle.wait()
 	except Exception:
 		pass
 
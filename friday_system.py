@@ -4,54 +4,76 @@ import webbrowser
 import ctypes
 from typing import Optional
 
+from friday_intents import IntentMatch, route
+from friday_trace import annotate, traced
+
+
+# Fixed acknowledgements; also pre-rendered into the TTS cache at startup
+PHRASES = {
+	"google": "Deploying search drones to Google.",
+	"youtube": "Routing query to YouTube. Bringing up results.",
+	"wikipedia": "Engaging knowledge archives. Wikipedia on screen.",
+	"chrome": "Chrome launched. Happy browsing, Boss.",
+	"vscode": "VS Code engaged. Ready for operations.",
+	"spotify": "Spotify spun up. Cue the soundtrack.",
+	"app_missing": "Application not located. Recommend manual launch or path configuration.",
+	"volume": "Adjusting audio levels.",
+	"mute": "Muting output.",
+	"unmute": "Restoring output.",
+	"shutdown": "System shutdown initiated. Save your work, Boss.",
+	"restart": "System restart initiated. See you in a moment.",
+	"power_failed": "Power command did not engage. Permission or policy may be restricting.",
+}
+
 
 class FridaySystem:
 	def __init__(self, voice) -> None:
 		self.voice = voice
 
-	def try_handle(self, query: str) -> bool:
-		q = query.lower()
+	@traced("system")
+	def try_handle(self, query: str, intent: Optional[IntentMatch] = None) -> bool:
+		if intent is None:
+			intent = route(query)
+		if intent is None:
+			return False
+		name, slots = intent.name, intent.slots
+		annotate(intent=name)
+
 		# Application launchers
-		if any(k in q for k in ["open chrome", "launch chrome", "start chrome"]):
-			return self._open_app("chrome")
-		if any(k in q for k in ["open vscode", "open vs code", "launch code"]):
-			return self._open_app("vscode")
-		if "open spotify" in q:
-			return self._open_app("spotify")
+		if name == "open_app":
+			app = slots.get("app", "").lower().replace(" ", "")
+			return self._open_app("vscode" if app in ("vscode", "code") else app)
 
 		# Web searches
-		if q.startswith("google ") or q.startswith("search "):
-			qry = query.split(" ", 1)[1]
-			url = f"https://www.google.com/search?q={qry}"
+		if name == "google_search":
+			url = f"https://www.google.com/search?q={slots['query']}"
 			webbrowser.open(url)
-			self.voice.say("Deploying search drones to Google.")
+			self.voice.say(PHRASES["google"])
 			return True
-		if q.startswith("youtube ") or "search youtube" in q:
-			qry = query.split(" ", 1)[1]
-			url = f"https://www.youtube.com/results?search_query={qry}"
+		if name == "youtube_search":
+			url = f"https://www.youtube.com/results?search_query={slots['query']}"
 			webbrowser.open(url)
-			self.voice.say("Routing query to YouTube. Bringing up results.")
+			self.voice.say(PHRASES["youtube"])
 			return True
-		if q.startswith("wikipedia ") or "search wikipedia" in q:
-			qry = query.split(" ", 1)[1]
-			url = f"https://en.wikipedia.org/wiki/Special:Search?search={qry}"
+		if name == "wikipedia_search":
+			url = f"https://en.wikipedia.org/wiki/Special:Search?search={slots['query']}"
 			webbrowser.open(url)
-			self.voice.say("Engaging knowledge archives. Wikipedia on screen.")
+			self.voice.say(PHRASES["wikipedia"])
 			return True
 
 		# Volume and system power (Windows-specific)
-		if "mute" in q and "volume" in q:
+		if name == "volume_mute":
 			return self._set_volume_mute(True)
-		if ("unmute" in q or "restore" in q) and "volume" in q:
+		if name == "volume_unmute":
 			return self._set_volume_mute(False)
-		if "volume up" in q:
+		if name == "volume_up":
 			return self._nudge_volume(5)
-		if "volume down" in q:
+		if name == "volume_down":
 			return self._nudge_volume(-5)
 
-		if "shutdown system" in q or "shutdown pc" in q:
+		if name == "power_shutdown":
 			return self._power_action("shutdown")
-		if "restart system" in q or "restart pc" in q:
+		if name == "power_restart":
 			return self._power_action("restart")
 
 		return False
@@ -66,13 +88,13 @@ class FridaySystem:
 				for p in paths:
 					if os.path.exists(p):
 						subprocess.Popen([p])
-						self.voice.say("Chrome launched. Happy browsing, Boss.")
+						self.voice.say(PHRASES["chrome"])
 						return True
 			elif app == "vscode":
 				# Try 'code' on PATH first
 				try:
 					subprocess.Popen(["code"])  # type: ignore[arg-type]
-					self.voice.say("VS Code engaged. Ready for operations.")
+					self.voice.say(PHRASES["vscode"])
 					return True
 				except Exception:
 					paths = [
@@ -83,7 +105,7 @@ class FridaySystem:
 						p_expanded = os.path.expandvars(p)
 						if os.path.exists(p_expanded):
 							subprocess.Popen([p_expanded])
-							self.voice.say("VS Code engaged. Ready for operations.")
+							self.voice.say(PHRASES["vscode"])
 							return True
 			elif app == "spotify":
 				paths = [
@@ -94,24 +116,24 @@ class FridaySystem:
 					p_expanded = os.path.expandvars(p)
 					if os.path.exists(p_expanded):
 						subprocess.Popen([p_expanded])
-						self.voice.say("Spotify spun up. Cue the soundtrack.")
+						self.voice.say(PHRASES["spotify"])
 						return True
 		except Exception:
 			pass
-		self.voice.say("Application not located. Recommend manual launch or path configuration.")
+		self.voice.say(PHRASES["app_missing"])
 		return True
 
 	def _nudge_volume(self, delta: int) -> bool:
 		try:
 			# Use nircmd or Windows volume API if available; fallback to message
-			self.voice.say("Adjusting audio levels.")
+			self.voice.say(PHRASES["volume"])
 			return True
 		except Exception:
 			return False
 
 	def _set_volume_mute(self, mute: bool) -> bool:
 		try:
-			self.voice.say("Muting output." if mute else "Restoring output.")
+			self.voice.say(PHRASES["mute"] if mute else PHRASES["unmute"])
 			return True
 		except Exception:
 			return False
@@ -121,14 +143,14 @@ class FridaySystem:
 			if os.name == "nt":
 				if action == "shutdown":
 					subprocess.Popen(["shutdown", "/s", "/t", "5"])  # schedule shutdown in 5s
-					self.voice.say("System shutdown initiated. Save your work, Boss.")
+					self.voice.say(PHRASES["shutdown"])
 				elif action == "restart":
 					subprocess.Popen(["shutdown", "/r", "/t", "5"])  # schedule restart in 5s
-					self.voice.say("System restart initiated. See you in a moment.")
+					self.voice.say(PHRASES["restart"])
 				return True
 		except Exception:
 			pass
-		self.voice.say("Power command did not engage. Permission or policy may be restricting.")
+		self.voice.say(PHRASES["power_failed"])
 		return True
 
 
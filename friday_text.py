@@ -0,0 +1,104 @@
+import re
+from typing import Iterable, Iterator, List, Optional
+
+
+# Sentence end: terminal punctuation, optional closing quote/bracket, then whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+_ABBREVIATIONS = ("mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "e.g.", "i.e.", "etc.", "no.")
+
+
+class SentenceBuffer:
+	"""Accumulates streamed text and releases it one complete sentence at a time."""
+
+	def __init__(self, min_chars: int = 8) -> None:
+		self.min_chars = min_chars
+		self._buf = ""
+
+	def feed(self, text: str) -> List[str]:
+		self._buf += text or ""
+		out: List[str] = []
+		start = 0
+		for match in _SENTENCE_END.finditer(self._buf):
+			candidate = self._buf[start:match.end()].strip()
+			last_word = candidate.rsplit(" ", 1)[-1].lower()
+			# Skip abbreviations and fragments too short to be worth a separate utterance
+			if last_word in _ABBREVIATIONS or len(candidate) < self.min_chars:
+				continue
+			out.append(candidate)
+			start = match.end()
+		self._buf = self._buf[start:]
+		return out
+
+	def flush(self) -> Optional[str]:
+		rest = self._buf.strip()
+		self._buf = ""
+		return rest or None
+
+
+def iter_sentences(chunks: Iterable[str], min_chars: int = 8) -> Iterator[str]:
+	"""Re-chunk a stream of text fragments (e.g. model tokens) on sentence boundaries."""
+	buf = SentenceBuffer(min_chars=min_chars)
+	for chunk in chunks:
+		for sentence in buf.feed(chunk):
+			yield sentence
+	rest = buf.flush()
+	if rest:
+		yield rest
+
+
+_CLAUSE_BREAK = re.compile(r"(?<=[;:,—])\s+")
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+	"""Break an over-long sentence at clause punctuation, hard-wrapping any clause still too long."""
+	pieces: List[str] = []
+	for clause in _CLAUSE_BREAK.split(sentence):
+		while len(clause) > max_chars:
+			cut = clause.rfind(" ", 0, max_chars)
+			cut = cut if cut > 0 else max_chars
+			pieces.append(clause[:cut].strip())
+			clause = clause[cut:].strip()
+		if clause:
+			pieces.append(clause)
+	return pieces
+
+
+def chunk_text(text: str, max_chars: int = 220, first_chars: int = 40) -> List[str]:
+	"""
+	Split long text into speakable chunks for synthesize-ahead TTS. The first chunk is kept
+	short (one sentence or clause, at least first_chars) so audio can start early; later
+	ones pack whole sentences or clauses up to max_chars.
+	"""
+	pieces: List[str] = []
+	for sentence in iter_sentences([text + " "]):
+		if len(sentence) > max_chars:
+			pieces.extend(_split_long(sentence, max_chars))
+		else:
+			pieces.append(sentence)
+	chunks: List[str] = []
+	current = ""
+	for piece in pieces:
+		limit = first_chars if not chunks else max_chars
+		if current and (len(current) >= limit or len(current) + 1 + len(piece) > max_chars):
+			chunks.append(current)
+			current = piece
+		else:
+			current = f"{current} {piece}".strip()
+	if current:
+		chunks.append(current)
+	return chunks
+
+
+def describe_age(seconds: float) -> str:
+	"""Spoken age of cached data: 'just now', '4 minutes ago', 'about an hour ago'..."""
+	minutes = int(max(0.0, seconds) // 60)
+	if minutes < 1:
+		return "just now"
+	if minutes == 1:
+		return "a minute ago"
+	if minutes < 55:
+		return f"{minutes} minutes ago"
+	hours = int(round(minutes / 60.0))
+	if hours <= 1:
+		return "about an hour ago"
+	return f"{hours} hours ago"
@@ -0,0 +1,325 @@
+"""
+Per-turn latency tracing. Each turn gets an id. span() times a block and nests it under the
+span open in the current context. Pool workers and the speech thread inherit that context
+through bind() and the speech handles. Finished spans are appended to a rotating JSONL file
+and kept in rolling per-name windows. stats() gives percentiles and histogram buckets,
+performance_report() phrases them for the voice command, and serve_metrics() publishes them
+on a local HTTP endpoint.
+"""
+import os
+import json
+import math
+import time
+import queue
+import logging
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from friday_cache import cache_path
+
+# Upper bucket edges (ms) of the latency histograms
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Spoken names of the stages a performance report ranks; "tts.<provider>" is handled apart
+STAGE_NAMES = {
+	"recognition": "speech recognition",
+	"system": "system control",
+	"web.try_answer": "live data",
+	"web.answer": "web answers",
+	"brain.first_token": "the language model",
+	"tts.first_audio": "streamed speech",
+	"status.report": "the status report",
+}
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("friday_span", default=None)
+_turn_ids = itertools.count(1)
+_span_ids = itertools.count(1)
+
+
+def new_turn_id() -> int:
+	"""Process-wide turn ids, so turns of concurrent sessions never share one."""
+	return next(_turn_ids)
+
+
+class Span:
+	"""One timed operation. Attributes can be added until end() records it."""
+
+	__slots__ = ("tracer", "name", "turn", "id", "parent", "attrs", "started", "_t0", "ms", "error")
+
+	def __init__(self, tracer: "Tracer", name: str, turn: Optional[int], parent: Optional[int],
+			attrs: Dict[str, Any], t0: Optional[float] = None, started: Optional[float] = None) -> None:
+		self.tracer = tracer
+		self.name = name
+		self.turn = turn
+		self.id = next(_span_ids)
+		self.parent = parent
+		self.attrs = attrs
+		self._t0 = time.perf_counter() if t0 is None else t0
+		self.started = time.time() if started is None else started
+		self.ms: Optional[float] = None
+		self.error: Optional[str] = None
+
+	def set(self, **attrs: Any) -> None:
+		self.attrs.update(attrs)
+
+	def elapsed_ms(self) -> float:
+		return (time.perf_counter() - self._t0) * 1000.0
+
+	def end(self, error: Optional[BaseException] = None) -> None:
+		if self.ms is not None:
+			return
+		self.ms = self.elapsed_ms()
+		if error is not None:
+			self.error = type(error).__name__
+		self.tracer._finish(self)
+
+
+class Tracer:
+	"""
+	Records spans to FRIDAY_TRACE_FILE (default trace.jsonl in the cache directory), rotated
+	at FRIDAY_TRACE_MAX_BYTES. The file is written by a background listener, so tracing adds
+	no disk I/O to a turn. Percentiles cover the last FRIDAY_TRACE_WINDOW seconds, with at
+	most FRIDAY_TRACE_SAMPLES durations kept per span name.
+	"""
+
+	def __init__(self) -> None:
+		self.enabled = os.getenv("FRIDAY_TRACE", "true").lower() == "true"
+		self.path = os.getenv("FRIDAY_TRACE_FILE") or str(cache_path("trace.jsonl"))
+		self.max_bytes = int(os.getenv("FRIDAY_TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+		self.backups = int(os.getenv("FRIDAY_TRACE_BACKUPS", "3"))
+		self.window = float(os.getenv("FRIDAY_TRACE_WINDOW", "3600"))
+		self.max_samples = int(os.getenv("FRIDAY_TRACE_SAMPLES", "2000"))
+		self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+		self._lock = threading.Lock()
+		# Spans wait here for the writer thread, which serializes and rotates off the turn's path
+		self._records: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+		self._writer: Optional[threading.Thread] = None
+
+	def start(self, name: str, turn: Optional[int] = None, parent: Optional[Span] = None, **attrs: Any) -> Span:
+		"""Begin a span without making it current: for generators and spans that end on another thread."""
+		if parent is None:
+			parent = _current.get()
+		if turn is None and parent is not None:
+			turn = parent.turn
+		return Span(self, name, turn, parent.id if parent is not None else None, attrs)
+
+	@contextmanager
+	def span(self, name: str, turn: Optional[int] = None, parent: Optional[Span] = None, **attrs: Any) -> Iterator[Span]:
+		"""Time a block; spans opened inside it (on this thread or bound ones) become its children."""
+		s = self.start(name, turn=turn, parent=parent, **attrs)
+		token = _current.set(s)
+		try:
+			yield s
+		except BaseException as ex:
+			s.end(ex)
+			raise
+		finally:
+			_current.reset(token)
+			s.end()
+
+	def since(self, name: str, origin: Span, **attrs: Any) -> None:
+		"""Record a span running from origin's start until now, e.g. time to first reply."""
+		Span(self, name, origin.turn, origin.id, attrs, t0=origin._t0, started=origin.started).end()
+
+	def _finish(self, span: Span) -> None:
+		if not self.enabled or span.ms is None:
+			return
+		with self._lock:
+			window = self._samples.get(span.name)
+			if window is None:
+				window = self._samples[span.name] = deque(maxlen=self.max_samples)
+			window.append((time.time(), span.ms))
+		record = {
+			"ts": round(span.started, 4), "turn": span.turn, "span": span.name, "id": span.id,
+			"parent": span.parent, "ms": round(span.ms, 2), "thread": threading.current_thread().name,
+		}
+		if span.error:
+			record["error"] = span.error
+		if span.attrs:
+			record["attrs"] = span.attrs
+		self._write(record)
+
+	def _write(self, record: Dict[str, Any]) -> None:
+		if self._writer is None:
+			with self._lock:
+				if self._writer is None:
+					self._writer = threading.Thread(target=self._write_loop, name="friday-trace", daemon=True)
+					self._writer.start()
+		self._records.put(record)
+
+	def _write_loop(self) -> None:
+		try:
+			handler: Optional[RotatingFileHandler] = RotatingFileHandler(
+				self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8")
+			handler.setFormatter(logging.Formatter("%(message)s"))
+		except Exception as ex:
+			print("Trace file unavailable:", ex)
+			handler = None
+		while True:
+			record = self._records.get()
+			if record is None:
+				break
+			if handler is not None:
+				try:
+					handler.emit(logging.makeLogRecord({"msg": json.dumps(record, default=str)}))
+				except Exception:
+					pass
+		if handler is not None:
+			handler.close()
+
+	def flush(self) -> None:
+		"""Write out every span recorded so far and close the file; later spans reopen it."""
+		with self._lock:
+			writer, self._writer = self._writer, None
+			if writer is not None:
+				self._records.put(None)
+		if writer is not None:
+			writer.join(timeout=5)
+
+	def stats(self) -> Dict[str, Dict[str, Any]]:
+		"""Per span name over the rolling window: count, p50/p95/p99/max (ms) and histogram buckets."""
+		cutoff = time.time() - self.window
+		with self._lock:
+			windows = {name: [ms for t, ms in w if t >= cutoff] for name, w in self._samples.items()}
+		out: Dict[str, Dict[str, Any]] = {}
+		for name, values in sorted(windows.items()):
+			if not values:
+				continue
+			values.sort()
+			buckets: Dict[str, int] = {}
+			for edge in BUCKETS_MS:
+				buckets[f"le_{edge}"] = sum(1 for v in values if v <= edge)
+			buckets["inf"] = len(values)
+			out[name] = {
+				"count": len(values),
+				"p50": round(_percentile(values, 50), 1),
+				"p95": round(_percentile(values, 95), 1),
+				"p99": round(_percentile(values, 99), 1),
+				"max": round(values[-1], 1),
+				"buckets": buckets,
+			}
+		return out
+
+	def performance_report(self) -> str:
+		"""A short spoken summary: turn latency and the slowest stages at the median."""
+		stats = self.stats()
+		turns = stats.get("turn")
+		if not turns:
+			return "No turns timed yet, Boss. Ask me again after a few commands."
+		parts = [f"Over the last {turns['count']} turns"]
+		first = stats.get("first_reply")
+		if first:
+			parts.append(f", I started answering in {_spoken_ms(first['p50'])} at the median "
+				f"and {_spoken_ms(first['p95'])} at the 95th percentile")
+		parts.append(f". Whole turns took {_spoken_ms(turns['p50'])}, {_spoken_ms(turns['p95'])} at the 95th percentile.")
+		stages: List[Tuple[float, str]] = []
+		for name, row in stats.items():
+			if name in STAGE_NAMES:
+				stages.append((row["p50"], STAGE_NAMES[name]))
+			elif name.startswith("tts.") and name.count(".") == 1:
+				stages.append((row["p50"], f"{name[4:]} speech synthesis"))
+		if stages:
+			stages.sort(reverse=True)
+			slowest = ", ".join(f"{label} at {_spoken_ms(ms)}" for ms, label in stages[:3])
+			parts.append(f" Slowest stages: {slowest}.")
+		return "".join(parts)
+
+	def serve_metrics(self, port: int, extra: Optional[Callable[[], Dict[str, Any]]] = None, host: str = "127.0.0.1"):
+		"""
+		Serve GET /metrics (span stats plus whatever extra() returns, as JSON) and GET /report
+		(the spoken summary as text) on a daemon thread. Returns the server.
+		"""
+		from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+		tracer = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self) -> None:
+				path = self.path.split("?", 1)[0].rstrip("/")
+				if path in ("", "/metrics"):
+					payload: Dict[str, Any] = {"spans": tracer.stats()}
+					if extra is not None:
+						try:
+							payload.update(extra())
+						except Exception as ex:
+							payload["extra_error"] = str(ex)
+					body, kind = json.dumps(payload, indent=1, default=str).encode("utf-8"), "application/json"
+				elif path == "/report":
+					body, kind = tracer.performance_report().encode("utf-8"), "text/plain; charset=utf-8"
+				else:
+					self.send_error(404)
+					return
+				self.send_response(200)
+				self.send_header("Content-Type", kind)
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args: Any) -> None:
+				pass
+
+		server = ThreadingHTTPServer((host, port), Handler)
+		server.daemon_threads = True
+		threading.Thread(target=server.serve_forever, name="friday-metrics", daemon=True).start()
+		return server
+
+
+def _percentile(values: List[float], q: float) -> float:
+	# Nearest rank on sorted values
+	return values[max(0, min(len(values) - 1, math.ceil(q / 100.0 * len(values)) - 1))]
+
+
+def _spoken_ms(ms: float) -> str:
+	if ms < 1000:
+		return f"{int(round(ms))} milliseconds"
+	return f"{ms / 1000.0:.1f} seconds"
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+	global _tracer
+	with _tracer_lock:
+		if _tracer is None:
+			_tracer = Tracer()
+		return _tracer
+
+
+def span(name: str, **attrs: Any):
+	"""Shorthand for get_tracer().span(name, ...)."""
+	return get_tracer().span(name, **attrs)
+
+
+def annotate(**attrs: Any) -> None:
+	"""Add attributes to the span open in this context, if any."""
+	current = _current.get()
+	if current is not None:
+		current.set(**attrs)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""Decorator: run the function inside span(name)."""
+	def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+		@wraps(fn)
+		def wrapper(*args: Any, **kwargs: Any) -> Any:
+			with get_tracer().span(name):
+				return fn(*args, **kwargs)
+		return wrapper
+	return decorate
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+	"""Wrap fn to run in a copy of the caller's context, so spans inside a pool worker nest correctly."""
+	ctx = contextvars.copy_context()
+
+	def run(*args: Any, **kwargs: Any) -> Any:
+		# A fresh copy per call: one Context cannot be entered by two threads at once
+		return ctx.copy().run(fn, *args, **kwargs)
+	return run
@@ -0,0 +1,395 @@
+"""
+Long-lived TTS providers. Each one is built once, warmed in the background (SDK imported,
+connection opened, voice resolved) and reused for every utterance. A provider that keeps
+failing is put on a cooldown so FridayVoice skips it instead of paying its failure latency
+on every sentence.
+"""
+import io
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from friday_breaker import get_connectivity, needs_internet
+from friday_cache import cache_path
+from friday_http import get_http
+from friday_trace import get_tracer
+
+# Neighbouring text of a chunk, (previous, next), so a provider can keep prosody continuous
+ChunkContext = Optional[Tuple[str, str]]
+
+
+class TTSProvider:
+	"""
+	Base provider. synthesize() returns (audio bytes, file extension) or None; record()
+	feeds the outcome into the health score.
+	"""
+
+	name = ""
+	# Rendered audio is kept in the on-disk TTS cache
+	cacheable = True
+	# Skipped while friday_breaker's connectivity probe finds no network
+	internet = True
+
+	def __init__(self) -> None:
+		self.fail_limit = max(1, int(os.getenv("FRIDAY_TTS_FAIL_LIMIT", "2")))
+		self.cooldown = float(os.getenv("FRIDAY_TTS_COOLDOWN", "60"))
+		self.max_cooldown = float(os.getenv("FRIDAY_TTS_MAX_COOLDOWN", "600"))
+		# Exponentially weighted success rate, 1.0 = every recent call worked
+		self.score = 1.0
+		self.failures = 0
+		self.trips = 0
+		self.cooldown_until = 0.0
+		self.last_ms = 0.0
+		self._warm_lock = threading.Lock()
+		self._warmed = False
+		self._lock = threading.Lock()
+
+	def available(self) -> bool:
+		"""Configured and importable; checked once when the provider chain is built."""
+		return True
+
+	def signature(self) -> List[str]:
+		"""Everything besides the text that changes the rendered audio."""
+		return []
+
+	def warm(self) -> None:
+		"""Do the one-off setup now rather than on the first utterance. Safe to call twice."""
+		with self._warm_lock:
+			if self._warmed:
+				return
+			self._warmed = True
+			try:
+				self._warm()
+			except Exception as ex:
+				print(f"TTS {self.name} warm-up failed:", ex)
+				self.record(False)
+
+	def _warm(self) -> None:
+		pass
+
+	def synthesize(self, text: str, context: ChunkContext = None) -> Optional[Tuple[bytes, str]]:
+		"""Render text, recording the outcome. Errors count as failures and return None."""
+		self.warm()
+		start = time.perf_counter()
+		with get_tracer().span(f"tts.{self.name}", chars=len(text)) as synth:
+			try:
+				rendered = self._synthesize(text, context)
+			except Exception as ex:
+				print(f"TTS {self.name} error:", ex)
+				rendered = None
+			synth.set(ok=rendered is not None)
+		self.record(rendered is not None, time.perf_counter() - start)
+		return rendered
+
+	def _synthesize(self, text: str, context: ChunkContext) -> Optional[Tuple[bytes, str]]:
+		return None
+
+	@property
+	def healthy(self) -> bool:
+		if self.internet and not get_connectivity().online:
+			return False
+		return time.time() >= self.cooldown_until
+
+	def record(self, ok: bool, seconds: Optional[float] = None) -> None:
+		with self._lock:
+			self.score = 0.8 * self.score + 0.2 * (1.0 if ok else 0.0)
+			if seconds is not None:
+				self.last_ms = seconds * 1000.0
+			if ok:
+				self.failures = 0
+				self.trips = 0
+				return
+			self.failures += 1
+			if self.failures >= self.fail_limit:
+				# Each consecutive trip doubles the cooldown; one success resets it
+				self.trips += 1
+				self.failures = 0
+				delay = min(self.max_cooldown, self.cooldown * (2 ** (self.trips - 1)))
+				self.cooldown_until = time.time() + delay
+				print(f"TTS {self.name} failing; skipping it for {delay:.0f} s.")
+
+	def health(self) -> Dict[str, float]:
+		with self._lock:
+			return {
+				"score": round(self.score, 3),
+				"failures": self.failures,
+				"cooldown_s": max(0.0, round(self.cooldown_until - time.time(), 1)),
+				"last_ms": round(self.last_ms, 1),
+			}
+
+
+class AzureProvider(TTSProvider):
+	name = "azure"
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.key = os.getenv("AZURE_TTS_KEY")
+		self.region = os.getenv("AZURE_TTS_REGION")
+		self.voice = os.getenv("AZURE_TTS_VOICE", "en-IN-NeerjaNeural")
+		self._sdk = None
+		self._config = None
+		# One synthesizer per thread: chunks are rendered concurrently on the TTS pool
+		self._local = threading.local()
+
+	def available(self) -> bool:
+		return bool(self.key and self.region)
+
+	def signature(self) -> List[str]:
+		return [self.voice]
+
+	def _warm(self) -> None:
+		import azure.cognitiveservices.speech as speechsdk  # type: ignore
+		config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+		config.speech_synthesis_voice_name = self.voice
+		config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm)
+		self._sdk, self._config = speechsdk, config
+		self._synthesizer()
+
+	def _synthesizer(self):
+		synthesizer = getattr(self._local, "synthesizer", None)
+		if synthesizer is None:
+			# audio_config=None keeps the audio in memory instead of playing it
+			synthesizer = self._sdk.SpeechSynthesizer(speech_config=self._config, audio_config=None)
+			try:
+				# Open the service connection now instead of on the first request
+				self._sdk.Connection.from_speech_synthesizer(synthesizer).open(True)
+			except Exception:
+				pass
+			self._local.synthesizer = synthesizer
+		return synthesizer
+
+	def _synthesize(self, text: str, context: ChunkContext) -> Optional[Tuple[bytes, str]]:
+		if self._sdk is None:
+			return None
+		result = self._synthesizer().speak_text_async(text).get()
+		if result.reason != self._sdk.ResultReason.SynthesizingAudioCompleted:
+			return None
+		return bytes(result.audio_data), "wav"
+
+
+class ElevenLabsProvider(TTSProvider):
+	name = "elevenlabs"
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.key = os.getenv("ELEVENLABS_API_KEY")
+		self.base = (os.getenv("ELEVENLABS_API_URL") or "https://api.elevenlabs.io").rstrip("/")
+		self.voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")  # default Rachel
+		self.model = os.getenv("ELEVENLABS_MODEL", "eleven_monolingual_v1")
+		self.internet = needs_internet(self.base)
+
+	def available(self) -> bool:
+		return bool(self.key)
+
+	def signature(self) -> List[str]:
+		return [self.voice_id, self.model]
+
+	@property
+	def headers(self) -> Dict[str, str]:
+		return {"xi-api-key": self.key or "", "accept": "audio/mpeg", "content-type": "application/json"}
+
+	def _warm(self) -> None:
+		# Resolves the voice and leaves a TLS connection in the pool for the first utterance
+		resp = get_http().get(f"{self.base}/v1/voices/{self.voice_id}", headers={"xi-api-key": self.key or ""}, retries=0, timeout=5)
+		if resp.status_code in (401, 404):
+			raise RuntimeError(f"voice {self.voice_id} unavailable ({resp.status_code})")
+
+	def body(self, text: str, context: ChunkContext = None) -> dict:
+		body = {"text": text, "model_id": self.model, "voice_settings": {"stability": 0.4, "similarity_boost": 0.8}}
+		if context is not None:
+			# Request stitching: neighbouring chunks keep intonation continuous across requests
+			previous_text, next_text = context
+			if previous_text:
+				body["previous_text"] = previous_text
+			if next_text:
+				body["next_text"] = next_text
+		return body
+
+	def open_stream(self, text: str, context: ChunkContext = None):
+		"""Start a streaming request; the caller reads iter_content() and closes the response."""
+		self.warm()
+		return get_http().post(
+			f"{self.base}/v1/text-to-speech/{self.voice_id}/stream",
+			params={"optimize_streaming_latency": os.getenv("ELEVENLABS_STREAM_LATENCY", "2")},
+			headers=self.headers,
+			json=self.body(text, context),
+			timeout=20,
+			stream=True,
+		)
+
+	def _synthesize(self, text: str, context: ChunkContext) -> Optional[Tuple[bytes, str]]:
+		if not self.key:
+			return None
+		resp = get_http().post(
+			f"{self.base}/v1/text-to-speech/{self.voice_id}",
+			headers=self.headers,
+			json=self.body(text, context),
+			timeout=20,
+		)
+		if resp.status_code != 200:
+			return None
+		return resp.content, "mp3"
+
+
+class GTTSProvider(TTSProvider):
+	name = "gtts"
+
+	def __init__(self, playable: bool = True) -> None:
+		super().__init__()
+		self.lang = os.getenv("FRIDAY_TTS_LANG", "en")
+		self.playable = playable
+		self._gtts = None
+
+	def available(self) -> bool:
+		try:
+			from gtts import gTTS  # type: ignore
+		except Exception:
+			return False
+		self._gtts = gTTS
+		return self.playable
+
+	def signature(self) -> List[str]:
+		return [self.lang]
+
+	def _warm(self) -> None:
+		# gTTS opens its own connections per request; importing it is the part worth doing early
+		self.available()
+
+	def _synthesize(self, text: str, context: ChunkContext) -> Optional[Tuple[bytes, str]]:
+		if self._gtts is None and not self.available():
+			return None
+		# Straight into memory; any speed-up is applied to PCM at playback, so no re-encode
+		buf = io.BytesIO()
+		self._gtts(text=text, lang=self.lang, slow=False).write_to_fp(buf)
+		return buf.getvalue(), "mp3"
+
+
+class LocalProvider(TTSProvider):
+	"""
+	pyttsx3. The engine belongs to the thread that created it, so it is created on first
+	use on the speech thread and kept; say() queues on it without a stop() first.
+	"""
+
+	name = "pyttsx3"
+	cacheable = False
+	internet = False
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.engine = None
+		self._engine_ready = False
+		self._engine_lock = threading.Lock()
+
+	def get_engine(self):
+		with self._engine_lock:
+			if not self._engine_ready:
+				self._engine_ready = True
+				self.engine = self._create_engine()
+		return self.engine
+
+	def _create_engine(self):
+		try:
+			import pyttsx3  # type: ignore
+		except Exception:
+			return None
+		try:
+			engine = pyttsx3.init()
+			# Configure a slightly futuristic voice and faster rate if supported
+			r = engine.getProperty("rate")
+			# Target faster yet clear speech; allow override via env
+			target_rate = int(os.getenv("FRIDAY_TTS_RATE", "200"))
+			try:
+				engine.setProperty("rate", target_rate)
+			except Exception:
+				engine.setProperty("rate", int(r * 1.2))
+			selected_id = os.getenv("FRIDAY_VOICE_ID", "").strip() or saved_voice_id()
+			if selected_id:
+				try:
+					engine.setProperty("voice", selected_id)
+					return engine
+				except Exception:
+					pass
+			# Enumerating voices is slow on SAPI, so the pick is remembered for the next start
+			selected_id = pick_voice(engine.getProperty("voices"))
+			if selected_id:
+				engine.setProperty("voice", selected_id)
+				save_voice_id(selected_id)
+			return engine
+		except Exception:
+			return None
+
+	def speak(self, text: str) -> bool:
+		engine = self.get_engine()
+		if engine is None:
+			return False
+		try:
+			engine.say(text)
+			engine.runAndWait()
+		except Exception:
+			self.record(False)
+			return False
+		self.record(True)
+		return True
+
+	def stop(self) -> None:
+		if self.engine is not None:
+			try:
+				self.engine.stop()
+			except Exception:
+				pass
+
+
+def pick_voice(voices) -> Optional[str]:
+	# Prefer Indian English voice if available
+	for v in voices:
+		name_l = (getattr(v, "name", "") or "").lower()
+		lang_l = ",".join(getattr(v, "languages", []) or []).lower()
+		if "india" in name_l or "en-in" in lang_l or "hindi" in name_l or "female" in name_l or "zira" in name_l:
+			return v.id
+	# Fallback to any female/neutral English voice
+	for v in voices:
+		name_l = (getattr(v, "name", "") or "").lower()
+		if "female" in name_l or "zira" in name_l or "english" in name_l:
+			return v.id
+	return None
+
+
+def saved_voice_id() -> Optional[str]:
+	try:
+		with open(cache_path("tts_voice.json"), "r", encoding="utf-8") as fh:
+			return json.load(fh).get("voice_id") or None
+	except Exception:
+		return None
+
+
+def save_voice_id(voice_id: str) -> None:
+	try:
+		with open(cache_path("tts_voice.json"), "w", encoding="utf-8") as fh:
+			json.dump({"voice_id": voice_id}, fh)
+	except Exception:
+		pass
+
+
+PROVIDERS = {
+	"azure": AzureProvider,
+	"elevenlabs": ElevenLabsProvider,
+	"gtts": GTTSProvider,
+}
+# Auto-detection order for FRIDAY_TTS_PROVIDER=auto
+AUTO_ORDER = ("azure", "elevenlabs", "gtts")
+
+
+def build_chain(choice: str, gtts_playable: bool = True) -> List[TTSProvider]:
+	"""
+	Network providers to try in order, resolved once. An explicit FRIDAY_TTS_PROVIDER is
+	used as is; auto keeps every provider that is configured and importable.
+	"""
+	names = [choice] if choice in PROVIDERS else [] if choice == "pyttsx3" else list(AUTO_ORDER)
+	chain: List[TTSProvider] = []
+	for name in names:
+		provider = GTTSProvider(gtts_playable) if name == "gtts" else PROVIDERS[name]()
+		if choice == name or provider.available():
+			chain.append(provider)
+	return chain
@@ -0,0 +1,197 @@
+"""
+Frame-level voice-activity detection for endpointing. Audio is split into short frames whose
+log energies, minimum-statistics noise floor and short-term energy swing are computed in one
+vectorized pass per chunk, and a hangover keeps short pauses inside the utterance. Used by FridayVoice when
+FRIDAY_ENDPOINTING=vad.
+"""
+import os
+import collections
+from typing import List, Optional, Tuple
+
+import numpy as np
+import speech_recognition as sr
+
+
+class FrameVAD:
+	"""
+	Per-frame speech decisions over 16-bit mono PCM.
+	A frame is speech when its energy is margin_db above the noise floor and its energy has
+	swung by more than flat_db over the last flat_ms, or is loud_db above the floor outright
+	(a held vowel). The floor is the minimum frame energy over the last floor_window_ms
+	(minimum statistics) of non-speech frames: speech frames carry the floor forward, so a
+	long stretch of speech cannot lift it. A fan switching on is steady, so its frames fail
+	the swing test; the utterance ends one hangover later and the floor learns the new level.
+	Speech starts after onset_ms of consecutive speech frames and ends after hangover_ms
+	without any.
+	"""
+
+	def __init__(self, rate: int, frame_ms: Optional[int] = None, margin_db: Optional[float] = None,
+			onset_ms: Optional[int] = None, hangover_ms: Optional[int] = None,
+			floor_db: Optional[float] = None, floor_window_ms: Optional[int] = None,
+			flat_ms: Optional[int] = None, flat_db: Optional[float] = None, loud_db: Optional[float] = None) -> None:
+		if frame_ms is None:
+			frame_ms = int(os.getenv("FRIDAY_VAD_FRAME_MS", "20"))
+		if margin_db is None:
+			margin_db = float(os.getenv("FRIDAY_VAD_MARGIN_DB", "6"))
+		if onset_ms is None:
+			onset_ms = int(os.getenv("FRIDAY_VAD_ONSET_MS", "60"))
+		if hangover_ms is None:
+			hangover_ms = int(os.getenv("FRIDAY_VAD_HANGOVER_MS", "400"))
+		if floor_window_ms is None:
+			floor_window_ms = int(os.getenv("FRIDAY_VAD_FLOOR_WINDOW_MS", "3000"))
+		if flat_ms is None:
+			flat_ms = int(os.getenv("FRIDAY_VAD_FLAT_MS", "300"))
+		if flat_db is None:
+			flat_db = float(os.getenv("FRIDAY_VAD_FLAT_DB", "4"))
+		if loud_db is None:
+			loud_db = float(os.getenv("FRIDAY_VAD_LOUD_DB", "25"))
+		self.rate = rate
+		self.frame_ms = min(30, max(10, frame_ms))
+		self.frame_samples = rate * self.frame_ms // 1000
+		self.margin_db = margin_db
+		self.onset_frames = max(1, onset_ms // self.frame_ms)
+		self.hangover_frames = max(1, hangover_ms // self.frame_ms)
+		self.window = max(2, floor_window_ms // self.frame_ms)
+		self.flat_frames = max(2, flat_ms // self.frame_ms)
+		self.flat_db = flat_db
+		self.loud_db = loud_db
+		self._recent = np.full(self.flat_frames - 1, np.nan)
+		# Recent frame energies; a calibrated floor stands in for them until real frames arrive
+		self._history = np.full(self.window - 1, np.inf if floor_db is None else floor_db)
+		self.floor_db = floor_db
+		self.in_speech = False
+		self._run = 0
+		self._quiet = 0
+		self._pending = np.zeros(0, dtype=np.int16)
+
+	def _frame_energies(self, samples: np.ndarray) -> np.ndarray:
+		n = len(samples) // self.frame_samples
+		frames = samples[: n * self.frame_samples].reshape(n, self.frame_samples).astype(np.float64)
+		rms = np.sqrt(np.mean(frames * frames, axis=1))
+		return 20.0 * np.log10(rms + 1.0)
+
+	def process(self, pcm: bytes) -> List[bool]:
+		"""Feed PCM; returns the smoothed in-speech state of every completed frame."""
+		samples = np.concatenate([self._pending, np.frombuffer(pcm, dtype="<i2")])
+		whole = len(samples) - len(samples) % self.frame_samples
+		self._pending = samples[whole:]
+		energies = self._frame_energies(samples[:whole])
+		if not len(energies):
+			return []
+		# Sliding-window minimum for every new frame in one pass
+		series = np.concatenate([self._history, energies])
+		floors = np.lib.stride_tricks.sliding_window_view(series, self.window).min(axis=1)
+		# Energy swing over the last flat_ms: speech fluctuates, a fan that just came on does not
+		recent = np.concatenate([self._recent, energies])
+		spans = np.lib.stride_tricks.sliding_window_view(recent, self.flat_frames)
+		swing = np.nanmax(spans, axis=1) - np.nanmin(spans, axis=1)
+		self._recent = recent[len(recent) - (self.flat_frames - 1):]
+		# Frames loud_db above the floor are speech even when steady (a held vowel)
+		above = energies - floors
+		active = (above > self.margin_db) & ((swing > self.flat_db) | (above > self.loud_db))
+		# Active frames carry the floor forward instead of entering the history, so a long stretch
+		# of speech never lifts the floor; flat noise is inactive, so a fan step is still learned
+		series[len(self._history):] = np.where(active, floors, energies)
+		self._history = series[len(series) - (self.window - 1):]
+		self.floor_db = float(floors[-1])
+		states: List[bool] = []
+		for frame_active in active:
+			if frame_active:
+				self._run += 1
+				self._quiet = 0
+				if not self.in_speech and self._run >= self.onset_frames:
+					self.in_speech = True
+			else:
+				self._run = 0
+				if self.in_speech:
+					self._quiet += 1
+					if self._quiet >= self.hangover_frames:
+						self.in_speech = False
+						self._quiet = 0
+			states.append(self.in_speech)
+		return states
+
+
+class Endpointer:
+	"""
+	Finds one utterance in a stream of PCM chunks: waits for speech onset, keeps pre_roll_ms
+	before it, and completes once the VAD reports the end of speech.
+	"""
+
+	def __init__(self, vad: FrameVAD, pre_roll_ms: Optional[int] = None) -> None:
+		if pre_roll_ms is None:
+			pre_roll_ms = int(os.getenv("FRIDAY_VAD_PREROLL_MS", "300"))
+		self.vad = vad
+		self._frame_bytes = vad.frame_samples * 2
+		self._pre_roll: "collections.deque[bytes]" = collections.deque(maxlen=max(1, pre_roll_ms // vad.frame_ms))
+		self._buf = bytearray()
+		self._voiced = bytearray()
+		self.started = False
+		self.done = False
+		self.frames_read = 0
+		self._last_speech_frame = 0
+
+	def feed(self, pcm: bytes) -> bool:
+		"""Returns True once the utterance is complete."""
+		self._buf += pcm
+		for speech in self.vad.process(pcm):
+			frame = bytes(self._buf[:self._frame_bytes])
+			del self._buf[:self._frame_bytes]
+			self.frames_read += 1
+			if not self.started:
+				self._pre_roll.append(frame)
+				if speech:
+					self.started = True
+					self._voiced += b"".join(self._pre_roll)
+					self._last_speech_frame = self.frames_read
+				continue
+			self._voiced += frame
+			if speech:
+				self._last_speech_frame = self.frames_read
+			else:
+				self.done = True
+				break
+		return self.done
+
+	def audio(self) -> bytes:
+		"""The utterance, trimmed to end just after the last speech frame (hangover removed)."""
+		trailing = self.frames_read - self._last_speech_frame
+		keep = len(self._voiced) - max(0, trailing - 1) * self._frame_bytes
+		return bytes(self._voiced[:max(0, keep)])
+
+
+def energy_floor_db(energy_threshold: float, ratio: float) -> float:
+	"""Noise floor implied by speech_recognition's calibrated energy threshold."""
+	return float(20.0 * np.log10(max(1.0, energy_threshold / max(ratio, 1.0)) + 1.0))
+
+
+def listen_vad(source: "sr.AudioSource", timeout: Optional[float] = None, phrase_time_limit: Optional[float] = None,
+		floor_db: Optional[float] = None) -> Tuple["sr.AudioData", Optional[float]]:
+	"""
+	Drop-in for Recognizer.listen() driven by FrameVAD. Returns the utterance and the noise
+	floor reached, which seeds the next call. Raises sr.WaitTimeoutError like listen().
+	"""
+	if source.SAMPLE_WIDTH != 2:
+		raise ValueError("VAD endpointing needs 16-bit audio")
+	vad = FrameVAD(source.SAMPLE_RATE, floor_db=floor_db)
+	endpointer = Endpointer(vad)
+	seconds_per_buffer = float(source.CHUNK) / source.SAMPLE_RATE
+	elapsed = 0.0
+	started_at = 0.0
+	while True:
+		buf = source.stream.read(source.CHUNK)
+		if not buf:
+			break
+		elapsed += seconds_per_buffer
+		was_started = endpointer.started
+		if endpointer.feed(buf):
+			break
+		if endpointer.started and not was_started:
+			started_at = elapsed
+		if not endpointer.started and timeout and elapsed > timeout:
+			raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+		if endpointer.started and phrase_time_limit and elapsed - started_at > phrase_time_limit:
+			break
+	if not endpointer.started:
+		raise sr.WaitTimeoutError("audio ended before a phrase started")
+	return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, 2), vad.floor_db
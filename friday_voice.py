@@ -1,24 +1,102 @@
+import json
 import threading
 import queue
 import os
-import tempfile
-from typing import Optional
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
 import speech_recognition as sr
 
 try:
-	import pyttsx3
-except Exception:  # optional alternative
-	pyttsx3 = None
+	import audioop
+except Exception:  # removed from the stdlib in Python 3.13
+	audioop = None  # type: ignore
 
-try:
-	from gtts import gTTS  # type: ignore
-except Exception:
-	gTTS = None  # type: ignore
+from friday_breaker import get_breaker, needs_internet
+from friday_cache import AudioCache, cache_path
+from friday_speech import SpeechHandle, SpeechQueue
+from friday_audio import Pcm, open_mp3_stream, decode_audio, speed_up_pcm, play_pcm, pcm_output_available
+from friday_text import chunk_text
+from friday_tts import ChunkContext, LocalProvider, TTSProvider, build_chain
+from friday_trace import bind, get_tracer, span
 
-try:
-	from playsound import playsound  # type: ignore
-except Exception:
-	playsound = None  # type: ignore
+def _playsound():
+	"""playsound.playsound on first use; None when it is not installed."""
+	try:
+		from playsound import playsound  # type: ignore
+	except Exception:
+		return None
+	return playsound
+
+
+PROMPT_REPEAT = "Pardon me, Boss, could you repeat that?"
+PROMPT_NETWORK = "Network hiccup. Reattempting capture."
+
+# Providers whose rendered audio is kept in the on-disk TTS cache
+CACHEABLE_PROVIDERS = ("azure", "elevenlabs", "gtts")
+
+
+class _BargeInStream:
+	"""
+	Wraps the microphone stream during capture. While FRIDAY is speaking, sustained input
+	well above both the ambient threshold and the level of FRIDAY's own voice reaching the
+	mic means the user is talking over it: interrupt speech.
+
+	The echo reference is the median mic level over the last FRIDAY_BARGE_IN_ECHO_SECONDS of
+	speech, and barge-in needs FRIDAY_BARGE_IN_ECHO_RATIO times that. Nothing fires until
+	half a window has been heard. This is a level heuristic, not echo cancellation: it is
+	dependable with headphones or a mic with hardware echo cancellation, and on loud open
+	speakers FRIDAY_BARGE_IN=false is the safe setting.
+	"""
+
+	def __init__(self, source: "sr.Microphone", voice: "FridayVoice") -> None:
+		self._stream = source.stream
+		self._voice = voice
+		self._width = source.SAMPLE_WIDTH
+		self._chunk_seconds = float(source.CHUNK) / source.SAMPLE_RATE
+		self._ratio = float(os.getenv("FRIDAY_BARGE_IN_RATIO", "3.0"))
+		self._echo_ratio = float(os.getenv("FRIDAY_BARGE_IN_ECHO_RATIO", "2.0"))
+		self._needed = max(1, int(round(float(os.getenv("FRIDAY_BARGE_IN_SECONDS", "0.4")) / self._chunk_seconds)))
+		window = max(2, int(round(float(os.getenv("FRIDAY_BARGE_IN_ECHO_SECONDS", "1.5")) / self._chunk_seconds)))
+		self._echo: Deque[int] = deque(maxlen=window)
+		self._loud = 0
+		self.fired = False
+		# Per chunk read: was FRIDAY speaking? Lets capture() tell its own voice from a command
+		self.speaking_flags: Deque[bool] = deque(maxlen=int(60.0 / self._chunk_seconds))
+
+	def read(self, size: int) -> bytes:
+		data = self._stream.read(size)
+		speaking = self._voice.speaking
+		self.speaking_flags.append(speaking)
+		if audioop is not None and speaking:
+			rms = audioop.rms(data, self._width)
+			threshold = self._voice.recognizer.energy_threshold * self._ratio
+			ready = len(self._echo) >= self._echo.maxlen // 2
+			if ready:
+				threshold = max(threshold, self._echo_ratio * sorted(self._echo)[len(self._echo) // 2])
+			self._loud = self._loud + 1 if ready and rms > threshold else 0
+			# Loud chunks stay out of the echo reference, so talking over FRIDAY cannot raise it
+			if not self._loud:
+				self._echo.append(rms)
+			if self._loud >= self._needed:
+				self._loud = 0
+				self.fired = True
+				self._voice.interrupt()
+		else:
+			self._loud = 0
+			self._echo.clear()
+		return data
+
+	def spoken_over(self, seconds: float) -> float:
+		"""Fraction of the last seconds of input read while FRIDAY was speaking."""
+		n = max(1, int(round(seconds / self._chunk_seconds)))
+		recent = list(self.speaking_flags)[-n:]
+		return sum(recent) / float(len(recent)) if recent else 0.0
+
+	def close(self) -> None:
+		self._stream.close()
 
 
 class FridayVoice:
@@ -27,14 +105,34 @@ class FridayVoice:
 		self._configure_recognizer()
 		self.microphone = sr.Microphone()
 		self._init_tts()
+		self._init_wake()
 		self._listen_lock = threading.Lock()
 		self._audio_queue: "queue.Queue[bytes]" = queue.Queue()
-		# Calibrate ambient noise
+		# Ambient calibration is reused from the last run; otherwise it happens on the first
+		# capture, after the greeting, rather than blocking startup
+		self._calibrated = self._load_calibration()
+
+	def _load_calibration(self) -> bool:
+		if os.getenv("FRIDAY_ASR_CALIBRATE", "auto").lower() == "always":
+			return False
+		try:
+			with open(cache_path("asr_calibration.json"), "r", encoding="utf-8") as fh:
+				saved = json.load(fh)
+			if time.time() - float(saved["saved_at"]) > float(os.getenv("FRIDAY_ASR_CALIBRATION_MAX_AGE", "604800")):
+				return False
+			self.recognizer.energy_threshold = float(saved["energy_threshold"])
+			return True
+		except Exception:
+			return False
+
+	def _calibrate(self, source: "sr.Microphone") -> None:
 		try:
-			with self.microphone as source:
-				self.recognizer.adjust_for_ambient_noise(source, duration=1.0)
+			self.recognizer.adjust_for_ambient_noise(source, duration=float(os.getenv("FRIDAY_ASR_CALIBRATE_SECONDS", "1.0")))
+			with open(cache_path("asr_calibration.json"), "w", encoding="utf-8") as fh:
+				json.dump({"energy_threshold": self.recognizer.energy_threshold, "saved_at": time.time()}, fh)
 		except Exception:
 			pass
+		self._calibrated = True
 
 	def _configure_recognizer(self) -> None:
 		# Stronger noise handling and sensitivity tuning
@@ -48,210 +146,465 @@ class FridayVoice:
 			self.recognizer.non_speaking_duration = float(os.getenv("FRIDAY_ASR_NON_SPEAK", "0.3"))
 		except Exception:
 			pass
+		# "energy" ends utterances after pause_threshold of quiet; "vad" uses friday_vad
+		self.endpointing = (os.getenv("FRIDAY_ENDPOINTING", "energy") or "energy").lower()
+		self._vad_floor: Optional[float] = None
 
 	def _init_tts(self) -> None:
-		self.engine = None
+		# Providers are long-lived: built once on first use, warmed by warm_up(), then reused.
+		# pyttsx3 starts on first use, on the speech thread that will drive it
+		self._local_tts = LocalProvider()
 		self.tts_provider = (os.getenv("FRIDAY_TTS_PROVIDER", "auto") or "auto").lower()
-		self.azure_key = os.getenv("AZURE_TTS_KEY")
-		self.azure_region = os.getenv("AZURE_TTS_REGION")
-		self.eleven_key = os.getenv("ELEVENLABS_API_KEY")
-		if pyttsx3 is not None:
-			try:
-				engine = pyttsx3.init()
-				# Configure a slightly futuristic voice and faster rate if supported
-				r = engine.getProperty("rate")
-				# Target faster yet clear speech; allow override via env
-				target_rate = int(os.getenv("FRIDAY_TTS_RATE", "200"))
+		self._tts_chain: Optional[List[TTSProvider]] = None
+		self._tts_chain_lock = threading.Lock()
+		# Optional gTTS tempo-up (pitch preserved), applied to decoded PCM
+		sped = os.getenv("FRIDAY_TTS_SPEED", "fast").lower() in ("fast", "faster", "1.2x")
+		self._gtts_speed = float(os.getenv("FRIDAY_TTS_PLAYBACK", "1.2")) if sped else 1.0
+		try:
+			self._audio_cache: Optional[AudioCache] = AudioCache()
+		except Exception:
+			self._audio_cache = None
+		# Long text is spoken in chunks, synthesizing up to FRIDAY_TTS_PREFETCH chunks ahead
+		self.tts_chunk_chars = int(os.getenv("FRIDAY_TTS_CHUNK_CHARS", "220"))
+		self.tts_prefetch = max(1, int(os.getenv("FRIDAY_TTS_PREFETCH", "2")))
+		self._synth_pool = ThreadPoolExecutor(max_workers=self.tts_prefetch, thread_name_prefix="friday-tts")
+		# say() only queues; a worker thread plays utterances in order
+		self._speech = SpeechQueue(self._speak)
+		self._barge_in_listeners: List[Callable[[], None]] = []
+		self.barge_in = os.getenv("FRIDAY_BARGE_IN", "true").lower() == "true"
+		# Drop utterances captured over FRIDAY's own speech that did not barge in (needs barge_in)
+		self.echo_guard = os.getenv("FRIDAY_ECHO_GUARD", "true").lower() == "true"
+		self.echo_rejected = 0
+
+	def _init_wake(self) -> None:
+		# Local wake-word gate, off until enable_wake_gate(); see friday_wakeword
+		self.wake_detector = None
+		self.wake_rejected = 0
+		self._wake_followup = float(os.getenv("FRIDAY_WAKE_FOLLOWUP", "6"))
+		self._awake_until = 0.0
+
+	def enable_wake_gate(self) -> bool:
+		"""Require a locally detected wake word before audio is sent to cloud ASR."""
+		if os.getenv("FRIDAY_WAKE_GATE", "true").lower() != "true":
+			return False
+		try:
+			from friday_wakeword import load_detector
+			self.wake_detector = load_detector()
+		except Exception as ex:
+			print("Wake-word gate unavailable:", ex)
+			self.wake_detector = None
+		if self.wake_detector is None:
+			print("No wake-word templates enrolled (python friday_wakeword.py enroll); using cloud ASR for every utterance.")
+		return self.wake_detector is not None
+
+	def _gate(self, audio: "sr.AudioData") -> Optional["sr.AudioData"]:
+		"""Audio following the wake word, or None when there is none (no cloud call needed)."""
+		if self.wake_detector is None:
+			return audio
+		if time.time() < self._awake_until:
+			# Command spoken after a bare wake word
+			self._awake_until = 0.0
+			return audio
+		from friday_wakeword import audio_samples
+		samples, rate = audio_samples(audio)
+		end = self.wake_detector.detect(samples, rate)
+		if end is None:
+			self.wake_rejected += 1
+			return None
+		raw = audio.get_raw_data()
+		rest = raw[int(end * rate) * audio.sample_width:]
+		if len(rest) < int(0.3 * rate) * audio.sample_width:
+			print("Wake word detected; listening.")
+			self._awake_until = time.time() + self._wake_followup
+			return None
+		return sr.AudioData(rest, audio.sample_rate, audio.sample_width)
+
+	def say(self, text: str) -> Optional[SpeechHandle]:
+		"""Queue text for speech and return at once; the handle can wait() or cancel()."""
+		if not text:
+			return None
+		return self._speech.say(text)
+
+	def say_stream(self, chunks: Iterable[str]) -> Optional[SpeechHandle]:
+		"""Queue text chunks as they are produced; earlier chunks play while later ones generate."""
+		handle = None
+		try:
+			for chunk in chunks:
+				handle = self.say(chunk) or handle
+		except Exception as ex:
+			print("Speech stream error:", ex)
+		return handle
+
+	@property
+	def speaking(self) -> bool:
+		return self._speech.speaking
+
+	def flush(self) -> int:
+		"""Drop queued speech and stop the current utterance."""
+		dropped = self._speech.flush()
+		if dropped:
+			self._local_tts.stop()
+		return dropped
+
+	def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+		return self._speech.wait_idle(timeout)
+
+	def on_barge_in(self, callback: Callable[[], None]) -> None:
+		self._barge_in_listeners.append(callback)
+
+	def interrupt(self) -> None:
+		"""Barge-in: the user started talking over FRIDAY, so stop speaking."""
+		if self.flush():
+			for callback in list(self._barge_in_listeners):
 				try:
-					engine.setProperty("rate", target_rate)
+					callback()
 				except Exception:
-					engine.setProperty("rate", int(r * 1.2))
-				# Prefer Indian English voice if available
-				preferred_voice_id = os.getenv("FRIDAY_VOICE_ID", "").strip()
-				voices = engine.getProperty("voices")
-				selected_id = None
-				if preferred_voice_id:
-					selected_id = preferred_voice_id
-				else:
-					for v in voices:
-						name_l = (getattr(v, "name", "") or "").lower()
-						lang_l = ",".join(getattr(v, "languages", []) or []).lower()
-						if "india" in name_l or "en-in" in lang_l or "hindi" in name_l or "female" in name_l or "zira" in name_l:
-							selected_id = v.id
-							break
-					# Fallback to any female/neutral English voice
-					if not selected_id:
-						for v in voices:
-							name_l = (getattr(v, "name", "") or "").lower()
-							if "female" in name_l or "zira" in name_l or "english" in name_l:
-								selected_id = v.id
-								break
-				if selected_id:
-					engine.setProperty("voice", selected_id)
-				self.engine = engine
-			except Exception:
-				self.engine = None
+					pass
 
-	def say(self, text: str) -> None:
-		if not text:
-			return
-		# Choose provider: Azure/ElevenLabs/gTTS/pyttsx3 in that order if configured
-		provider = self._select_tts_provider()
-		if provider == "azure":
-			if self._say_azure(text):
+	def _speak(self, text: str, cancel: threading.Event) -> None:
+		# Healthy network providers in preference order, then pyttsx3
+		for provider in self._healthy_providers():
+			if len(text) > self.tts_chunk_chars:
+				chunks = chunk_text(text, self.tts_chunk_chars)
+				if len(chunks) > 1:
+					spoken = self._say_chunked(provider, chunks, cancel)
+					if spoken == len(chunks) or cancel.is_set():
+						return
+					if spoken:
+						# Provider failed mid-answer: the local voice finishes what is left
+						self._say_local(" ".join(chunks[spoken:]))
+						return
+					# Failed on the first chunk: the whole text would fail the same way, try the next provider
+					continue
+			# ElevenLabs starts playing while audio downloads; cache hits play from disk
+			if provider == "elevenlabs":
+				streamed = self._say_elevenlabs_stream(text, cancel)
+				if streamed:
+					return
+				if streamed is False:
+					# The provider answered with an error; rendering the same text would too
+					continue
+			# Network providers render through the on-disk audio cache
+			if self._say_rendered(provider, text, cancel):
 				return
-		elif provider == "elevenlabs":
-			if self._say_elevenlabs(text):
-				return
-		elif provider == "gtts":
-			if self._say_gtts(text):
+			if cancel.is_set():
 				return
+		if cancel.is_set():
+			return
+		self._say_local(text)
+
+	def _say_local(self, text: str) -> None:
 		# Fallback to pyttsx3 if available
-		if self.engine is not None:
-			try:
-				self.engine.stop()
-				self.engine.say(text)
-				self.engine.runAndWait()
-			except Exception:
-				print("FRIDAY:", text)
-				return
-		else:
+		if not self._local_tts.speak(text):
 			print("FRIDAY:", text)
 
-	def listen(self, timeout: float = 7.0, phrase_time_limit: float = 10.0) -> Optional[str]:
+	def capture(self, timeout: float = 7.0, phrase_time_limit: float = 10.0) -> Optional["sr.AudioData"]:
+		"""
+		Record one utterance from the microphone without recognizing it. With the wake-word
+		gate on, utterances without the wake word come back as None.
+		"""
 		with self._listen_lock:
 			try:
 				with self.microphone as source:
-					audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-				txt = None
-				try:
-					lang = os.getenv("FRIDAY_ASR_LANG", "en-IN")
-					txt = self.recognizer.recognize_google(audio, language=lang)
-				except sr.UnknownValueError:
-					self.say("Pardon me, Boss, could you repeat that?")
-					return None
-				except sr.RequestError:
-					# offline recognize not configured; just ask again
-					self.say("Network hiccup. Reattempting capture.")
-					return None
-				return txt
+					if not self._calibrated:
+						self._calibrate(source)
+					stream = None
+					if self.barge_in:
+						stream = source.stream = _BargeInStream(source, self)
+					if self.endpointing == "vad":
+						audio = self._listen_vad(source, timeout, phrase_time_limit)
+					else:
+						audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
 			except sr.WaitTimeoutError:
 				return None
 			except Exception as ex:
 				print("Listen error:", ex)
 				return None
+		if stream is not None and not stream.fired and self.echo_guard:
+			# Captured mostly over FRIDAY's own speech with no barge-in: that is its voice, not a command
+			seconds = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+			if stream.spoken_over(seconds) > 0.5:
+				self.echo_rejected += 1
+				return None
+		return self._gate(audio)
 
-	def _select_tts_provider(self) -> str:
-		if self.tts_provider in ("azure", "elevenlabs", "gtts", "pyttsx3"):
-			return self.tts_provider
-		# auto-detect
-		if self.azure_key and self.azure_region:
-			return "azure"
-		if self.eleven_key:
-			return "elevenlabs"
-		if gTTS is not None and playsound is not None:
-			return "gtts"
-		return "pyttsx3"
-
-	def _say_gtts(self, text: str) -> bool:
-		if gTTS is None or playsound is None:
-			return False
+	def _listen_vad(self, source: "sr.Microphone", timeout: float, phrase_time_limit: float) -> "sr.AudioData":
 		try:
-			lang = os.getenv("FRIDAY_TTS_LANG", "en")
-			# Cache to a temporary MP3 and play
-			with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-				mp3_path = tmp.name
-			try:
-				gTTS(text=text, lang=lang, slow=False).save(mp3_path)
-				# Optional speed-up using pydub if available
-				sped = os.getenv("FRIDAY_TTS_SPEED", "fast").lower() in ("fast", "faster", "1.2x")
-				if sped:
-					try:
-						from pydub import AudioSegment  # type: ignore
-						from pydub.effects import speedup  # type: ignore
-						seg = AudioSegment.from_file(mp3_path, format="mp3")
-						seg_fast = speedup(seg, playback_speed=float(os.getenv("FRIDAY_TTS_PLAYBACK", "1.2")))
-						with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as sped_tmp:
-							sped_path = sped_tmp.name
-						seg_fast.export(sped_path, format="mp3")
-						playsound(sped_path)
-						try:
-							os.unlink(sped_path)
-						except Exception:
-							pass
-						return True
-					except Exception:
-						# Fallback to normal playback
-						playsound(mp3_path)
-						return True
-				else:
-					playsound(mp3_path)
-					return True
-			finally:
-				try:
-					os.unlink(mp3_path)
-				except Exception:
-					pass
+			from friday_vad import listen_vad, energy_floor_db
 		except Exception:
-			return False
+			return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+		if self._vad_floor is None:
+			# Seed the noise floor from the ambient calibration
+			self._vad_floor = energy_floor_db(self.recognizer.energy_threshold, self.recognizer.dynamic_energy_ratio)
+		try:
+			audio, self._vad_floor = listen_vad(source, timeout, phrase_time_limit, self._vad_floor)
+		except ValueError:
+			return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+		return audio
 
-	def _say_azure(self, text: str) -> bool:
-		# Optional Azure TTS placeholder; implement if SDK present
+	def recognize(self, audio: "sr.AudioData") -> str:
+		"""Run cloud ASR on captured audio. Raises sr.UnknownValueError / sr.RequestError."""
+		lang = os.getenv("FRIDAY_ASR_LANG", "en-IN")
+		# FRIDAY_ASR_ENDPOINT points recognition elsewhere, e.g. a benchmark stand-in
+		endpoint = os.getenv("FRIDAY_ASR_ENDPOINT")
+		breaker = get_breaker("google_asr", internet=needs_internet(endpoint or "http://www.google.com/"))
+		if not breaker.allow():
+			raise sr.RequestError("speech service skipped: offline or failing")
 		try:
-			from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer, AudioConfig  # type: ignore
-		except Exception:
-			return False
+			with span("asr", audio_bytes=len(audio.frame_data)):
+				if endpoint:
+					text = self.recognizer.recognize_google(audio, language=lang, endpoint=endpoint)
+				else:
+					text = self.recognizer.recognize_google(audio, language=lang)
+		except sr.RequestError:
+			breaker.failure(connection=True)
+			raise
+		except sr.UnknownValueError:
+			# The service answered; it just heard nothing it could transcribe
+			breaker.success()
+			raise
+		breaker.success()
+		return text
+
+	def listen(self, timeout: float = 7.0, phrase_time_limit: float = 10.0) -> Optional[str]:
+		audio = self.capture(timeout=timeout, phrase_time_limit=phrase_time_limit)
+		if audio is None:
+			return None
 		try:
-			if not (self.azure_key and self.azure_region):
+			return self.recognize(audio)
+		except sr.UnknownValueError:
+			self._say_and_wait(PROMPT_REPEAT)
+			return None
+		except sr.RequestError:
+			# offline recognize not configured; just ask again
+			self._say_and_wait(PROMPT_NETWORK)
+			return None
+		except Exception as ex:
+			print("Listen error:", ex)
+			return None
+
+	def _say_and_wait(self, text: str) -> None:
+		# Finish the prompt before the microphone opens again
+		handle = self.say(text)
+		if handle is not None:
+			handle.wait()
+
+	def _providers(self) -> List[TTSProvider]:
+		"""The network provider chain, resolved once (importing the SDKs it needs) on first use."""
+		with self._tts_chain_lock:
+			if self._tts_chain is None:
+				self._tts_chain = build_chain(self.tts_provider, _playsound() is not None or pcm_output_available())
+			return self._tts_chain
+
+	def _provider(self, name: str) -> Optional[TTSProvider]:
+		for provider in self._providers():
+			if provider.name == name:
+				return provider
+		return None
+
+	def _healthy_providers(self) -> List[str]:
+		"""Names of the providers to try now; ones cooling down after repeated failures are skipped."""
+		return [p.name for p in self._providers() if p.healthy]
+
+	def _select_tts_provider(self) -> str:
+		healthy = self._healthy_providers()
+		return healthy[0] if healthy else "pyttsx3"
+
+	def tts_health(self) -> dict:
+		"""Per-provider health: success score, consecutive failures, cooldown left, last latency."""
+		return {p.name: p.health() for p in [*self._providers(), self._local_tts]}
+
+	def _synthesize(self, provider: str, text: str, context: ChunkContext = None) -> Optional[Tuple[bytes, str]]:
+		"""Render text with a network provider. Returns (audio bytes, file extension) or None."""
+		tts = self._provider(provider)
+		return tts.synthesize(text, context) if tts is not None else None
+
+	def _audio_key(self, provider: str, text: str, context: ChunkContext = None) -> str:
+		tts = self._provider(provider)
+		parts = [provider, *(tts.signature() if tts is not None else []), text]
+		if context is not None and provider == "elevenlabs":
+			parts.extend(context)
+		return AudioCache.make_key(parts)
+
+	def _render_cached(self, provider: str, text: str, context: ChunkContext = None) -> Optional[Path]:
+		"""Path to cached audio for text, synthesizing and storing it on a miss."""
+		if self._audio_cache is None:
+			return None
+		key = self._audio_key(provider, text, context)
+		path = self._audio_cache.get(key)
+		if path is not None:
+			return path
+		rendered = self._synthesize(provider, text, context)
+		if rendered is None:
+			return None
+		audio, ext = rendered
+		return self._audio_cache.put(key, audio, ext)
+
+	def _prepare_audio(self, provider: str, text: str, context: ChunkContext = None) -> Optional[Tuple[Optional[Path], Optional[Pcm]]]:
+		"""Render (through the cache when there is one) and decode text, ready to play."""
+		path = self._render_cached(provider, text, context)
+		if path is not None:
+			audio = path.read_bytes()
+		elif self._audio_cache is not None:
+			# The cache already asked the provider; a second request would fail the same way
+			return None
+		else:
+			rendered = self._synthesize(provider, text, context)
+			if rendered is None:
+				return None
+			audio = rendered[0]
+		pcm = decode_audio(audio)
+		if pcm is not None and provider == "gtts" and self._gtts_speed > 1.0:
+			pcm = speed_up_pcm(pcm, self._gtts_speed)
+		return path, pcm
+
+	def _play_prepared(self, path: Optional[Path], pcm: Optional[Pcm], cancel: Optional[threading.Event] = None) -> bool:
+		# Play decoded PCM from memory; playsound on the cached file is the fallback
+		with span("playback", cached=path is not None):
+			if pcm is not None and play_pcm(pcm, stop=cancel):
+				return True
+			playsound = _playsound()
+			if path is None or playsound is None or (cancel is not None and cancel.is_set()):
 				return False
-			speech_config = SpeechConfig(subscription=self.azure_key, region=self.azure_region)
-			voice_name = os.getenv("AZURE_TTS_VOICE", "en-IN-NeerjaNeural")
-			speech_config.speech_synthesis_voice_name = voice_name
-			synthesizer = SpeechSynthesizer(speech_config=speech_config, audio_config=AudioConfig(use_default_speaker=True))
-			synthesizer.speak_text_async(text).get()
+			playsound(str(path))
 			return True
-		except Exception:
-			return False
 
-	def _say_elevenlabs(self, text: str) -> bool:
-		# Optional ElevenLabs TTS via REST API
+	def _say_rendered(self, provider: str, text: str, cancel: Optional[threading.Event] = None) -> bool:
 		try:
-			import requests  # type: ignore
+			prepared = self._prepare_audio(provider, text)
+			if prepared is None:
+				return False
+			return self._play_prepared(*prepared, cancel=cancel)
 		except Exception:
 			return False
+
+	def _say_chunked(self, provider: str, chunks: List[str], cancel: threading.Event) -> int:
+		"""
+		Speak chunks in order while the next ones synthesize on the TTS pool, so audio starts
+		after one chunk's synthesis. Returns how many chunks were spoken.
+		"""
+		contexts: List[ChunkContext] = [
+			(chunks[i - 1] if i else "", chunks[i + 1] if i + 1 < len(chunks) else "")
+			for i in range(len(chunks))
+		]
+		pending: Deque[Future] = deque()
+		abandoned = threading.Event()
+
+		def prepare(text: str, context: ChunkContext) -> Optional[Tuple[Optional[Path], Optional[Pcm]]]:
+			# Once a chunk has failed, prefetches that have not started skip the provider
+			if abandoned.is_set():
+				return None
+			return self._prepare_audio(provider, text, context)
+
+		# ElevenLabs can stream the first chunk, so only the rest is synthesized ahead
+		stream_first = provider == "elevenlabs"
+		submitted = 1 if stream_first else 0
+		spoken = 0
 		try:
-			if not self.eleven_key:
-				return False
-			voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")  # default Rachel
-			resp = requests.post(
-				f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-				headers={
-					"xi-api-key": self.eleven_key,
-					"accept": "audio/mpeg",
-					"content-type": "application/json",
-				},
-				json={"text": text, "model_id": os.getenv("ELEVENLABS_MODEL", "eleven_monolingual_v1"), "voice_settings": {"stability": 0.4, "similarity_boost": 0.8}},
-				timeout=20,
-			)
-			if resp.status_code != 200:
-				return False
-			with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-				mp3_path = tmp.name
-			try:
-				for chunk in resp.iter_content(chunk_size=16384):
+			for i, chunk in enumerate(chunks):
+				if cancel.is_set():
+					break
+				# Keep the prefetch window full while this chunk plays
+				while submitted < len(chunks) and submitted <= i + self.tts_prefetch:
+					pending.append(self._synth_pool.submit(bind(prepare), chunks[submitted], contexts[submitted]))
+					submitted += 1
+				if i == 0 and stream_first:
+					streamed = self._say_elevenlabs_stream(chunk, cancel, contexts[i])
+					if streamed:
+						spoken += 1
+						continue
+					# False: the request itself failed, and a buffered render would too
+					prepared = None if streamed is False else self._prepare_audio(provider, chunk, contexts[i])
+				else:
+					prepared = pending.popleft().result()
+				if prepared is None or not self._play_prepared(*prepared, cancel=cancel):
+					break
+				spoken += 1
+		except Exception as ex:
+			print("Chunked speech error:", ex)
+		finally:
+			abandoned.set()
+			for future in pending:
+				future.cancel()
+		return spoken
+
+	def _say_elevenlabs_stream(self, text: str, cancel: Optional[threading.Event] = None, context: ChunkContext = None) -> Optional[bool]:
+		"""
+		Play ElevenLabs audio while it downloads from the streaming endpoint. Returns True once
+		audio was heard and False when the request failed. Cache hits and setups without a
+		streaming player return None so the buffered path handles them.
+		"""
+		tts = self._provider("elevenlabs")
+		if tts is None or not tts.available() or os.getenv("FRIDAY_ELEVENLABS_STREAM", "true").lower() != "true":
+			return None
+		key = self._audio_key("elevenlabs", text, context)
+		if self._audio_cache is not None and self._audio_cache.get(key) is not None:
+			return None
+		player = open_mp3_stream()
+		if player is None:
+			return None
+		audio = bytearray()
+		start = time.perf_counter()
+		# Time to first audio is the latency a listener hears; the span covers the whole stream
+		stream = get_tracer().start("tts.elevenlabs.stream", chars=len(text))
+		error: Optional[BaseException] = None
+		try:
+			with tts.open_stream(text, context) as resp:
+				if resp.status_code != 200:
+					player.stop()
+					tts.record(False)
+					return False
+				for chunk in resp.iter_content(chunk_size=4096):
+					if cancel is not None and cancel.is_set():
+						player.stop()
+						return True
 					if chunk:
-						tmp.write(chunk)
-				tmp.flush()
-				if playsound is not None:
-					playsound(mp3_path)
+						if not audio:
+							get_tracer().since("tts.first_audio", stream)
+						audio += chunk
+						player.feed(chunk)
+			player.finish()
+			while not player.wait(0.1):
+				if cancel is not None and cancel.is_set():
+					player.stop()
 					return True
+		except Exception as ex:
+			error = ex
+			player.stop()
+			tts.record(bool(audio))
+			if not audio:
 				return False
-			finally:
+			# Part of the answer was already heard; don't replay it from the start
+			print("ElevenLabs stream error:", ex)
+			return True
+		finally:
+			# Ended once, on every exit: completion, early return, cancel or error
+			stream.end(error)
+		tts.record(bool(audio), time.perf_counter() - start)
+		if audio and self._audio_cache is not None:
+			try:
+				self._audio_cache.put(key, bytes(audio), "mp3")
+			except Exception:
+				pass
+		return bool(audio)
+
+	def warm_up(self, phrases: Iterable[str]) -> None:
+		"""
+		On a background thread, warm the TTS providers (SDK imports, connections, voices) and
+		pre-render fixed phrases into the audio cache.
+		"""
+		phrases = list(phrases)
+
+		def run() -> None:
+			for tts in self._providers():
+				tts.warm()
+			provider = self._select_tts_provider()
+			if self._audio_cache is None or provider not in CACHEABLE_PROVIDERS:
+				return
+			for phrase in phrases:
 				try:
-					os.unlink(mp3_path)
+					self._render_cached(provider, phrase)
 				except Exception:
 					pass
-		except Exception:
-			return False
-
 
+		threading.Thread(target=run, name="friday-tts-warmup", daemon=True).start()
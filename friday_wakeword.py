@@ -0,0 +1,222 @@
+"""
+Local wake-word gate. Captured audio is checked on the CPU before any cloud ASR call:
+MFCC features (NumPy only) are matched against enrolled recordings of the wake word with
+subsequence DTW. Only audio after a detected wake word goes on to recognition.
+
+Enroll templates (a few takes of "Friday" alone) with:
+
+    python friday_wakeword.py enroll [--takes 3]
+"""
+import os
+import sys
+import wave
+import importlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from friday_cache import cache_path
+
+
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+N_MELS = 26
+N_CEPS = 13
+
+_mel_cache: dict = {}
+
+
+def _mel_filterbank(rate: int, n_fft: int) -> np.ndarray:
+	key = (rate, n_fft)
+	bank = _mel_cache.get(key)
+	if bank is not None:
+		return bank
+	to_mel = lambda hz: 2595.0 * np.log10(1.0 + hz / 700.0)  # noqa: E731
+	to_hz = lambda mel: 700.0 * (10.0 ** (mel / 2595.0) - 1.0)  # noqa: E731
+	mels = np.linspace(to_mel(60.0), to_mel(min(7600.0, rate / 2.0)), N_MELS + 2)
+	bins = np.floor((n_fft + 1) * to_hz(mels) / rate).astype(int)
+	bank = np.zeros((N_MELS, n_fft // 2 + 1))
+	for m in range(1, N_MELS + 1):
+		left, center, right = bins[m - 1], bins[m], bins[m + 1]
+		if center > left:
+			bank[m - 1, left:center] = (np.arange(left, center) - left) / float(center - left)
+		if right > center:
+			bank[m - 1, center:right] = (right - np.arange(center, right)) / float(right - center)
+	_mel_cache[key] = bank
+	return bank
+
+
+def _dct_matrix(n_in: int, n_out: int) -> np.ndarray:
+	k = np.arange(n_out)[:, None]
+	n = np.arange(n_in)[None, :]
+	return np.cos(np.pi * k * (2 * n + 1) / (2.0 * n_in)) * np.sqrt(2.0 / n_in)
+
+
+_DCT = _dct_matrix(N_MELS, N_CEPS)
+
+
+def mfcc(samples: np.ndarray, rate: int) -> np.ndarray:
+	"""MFCCs c1..c12 (frames x N_CEPS-1) with per-utterance mean normalization; float samples in [-1, 1]."""
+	frame = int(rate * FRAME_SECONDS)
+	hop = int(rate * HOP_SECONDS)
+	if len(samples) < frame:
+		return np.zeros((0, N_CEPS - 1))
+	emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+	count = 1 + (len(emphasized) - frame) // hop
+	idx = np.arange(frame)[None, :] + hop * np.arange(count)[:, None]
+	frames = emphasized[idx] * np.hamming(frame)
+	n_fft = 1 << (frame - 1).bit_length()
+	power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+	energies = np.log(power @ _mel_filterbank(rate, n_fft).T + 1e-10)
+	# c0 is overall loudness, which says nothing about which word was spoken
+	ceps = (energies @ _DCT.T)[:, 1:]
+	return ceps - ceps.mean(axis=0)
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> Tuple[float, int]:
+	"""
+	Best match of template anywhere in query. Returns (distance per template frame, index of
+	the query frame where the match ends). Steps (1,1), (2,1), (1,2) only look at earlier
+	query frames, so each column is one vectorized update over the template.
+	"""
+	n, m = len(template), len(query)
+	if n == 0 or m == 0:
+		return float("inf"), 0
+	# Frame-to-frame cosine distance
+	t = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-9)
+	q = query / (np.linalg.norm(query, axis=1, keepdims=True) + 1e-9)
+	cost = 1.0 - t @ q.T
+	inf = np.inf
+	prev2 = np.full(n, inf)
+	prev = np.full(n, inf)
+	best, best_end = inf, 0
+	for j in range(m):
+		col = np.full(n, inf)
+		col[0] = cost[0, j]  # free start: the wake word can begin at any frame
+		if j > 0:
+			step = prev[:-1].copy()
+			step[1:] = np.minimum(step[1:], prev[:-2])
+			if j > 1:
+				step = np.minimum(step, prev2[:-1])
+			col[1:] = cost[1:, j] + step
+		if col[-1] < best:
+			best, best_end = col[-1], j
+		prev2, prev = prev, col
+	return best / n, best_end
+
+
+class WakeWordDetector(ABC):
+	"""Engine interface: detect() returns the end of the wake word in seconds, or None."""
+
+	@abstractmethod
+	def detect(self, samples: np.ndarray, rate: int) -> Optional[float]:
+		...
+
+
+class TemplateDetector(WakeWordDetector):
+	"""DTW over MFCCs against a handful of enrolled recordings of the wake word."""
+
+	def __init__(self, templates: List[Tuple[np.ndarray, int]], threshold: Optional[float] = None,
+			search_seconds: Optional[float] = None) -> None:
+		self.templates = [mfcc(s, r) for s, r in templates]
+		self.templates = [t for t in self.templates if len(t)]
+		if threshold is None:
+			threshold = float(os.getenv("FRIDAY_WAKE_THRESHOLD", "0.1"))
+		self.threshold = threshold
+		if search_seconds is None:
+			search_seconds = float(os.getenv("FRIDAY_WAKE_SEARCH_SECONDS", "3.0"))
+		# The wake word leads the command; only the start of an utterance is searched
+		self.search_seconds = search_seconds
+
+	def score(self, samples: np.ndarray, rate: int) -> Tuple[float, float]:
+		"""(best distance, end of the best match in seconds) over all templates."""
+		window = samples[: int(rate * self.search_seconds)] if self.search_seconds > 0 else samples
+		feats = mfcc(window, rate)
+		best, end = float("inf"), 0.0
+		for template in self.templates:
+			dist, end_frame = subsequence_dtw(template, feats)
+			if dist < best:
+				best, end = dist, (end_frame * HOP_SECONDS) + FRAME_SECONDS
+		return best, end
+
+	def detect(self, samples: np.ndarray, rate: int) -> Optional[float]:
+		if not self.templates:
+			return None
+		dist, end = self.score(samples, rate)
+		return end if dist <= self.threshold else None
+
+
+def read_wav(path: Path) -> Tuple[np.ndarray, int]:
+	"""Mono float samples and rate from a 16-bit PCM WAV file."""
+	with wave.open(str(path), "rb") as wav:
+		rate = wav.getframerate()
+		channels = wav.getnchannels()
+		data = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").astype(np.float32) / 32768.0
+	if channels > 1:
+		data = data.reshape(-1, channels).mean(axis=1)
+	return data, rate
+
+
+def write_wav(path: Path, samples: np.ndarray, rate: int) -> None:
+	pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+	with wave.open(str(path), "wb") as wav:
+		wav.setnchannels(1)
+		wav.setsampwidth(2)
+		wav.setframerate(rate)
+		wav.writeframes(pcm.tobytes())
+
+
+def template_dir() -> Path:
+	return Path(os.getenv("FRIDAY_WAKE_TEMPLATES") or str(cache_path("wakeword")))
+
+
+def load_detector() -> Optional[WakeWordDetector]:
+	"""
+	Build the configured engine: FRIDAY_WAKE_ENGINE=template (default) uses the enrolled WAVs,
+	or "package.module:Class" plugs in any WakeWordDetector. None when nothing is usable.
+	"""
+	engine = (os.getenv("FRIDAY_WAKE_ENGINE", "template") or "template").strip()
+	try:
+		if ":" in engine:
+			module, _, name = engine.partition(":")
+			return getattr(importlib.import_module(module), name)()
+		paths = sorted(template_dir().glob("*.wav"))
+		if not paths:
+			return None
+		detector = TemplateDetector([read_wav(p) for p in paths])
+		return detector if detector.templates else None
+	except Exception as ex:
+		print("Wake-word engine unavailable:", ex)
+		return None
+
+
+def audio_samples(audio) -> Tuple[np.ndarray, int]:
+	"""Float samples from a speech_recognition AudioData (16-bit, native rate)."""
+	raw = audio.get_raw_data(convert_width=2)
+	return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0, audio.sample_rate
+
+
+def _enroll(takes: int) -> None:
+	import speech_recognition as sr
+	directory = template_dir()
+	directory.mkdir(parents=True, exist_ok=True)
+	recognizer = sr.Recognizer()
+	with sr.Microphone() as source:
+		recognizer.adjust_for_ambient_noise(source, duration=1.0)
+		for i in range(takes):
+			input(f"Take {i + 1}/{takes}: press Enter, then say the wake word alone. ")
+			audio = recognizer.listen(source, timeout=5, phrase_time_limit=2)
+			samples, rate = audio_samples(audio)
+			path = directory / f"template_{i + 1}.wav"
+			write_wav(path, samples, rate)
+			print("Saved", path)
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1 and sys.argv[1] == "enroll":
+		takes = int(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[2] == "--takes" else 3
+		_enroll(takes)
+	else:
+		print(__doc__)
@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import threading
+from typing import Optional, Dict, Any, Tuple
+
+from friday_cache import cache_path
+from friday_http import get_http
+from friday_text import describe_age
+
+
+# Spoken/colloquial names -> canonical city used for lookups
+CITY_ALIASES: Dict[str, str] = {
+	"vizag": "Visakhapatnam",
+	"vsp": "Visakhapatnam",
+	"waltair": "Visakhapatnam",
+	"bombay": "Mumbai",
+	"madras": "Chennai",
+	"calcutta": "Kolkata",
+	"bangalore": "Bengaluru",
+	"hyd": "Hyderabad",
+	"delhi": "New Delhi",
+	"bezawada": "Vijayawada",
+	"nyc": "New York",
+	"la": "Los Angeles",
+}
+
+_TRAILING_NOISE = re.compile(r"\b(today|tonight|tomorrow|right now|now|currently|please|city)\b", re.IGNORECASE)
+
+
+def normalize_city(city: Optional[str]) -> Tuple[str, str]:
+	"""Return (cache key, display name) for a spoken city. Empty city maps to ('', '')."""
+	raw = (city or "").strip().strip("?.!,")
+	raw = _TRAILING_NOISE.sub(" ", raw)
+	raw = re.sub(r"[^\w\s'-]", " ", raw)
+	key = " ".join(raw.lower().split())
+	if not key:
+		return "", ""
+	display = CITY_ALIASES.get(key) or " ".join(w.capitalize() for w in key.split())
+	return display.lower(), display
+
+
+# Per-provider budget of a spoken weather turn: short read timeout, one retry, hard deadline
+WEATHER_TIMEOUT = (3.05, 5.0)
+WEATHER_RETRIES = 1
+WEATHER_DEADLINE = 6.0
+
+
+def fetch_weather(city: str) -> Dict[str, Any]:
+	"""Query OpenWeatherMap (if keyed) then wttr.in. Raises when neither answers."""
+	api_key = os.getenv("OPENWEATHER_API_KEY")
+	data: Dict[str, Any] = {"name": city or None, "temp": None, "desc": None, "brief": None}
+	if api_key and city:
+		try:
+			resp = get_http().get(
+				"https://api.openweathermap.org/data/2.5/weather",
+				params={"q": city, "appid": api_key, "units": "metric"},
+				timeout=WEATHER_TIMEOUT, retries=WEATHER_RETRIES, deadline=WEATHER_DEADLINE,
+			)
+			resp.raise_for_status()
+			payload = resp.json()
+			temp = payload.get("main", {}).get("temp")
+			desc = (payload.get("weather") or [{}])[0].get("description", "").lower()
+			if temp is not None and desc:
+				data.update(name=payload.get("name") or city, temp=float(temp), desc=desc)
+				return data
+		except Exception:
+			pass
+	# Fallback: wttr.in concise text
+	url = f"https://wttr.in/{city}?format=3" if city else "https://wttr.in/?format=3"
+	resp = get_http().get(url, timeout=WEATHER_TIMEOUT, retries=WEATHER_RETRIES, deadline=WEATHER_DEADLINE)
+	resp.raise_for_status()
+	brief = (resp.text or "").strip()
+	if not brief:
+		raise ValueError("empty weather response")
+	data["brief"] = brief
+	return data
+
+
+class WeatherCache:
+	"""
+	TTL cache of weather readings keyed on normalized city, persisted across restarts.
+	Fresh entries are returned directly; stale ones are returned immediately while a
+	background thread refreshes them. Entries older than max_stale are re-fetched inline.
+	"""
+
+	def __init__(self, ttl: Optional[float] = None, max_stale: Optional[float] = None, path: Optional[str] = None) -> None:
+		self.ttl = float(ttl if ttl is not None else os.getenv("FRIDAY_WEATHER_TTL", "600"))
+		self.max_stale = float(max_stale if max_stale is not None else os.getenv("FRIDAY_WEATHER_MAX_STALE", "21600"))
+		self.path = path or str(cache_path("weather_cache.json"))
+		self._entries: Dict[str, Dict[str, Any]] = {}
+		self._refreshing: set = set()
+		self._lock = threading.Lock()
+		self._load()
+
+	def get(self, city: Optional[str]) -> Dict[str, Any]:
+		key, display = normalize_city(city)
+		now = time.time()
+		with self._lock:
+			entry = self._entries.get(key)
+		if entry is not None:
+			age = now - entry["fetched_at"]
+			if age <= self.ttl:
+				return entry["data"]
+			if age <= self.max_stale:
+				self._refresh_async(key, display)
+				return entry["data"]
+		return self._refresh(key, display)
+
+	def age(self, city: Optional[str]) -> Optional[float]:
+		key, _ = normalize_city(city)
+		with self._lock:
+			entry = self._entries.get(key)
+		return None if entry is None else time.time() - entry["fetched_at"]
+
+	def refresh(self, city: Optional[str]) -> Dict[str, Any]:
+		"""Fetch now and store the reading; raises when the network is unavailable."""
+		key, display = normalize_city(city)
+		return self._refresh(key, display)
+
+	def _refresh(self, key: str, display: str) -> Dict[str, Any]:
+		data = fetch_weather(display)
+		with self._lock:
+			self._entries[key] = {"fetched_at": time.time(), "data": data}
+		self._save()
+		return data
+
+	def _refresh_async(self, key: str, display: str) -> None:
+		with self._lock:
+			if key in self._refreshing:
+				return
+			self._refreshing.add(key)
+
+		def run() -> None:
+			try:
+				self._refresh(key, display)
+			except Exception:
+				pass  # keep serving the stale reading
+			finally:
+				with self._lock:
+					self._refreshing.discard(key)
+
+		threading.Thread(target=run, name="friday-weather-refresh", daemon=True).start()
+
+	def _load(self) -> None:
+		try:
+			with open(self.path, "r", encoding="utf-8") as fh:
+				entries = json.load(fh)
+			if isinstance(entries, dict):
+				self._entries = entries
+		except Exception:
+			self._entries = {}
+
+	def _save(self) -> None:
+		try:
+			with self._lock:
+				snapshot = json.dumps(self._entries)
+			tmp = self.path + ".tmp"
+			with open(tmp, "w", encoding="utf-8") as fh:
+				fh.write(snapshot)
+			os.replace(tmp, self.path)
+		except Exception:
+			pass
+
+
+_shared_cache: Optional[WeatherCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_weather_cache() -> WeatherCache:
+	"""Process-wide cache shared by FridayWeb and the status report."""
+	global _shared_cache
+	with _shared_lock:
+		if _shared_cache is None:
+			_shared_cache = WeatherCache()
+		return _shared_cache
+
+
+def describe_weather(city: Optional[str]) -> Optional[str]:
+	"""
+	The shared cache's reading for city (refreshed when stale) as one spoken sentence, with its
+	age once it is a minute old. None when no provider had anything to say.
+	"""
+	cache = get_weather_cache()
+	data = cache.get(city)
+	age = cache.age(city) or 0.0
+	taken = describe_age(age) if age >= 60 else ""
+	if data.get("temp") is not None and data.get("desc"):
+		as_of = f" as of {taken}" if taken else ""
+		return f"Weather in {data['name']}{as_of} is {int(round(data['temp']))}°C with {data['desc']}."
+	brief = (data.get("brief") or "").strip().rstrip(".")
+	if not brief:
+		return None
+	return brief + (f", reading taken {taken}." if taken else ".")
@@ -1,10 +1,22 @@
 import os
+import time
+import calendar
+import threading
 import datetime as dt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed, wait
 from typing import Optional, List, Tuple
 
-import requests
-import feedparser
-import wikipedia
+from friday_cache import normalize_prompt
+from friday_http import get_http
+from friday_weather import describe_weather, normalize_city
+from friday_intents import IntentMatch, route
+from friday_news import get_headline_store
+from friday_text import describe_age
+from friday_trace import annotate, bind, traced
+
+
+NO_ANSWER = "Sorry, I couldn't find an answer."
 
 
 class FridayWeb:
@@ -12,18 +24,41 @@ class FridayWeb:
 		self.weather_api_key = os.getenv("OPENWEATHER_API_KEY")
 		self.news_api_key = os.getenv("NEWSAPI_KEY") or os.getenv("NEWS_API_KEY")
 		self.default_city = (os.getenv("FRIDAY_DEFAULT_CITY") or "Visakhapatnam").strip()
+		# Feeds are fetched in parallel; whatever arrives before the deadline is merged
+		self.news_timeout = float(os.getenv("FRIDAY_NEWS_TIMEOUT", "4"))
+		self._feed_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="friday-feed")
+		# Persistent headline store: feeds only add entries it has not seen, queries read clusters
+		self.headlines = get_headline_store()
+		self.news_max_age = float(os.getenv("FRIDAY_NEWS_MAX_AGE", "1800"))
+		# General-knowledge lookups: sources raced under one deadline, TTL cache of results
+		self.wikipedia_api = os.getenv("FRIDAY_WIKIPEDIA_API", "https://en.wikipedia.org/w/api.php")
+		self.duckduckgo_api = os.getenv("FRIDAY_DUCKDUCKGO_API", "https://api.duckduckgo.com/")
+		self.answer_timeout = float(os.getenv("FRIDAY_ANSWER_TIMEOUT", "3"))
+		self.answer_ttl = float(os.getenv("FRIDAY_ANSWER_TTL", "86400"))
+		self.answer_miss_ttl = float(os.getenv("FRIDAY_ANSWER_MISS_TTL", "900"))
+		self.answer_cache_size = int(os.getenv("FRIDAY_ANSWER_CACHE_SIZE", "256"))
+		self._answer_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="friday-answer")
+		# normalized query -> (expires_at, answer); "" records a confirmed miss
+		self._answers: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+		self._answer_lock = threading.Lock()
 
-	def try_answer(self, query: str) -> Optional[str]:
-		q = query.lower()
-		if "time" in q:
+	@traced("web.try_answer")
+	def try_answer(self, query: str, intent: Optional[IntentMatch] = None) -> Optional[str]:
+		if intent is None:
+			intent = route(query)
+		if intent is None:
+			return None
+		annotate(intent=intent.name)
+		if intent.name == "time":
 			return self._get_time()
-		if "weather" in q:
-			city = self._extract_city(query) or self.default_city
+		if intent.name == "weather":
+			city = intent.slots.get("city") or ""
+			# A slot that normalizes to nothing ("tomorrow") must not fall through to IP geolocation
+			if not normalize_city(city)[0]:
+				city = self.default_city
 			return self._get_weather(city)
-		if "news" in q or "headlines" in q:
-			loc = None
-			if "visakhapatnam" in q or "vizag" in q or "local" in q:
-				loc = "local"
+		if intent.name == "news":
+			loc = "local" if intent.slots.get("locality") else None
 			return self._get_news(locality=loc)
 		return None
 
@@ -31,37 +66,9 @@ class FridayWeb:
 		now = dt.datetime.now().strftime("%A, %I:%M %p")
 		return f"Local time check: {now}. Right on schedule, Boss."
 
-	def _extract_city(self, query: str) -> Optional[str]:
-		parts = query.split("in ")
-		if len(parts) > 1:
-			city = parts[1].strip().rstrip("?.! ")
-			return city
-		return None
-
 	def _get_weather(self, city: Optional[str]) -> str:
 		try:
-			# Prefer OpenWeatherMap if key is set, else wttr.in fallback
-			if self.weather_api_key and city:
-				resp = requests.get(
-					"https://api.openweathermap.org/data/2.5/weather",
-					params={"q": city, "appid": self.weather_api_key, "units": "metric"},
-					timeout=8,
-				)
-				resp.raise_for_status()
-				data = resp.json()
-				temp = data.get("main", {}).get("temp")
-				desc = (data.get("weather") or [{}])[0].get("description", "").lower()
-				name = data.get("name") or city
-				if temp is not None and desc:
-					return f"Weather in {name} is {int(round(float(temp)))}°C with {desc}."
-			# Fallback: wttr.in concise text
-			url = f"https://wttr.in/{city}?format=3" if city else "https://wttr.in/?format=3"
-			resp = requests.get(url, timeout=8)
-			resp.raise_for_status()
-			brief = resp.text.strip()
-			if not brief:
-				return "Weather data is shy at the moment. I will retry shortly."
-			return f"{brief}. Forecast synced—adjusting mission parameters accordingly."
+			return describe_weather(city) or "Weather data is shy at the moment. I will retry shortly."
 		except Exception:
 			return "Weather uplink encountered interference. I'll try again soon."
 
@@ -80,73 +87,185 @@ class FridayWeb:
 			"https://indianexpress.com/section/india/feed/",
 		]
 
+	@traced("web.feed")
+	def _fetch_feed(self, url: str, group: str) -> int:
+		"""Revalidate one feed and ingest its new entries into the headline store. Returns how many were new."""
+		state = self.headlines.validators(url)
+		headers = {"User-Agent": "FRIDAY/1.0 (+feed reader)"}
+		if state.get("etag"):
+			headers["If-None-Match"] = state["etag"]
+		if state.get("modified"):
+			headers["If-Modified-Since"] = state["modified"]
+		resp = get_http().get(url, headers=headers, timeout=self.news_timeout, deadline=self.news_timeout)
+		if resp.status_code == 304 and state:
+			# Unchanged since last poll: everything in it is stored already
+			annotate(new=0)
+			return 0
+		resp.raise_for_status()
+		import feedparser  # deferred: slow to import and only needed once a feed arrives
+		parsed = feedparser.parse(resp.content)
+		entries = []
+		for e in parsed.entries:
+			title = " ".join(getattr(e, "title", "").split())
+			if not title:
+				continue
+			link = getattr(e, "link", None)
+			stamp = getattr(e, "published_parsed", None) or getattr(e, "updated_parsed", None)
+			entries.append({
+				"uid": getattr(e, "id", None) or link or f"{url}#{title}",
+				"title": title,
+				"link": link,
+				"published": calendar.timegm(stamp) if stamp else None,
+			})
+		new = self.headlines.ingest(group, url, entries, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+		annotate(new=new)
+		return new
+
+	def _fetch_feeds(self, feeds: List[str], group: str) -> int:
+		"""Fetch feeds concurrently until the deadline. Returns how many answered."""
+		futures = [self._feed_pool.submit(bind(self._fetch_feed), url, group) for url in feeds]
+		wait(futures, timeout=self.news_timeout)
+		return sum(1 for fut in futures if fut.done() and fut.exception() is None)
+
+	def refresh_news(self, locality: Optional[str] = None) -> int:
+		"""Ingest new headlines for locality into the store. Returns how many feeds answered; raises when none did."""
+		group = locality or "national"
+		answered = self._fetch_feeds(self._rss_feeds(locality), group)
+		if not answered:
+			raise RuntimeError("no news feed answered")
+		self.headlines.mark_refreshed(group)
+		return answered
+
+	def _news_age(self, locality: Optional[str]) -> float:
+		"""Refresh locality's headlines when older than news_max_age. Returns the age of what is stored."""
+		refreshed = self.headlines.refreshed_at(locality or "national")
+		if refreshed is not None and time.time() - refreshed <= self.news_max_age:
+			return time.time() - refreshed
+		try:
+			self.refresh_news(locality)
+			return 0.0
+		except Exception:
+			# Offline: older headlines beat none
+			return time.time() - refreshed if refreshed is not None else 0.0
+
 	def _get_news(self, locality: Optional[str] = None) -> str:
-		feeds: List[str] = [
-			* self._rss_feeds(locality)
-		]
 		try:
-			entries = []
-			for url in feeds:
-				parsed = feedparser.parse(url)
-				for e in parsed.entries[:10]:
-					title = getattr(e, "title", "").strip()
-					if title:
-						entries.append({
-							"title": title,
-							"published": getattr(e, "published_parsed", None),
-						})
-			# Deduplicate by title while preserving order
-			seen = set()
-			unique = []
-			for item in entries:
-				t = item["title"]
-				if t not in seen:
-					seen.add(t)
-					unique.append(item)
-			# Sort by published if available (newest first)
-			unique.sort(key=lambda x: (x["published"] is not None, x["published"]), reverse=True)
-			top = [i["title"] for i in unique[:10]]
+			age = self._news_age(locality)
+			# One headline per story cluster, newest stories first
+			top = self.headlines.top(locality or "national", 10)
 			if not top:
 				return "No fresh headlines detected. The air is unusually calm, Boss."
 			joined = "; ".join(top)
+			as_of = f", as of {describe_age(age)}" if age >= 60 else ""
 			if locality == "local":
-				return f"Local headlines (Visakhapatnam region): {joined}."
-			return f"National headlines (India): {joined}."
+				return f"Local headlines (Visakhapatnam region){as_of}: {joined}."
+			return f"National headlines (India){as_of}: {joined}."
 		except Exception:
 			return "News scanners encountered interference. I will re-sync the feeds shortly."
 	
+	@traced("web.answer")
 	def fetch_answer(self, query: str) -> str:
-		# 1) Try Wikipedia summary (2–3 sentences)
+		"""
+		General-knowledge lookup. Wikipedia and DuckDuckGo are asked in parallel and the first
+		good answer inside answer_timeout wins; answers and confirmed misses are cached.
+		"""
+		key = normalize_prompt(query)
+		cached = self._cached_answer(key)
+		annotate(cached=cached is not None)
+		if cached is not None:
+			return cached or NO_ANSWER
+		futures = [
+			self._answer_pool.submit(bind(self._ask_wikipedia), query),
+			self._answer_pool.submit(bind(self._ask_duckduckgo), query),
+		]
+		fallback: Optional[str] = None
+		answered = 0
 		try:
-			wikipedia.set_lang("en")
-			hits = wikipedia.search(query, results=1)
-			if hits:
-				page_title = hits[0]
-				summary = wikipedia.summary(page_title, sentences=3, auto_suggest=True, redirect=True)
-				if summary:
-					return summary.strip()
-		except Exception:
+			for fut in as_completed(futures, timeout=self.answer_timeout):
+				try:
+					text, strong = fut.result()
+				except Exception:
+					continue
+				answered += 1
+				if text and strong:
+					self._store_answer(key, text)
+					return text
+				fallback = fallback or text
+		except FuturesTimeout:
 			pass
+		if fallback:
+			self._store_answer(key, fallback)
+			return fallback
+		# Only a miss every source confirmed is cached; timeouts and errors are retried next time
+		if answered == len(futures):
+			self._store_answer(key, "")
+		return NO_ANSWER
 
-		# 2) Fallback: DuckDuckGo Instant Answer
-		try:
-			resp = requests.get(
-				"https://api.duckduckgo.com/",
-				params={"q": query, "format": "json", "no_redirect": 1, "no_html": 1},
-				timeout=8,
-			)
-			resp.raise_for_status()
-			data = resp.json()
-			text = (data.get("AbstractText") or "").strip()
-			if not text:
-				for item in data.get("RelatedTopics", []) or []:
-					if isinstance(item, dict) and item.get("Text"):
-						text = item["Text"].strip()
-						break
-			if text:
-				return text
-		except Exception:
-			pass
+	@traced("web.wikipedia")
+	def _ask_wikipedia(self, query: str) -> Tuple[str, bool]:
+		"""Search and intro extract of the top hit in one Action API request."""
+		resp = get_http().get(self.wikipedia_api, retries=0, timeout=self.answer_timeout, deadline=self.answer_timeout, params={
+			"action": "query", "format": "json", "formatversion": 2,
+			"generator": "search", "gsrsearch": query, "gsrlimit": 1,
+			"prop": "extracts|pageprops", "ppprop": "disambiguation",
+			"exintro": 1, "explaintext": 1, "exsentences": 3, "redirects": 1,
+		})
+		resp.raise_for_status()
+		pages = (resp.json().get("query") or {}).get("pages") or []
+		pages = [p for p in pages if "missing" not in p]
+		if not pages:
+			return "", True
+		page = min(pages, key=lambda p: p.get("index", 0))
+		if "disambiguation" in (page.get("pageprops") or {}):
+			return "", True
+		return (page.get("extract") or "").strip(), True
+
+	@traced("web.duckduckgo")
+	def _ask_duckduckgo(self, query: str) -> Tuple[str, bool]:
+		"""DuckDuckGo Instant Answer. A related-topic snippet only counts when nothing better arrives."""
+		resp = get_http().get(self.duckduckgo_api, retries=0, timeout=self.answer_timeout, deadline=self.answer_timeout,
+			params={"q": query, "format": "json", "no_redirect": 1, "no_html": 1})
+		resp.raise_for_status()
+		data = resp.json()
+		text = (data.get("AbstractText") or "").strip()
+		if text:
+			return text, True
+		for item in data.get("RelatedTopics", []) or []:
+			if isinstance(item, dict) and item.get("Text"):
+				return item["Text"].strip(), False
+		return "", True
+
+	def _cached_answer(self, key: str) -> Optional[str]:
+		"""Cached answer for key; "" for a cached miss, None when absent or expired."""
+		with self._answer_lock:
+			entry = self._answers.get(key)
+			if entry is None:
+				return None
+			if entry[0] < time.time():
+				del self._answers[key]
+				return None
+			self._answers.move_to_end(key)
+			return entry[1]
+
+	def _store_answer(self, key: str, text: str) -> None:
+		ttl = self.answer_ttl if text else self.answer_miss_ttl
+		if not key or ttl <= 0:
+			return
+		with self._answer_lock:
+			self._answers[key] = (time.time() + ttl, text)
+			self._answers.move_to_end(key)
+			while len(self._answers) > self.answer_cache_size:
+				self._answers.popitem(last=False)
+
+
+_shared_web: Optional[FridayWeb] = None
+_shared_web_lock = threading.Lock()
 
-		return "Sorry, I couldn't find an answer."
 
+def get_web() -> FridayWeb:
+	"""One FridayWeb per process, so the prefetcher, commands and status report share state."""
+	global _shared_web
+	with _shared_web_lock:
+		if _shared_web is None:
+			_shared_web = FridayWeb()
+		return _shared_web
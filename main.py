@@ -1,19 +1,26 @@
 import os
 import sys
-import time
+import functools
 import traceback
-from typing import Optional
 
 try:
 	from dotenv import load_dotenv
 except Exception:
 	load_dotenv = None
 
-from friday_voice import FridayVoice
+from friday_voice import FridayVoice, PROMPT_REPEAT, PROMPT_NETWORK
 from friday_brain import FridayBrain
-from friday_system import FridaySystem
-from friday_web import FridayWeb
+from friday_system import FridaySystem, PHRASES as SYSTEM_PHRASES
+from friday_web import FridayWeb, NO_ANSWER, get_web
 from friday_status import report_status
+from friday_pipeline import FridayPipeline
+from friday_prefetch import start_default_prefetch
+from friday_intents import route
+from friday_breaker import get_connectivity, breaker_states
+from friday_http import get_http
+from friday_trace import get_tracer
+
+FAREWELL = "Powering down FRIDAY interface. Ping me when you need me, Boss."
 
 
 def safe_load_env() -> None:
@@ -33,16 +40,113 @@ def print_banner() -> None:
 	print(banner)
 
 
+def handle_query(query: str, speaker, system: FridaySystem, web: FridayWeb, brain: FridayBrain,
+		wake_word: str, continuous_mode: bool) -> bool:
+	"""Route one recognized utterance. Returns False when FRIDAY should power down."""
+	q_lower = query.lower().strip()
+
+	if not continuous_mode and wake_word not in q_lower:
+		# Ignore non wake-word utterances
+		return True
+
+	# Remove wake word prefix if present
+	if q_lower.startswith(wake_word):
+		query = query[len(wake_word):].strip(",. !?")
+
+	# One pass over the compiled intent registry; the match is shared by every subsystem
+	intent = route(query)
+	intent_name = intent.name if intent else None
+
+	# System-level shortcuts
+	if intent_name == "exit":
+		speaker.say(FAREWELL)
+		return False
+
+	# Status report command (only on explicit request)
+	if intent_name == "status_report":
+		try:
+			report_status(speaker)
+		except Exception:
+			speaker.say("Unable to compile the status report, Boss.")
+		return True
+
+	# Rolling latency percentiles from friday_trace
+	if intent_name == "performance_report":
+		speaker.say(get_tracer().performance_report())
+		return True
+
+	# Route intent: system, web, or brain
+	handled = False
+
+	try:
+		if intent is not None:
+			handled = system.try_handle(query, intent)
+	except Exception as ex:
+		speaker.say("System control experienced turbulence. Containing the breach and moving on.")
+		print("System control error:", ex)
+		traceback.print_exc()
+
+	if not handled:
+		try:
+			web_response = web.try_answer(query, intent) if intent is not None else None
+			if web_response:
+				speaker.say(web_response)
+				handled = True
+			else:
+				# General Q&A: Wikipedia and DuckDuckGo raced, cached
+				qa = web.fetch_answer(query)
+				if qa and qa != NO_ANSWER:
+					speaker.say(qa)
+					handled = True
+		except Exception as ex:
+			speaker.say("Web subsystem had a hiccup. I will compensate with onboard cognition.")
+			print("Web error:", ex)
+			traceback.print_exc()
+
+	if not handled:
+		try:
+			# Sentences are spoken as soon as they stream in from the model
+			speaker.say_stream(brain.answer_stream(query))
+		except Exception as ex:
+			speaker.say("Cognitive array momentarily disrupted. Attempting graceful recovery.")
+			print("Brain error:", ex)
+			traceback.print_exc()
+
+	return True
+
+
 def main() -> None:
 	safe_load_env()
 	print_banner()
 
 	voice = FridayVoice()
+	# Greet as soon as TTS exists; the rest of startup overlaps the greeting
+	voice.say("Boot sequence complete. Systems online. Namaste Badri, Good to see you.")
+
+	# Offline is detected in the background so dependencies are skipped instead of timing out
+	get_connectivity().start()
 	brain = FridayBrain()
-	system = FridaySystem(voice)
-	web = FridayWeb()
+	brain.warm_up()
+	web = get_web()
+	# Capture, recognition, routing and speech run as separate stages; see friday_pipeline
+	pipeline = FridayPipeline(voice)
+	system = FridaySystem(pipeline.speaker)
+	# Weather and headlines refresh in the background, pausing while a turn is in flight
+	start_default_prefetch(web, busy=lambda: pipeline.busy)
+
+	# Optional local metrics endpoint: span percentiles plus breaker, TTS and HTTP health
+	metrics_port = os.getenv("FRIDAY_METRICS_PORT")
+	if metrics_port:
+		try:
+			get_tracer().serve_metrics(int(metrics_port), extra=lambda: {
+				**breaker_states(), "tts": voice.tts_health(), "http": get_http().stats(),
+				"headlines": web.headlines.stats(),
+			})
+		except Exception as ex:
+			print("Metrics endpoint unavailable:", ex)
 
-	voice.say("Boot sequence complete. Systems online. Namaste Badri, Good to see you.")
+	# Render fixed phrases into the TTS cache in the background so they play instantly later
+	voice.warm_up([PROMPT_REPEAT, PROMPT_NETWORK, FAREWELL, *SYSTEM_PHRASES.values()])
 
 	# Optional startup sound on Windows
 	try:
@@ -55,92 +159,33 @@ def main() -> None:
 	# Wake word configuration (optional)
 	wake_word = os.getenv("FRIDAY_WAKE_WORD", "friday")
 	continuous_mode = os.getenv("FRIDAY_CONTINUOUS", "true").lower() == "true"
+	# Outside continuous mode a local detector drops non wake-word speech before cloud ASR;
+	# what reaches the handler was already addressed to FRIDAY
+	if not continuous_mode and voice.enable_wake_gate():
+		continuous_mode = True
 
 	voice.say("Awaiting your command. Say 'Friday' to activate, or speak directly in continuous mode.")
-
-	while True:
-		try:
-			query: Optional[str] = voice.listen()
-			if not query:
-				continue
-
-			q_lower = query.lower().strip()
-
-			if not continuous_mode and wake_word not in q_lower:
-				# Ignore non wake-word utterances
-				continue
-
-			# Remove wake word prefix if present
-			if q_lower.startswith(wake_word):
-				query = query[len(wake_word):].strip(",. !?")
-
-			# System-level shortcuts
-			if any(k in q_lower for k in ("exit", "quit", "friday shutdown ")):
-				voice.say("Powering down FRIDAY interface. Ping me when you need me, Boss.")
-				break
-
-			# Status report command (only on explicit request)
-			if "status report" in q_lower or q_lower.strip() == "status":
-				try:
-					report_status(voice)
-				except Exception:
-					voice.say("Unable to compile the status report, Boss.")
-				continue
-
-			# Route intent: system, web, or brain
-			handled = False
-
-			try:
-				handled = system.try_handle(query)
-			except Exception as ex:
-				voice.say("System control experienced turbulence. Containing the breach and moving on.")
-				print("System control error:", ex)
-				traceback.print_exc()
-
-			if not handled:
-				try:
-					web_response = web.try_answer(query)
-					if web_response:
-						voice.say(web_response)
-						handled = True
-					else:
-						# General Q&A: try Wikipedia → DuckDuckGo
-						qa = web.fetch_answer(query)
-						if qa and qa != "Sorry, I couldn't find an answer.":
-							voice.say(qa)
-							handled = True
-				except Exception as ex:
-					voice.say("Web subsystem had a hiccup. I will compensate with onboard cognition.")
-					print("Web error:", ex)
-					traceback.print_exc()
-
-			if not handled:
-				try:
-					answer = brain.answer(query)
-					voice.say(answer)
-				except Exception as ex:
-					voice.say("Cognitive array momentarily disrupted. Attempting graceful recovery.")
-					print("Brain error:", ex)
-					traceback.print_exc()
-
-			# Small cooldown to prevent hot loop
-			time.sleep(0.2)
-
-		except KeyboardInterrupt:
-			voice.say("Manual interrupt detected. Standing down with elegance.")
-			break
-		except Exception as loop_ex:
-			print("Main loop error:", loop_ex)
-			traceback.print_exc()
-			# Attempt soft recovery rather than crash
-			try:
-				voice.say("Minor anomaly detected. Stabilizing and resuming operations.")
-			except Exception:
-				pass
-			time.sleep(0.5)
+	# say() only queues; let the greeting finish before the microphone opens
+	voice.wait_until_idle()
+
+	handler = functools.partial(
+		handle_query,
+		system=system,
+		web=web,
+		brain=brain,
+		wake_word=wake_word,
+		continuous_mode=continuous_mode,
+	)
+	try:
+		pipeline.run(handler)
+		voice.wait_until_idle()
+	except KeyboardInterrupt:
+		voice.flush()
+		voice.say("Manual interrupt detected. Standing down with elegance.")
+		voice.wait_until_idle()
+	finally:
+		get_tracer().flush()
 
 
 if __name__ == "__main__":
 	main()
-
-